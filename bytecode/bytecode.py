@@ -1,6 +1,7 @@
 from __future__ import annotations
 from abc import abstractmethod, ABC
 
+import bisect
 import enum
 from dataclasses import dataclass
 from typing import (
@@ -168,6 +169,7 @@ class CodeObject(Generic[C, NA]):
     max_stacksize: int
     obj_name: NA
     cell2arg: Optional[list[int]]
+    exception_table: list[ExceptionTableEntry]
     constants: list[C]
     names: list[NA]
     varnames: list[NA]
@@ -204,6 +206,13 @@ class CodeObject(Generic[C, NA]):
                 targets.add(instruction.get_label())
         return targets
 
+    def exception_handlers(self, idx: int) -> tuple[ExceptionHandler, ...]:
+        # the blocks around instruction `idx`, outermost first
+        i = bisect.bisect_right(self.exception_table, idx, key=lambda e: e.start) - 1
+        if i >= 0 and idx < (entry := self.exception_table[i]).end:
+            return entry.handlers
+        return ()
+
     # TODO: types
     def map_bag(self, bag: Any) -> CodeObject[Any, Any]:
         def map_names(names: list[NA]) -> list[Any]:
@@ -226,6 +235,7 @@ class CodeObject(Generic[C, NA]):
             first_line_number=self.first_line_number,
             max_stacksize=self.max_stacksize,
             cell2arg=self.cell2arg,
+            exception_table=self.exception_table,
         )
 
 
@@ -257,6 +267,31 @@ class RaiseKind(enum.Enum):
     RAISE_CAUSE = enum.auto()
 
 
+class HandlerKind(enum.Enum):
+    # `break` jumps to the target, `continue` stays in the loop
+    LOOP = enum.auto()
+    # only entered by exceptions, with the exception pushed on the stack
+    TRY_EXCEPT = enum.auto()
+    # entered for any unwind reason, for `finally` and `with`
+    FINALLY = enum.auto()
+
+
+@dataclass(unsafe_hash=True)
+class ExceptionHandler:
+    kind: HandlerKind
+    target: Label
+    # the value stack is truncated to this depth before jumping to `target`
+    level: int
+
+
+@dataclass
+class ExceptionTableEntry:
+    # covers the instructions `start..end`
+    start: int
+    end: int
+    handlers: tuple[ExceptionHandler, ...]
+
+
 @dataclass
 class Arguments:
     posonlyargs: list[str]
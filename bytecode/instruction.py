@@ -1,27 +1,32 @@
 from __future__ import annotations
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import enum
+import operator
 from collections import OrderedDict
-from typing import Optional, final, TYPE_CHECKING
+from typing import Any, Callable, ClassVar, Optional, final, TYPE_CHECKING
 from abc import ABC, abstractmethod
 
 from common.error import PyImplBase, PyImplError, PyImplException
 from vm.builtins.asyncgenerator import PyAsyncGenWrappedValue
 
 if TYPE_CHECKING:
+    from vm.builtins.code import PyConstant
     from vm.builtins.coroutine import PyCoroutine
-    from vm.builtins.dict import PyDict
-    from vm.builtins.list import PyList
+    from vm.builtins.pytype import PyType
     from vm.frame import ExecutingFrame, ExecutionResult
+    from vm.pyobjectrc import PyObjectRef
     from vm.vm import VirtualMachine
 
 import vm.builtins.pystr as pystr
 import vm.builtins.set as pyset
 import vm.builtins.dict as pydict
+import vm.builtins.list as pylist
+import vm.builtins.iter as pyiter
 import vm.frame as vm_frame
 import vm.pyobject as po
 import bytecode.bytecode as bytecode
 import vm.function_ as fn
+import vm.stats as vm_stats
 
 
 class PyException(Exception):
@@ -29,6 +34,13 @@ class PyException(Exception):
 
 
 NameIdx = int
+# an instruction compiled for the threaded engine, see `Instruction.threaded`
+Op = Callable[["ExecutingFrame", "VirtualMachine"], Optional["ExecutionResult"]]
+
+# number of executions of an adaptive instruction before it tries to specialize
+ADAPTIVE_WARMUP = 8
+# number of executions to wait after a failed specialization or a deopt
+ADAPTIVE_BACKOFF = 64
 
 
 @dataclass(unsafe_hash=True)
@@ -91,6 +103,13 @@ class LabelArgMixin(ABC):
         self.target = label
 
 
+class SetupBlockMixin(LabelArgMixin):
+    # opens a block of the exception table, closed by the matching `PopBlock`
+    kind: ClassVar[bytecode.HandlerKind]
+    # the handler's stack level, relative to the stack depth before the instruction
+    level_offset: ClassVar[int] = 0
+
+
 class Instruction(ABC):
     @abstractmethod
     def execute(
@@ -105,6 +124,20 @@ class Instruction(ABC):
     def unconditional_branch(self) -> bool:
         return isinstance(self, (Jump, Continue, Break, ReturnValue, Raise))
 
+    def is_pseudo(self) -> bool:
+        # only used to build the exception table, dropped by `finalize_code`
+        return isinstance(
+            self, (SetupLoop, SetupFinally, SetupExcept, SetupAsyncWith, PopBlock)
+        )
+
+    def opname(self) -> str:
+        return type(self).__name__
+
+    def threaded(self, code: bytecode.CodeObject[PyConstant, pystr.PyStrRef]) -> Op:
+        # the host closure run by the threaded engine, with the operands and the
+        # objects they refer to bound in advance. defaults to `execute`
+        return self.execute
+
 
 @final
 @dataclass
@@ -114,7 +147,7 @@ class ImportName(Instruction):
     def execute(
         self, frame: ExecutingFrame, vm: VirtualMachine
     ) -> Optional[ExecutionResult]:
-        frame.import_(vm, vm.mk_str(frame._get_name(self.idx)))
+        frame.import_(vm, frame.code._.code.names[self.idx])
         return None
 
     def stack_effect(self, jump: bool) -> int:
@@ -183,6 +216,22 @@ class LoadFast(Instruction):
         frame.push_value(x)
         return None
 
+    def threaded(self, code: bytecode.CodeObject[PyConstant, pystr.PyStrRef]) -> Op:
+        idx = self.idx
+        execute = self.execute
+
+        def load_fast(
+            frame: ExecutingFrame, vm: VirtualMachine
+        ) -> Optional[ExecutionResult]:
+            x = frame.fastlocals[idx]
+            if x is None:
+                return execute(frame, vm)
+            frame.stack[frame.sp] = x
+            frame.sp += 1
+            return None
+
+        return load_fast
+
 
 @final
 @dataclass
@@ -195,21 +244,35 @@ class LoadNameAny(Instruction):
     def execute(
         self, frame: ExecutingFrame, vm: VirtualMachine
     ) -> Optional[ExecutionResult]:
-        name = vm.mk_str(frame._get_name(self.idx))
-        map = frame.locals.mapping()
-        try:
-            value = map.subscript_(name, vm)
-        except PyImplBase:
-            frame.push_value(frame.load_global_or_builtin(name, vm))
-        else:
-            frame.push_value(value)
+        name = frame.code._.code.names[self.idx]
+        value = frame.locals.mapping().subscript_opt(name, vm)
+        if value is None:
+            value = frame.load_global_or_builtin(name, vm)
+        frame.push_value(value)
         return None
 
+    def threaded(self, code: bytecode.CodeObject[PyConstant, pystr.PyStrRef]) -> Op:
+        name = code.names[self.idx]
+
+        def load_name(
+            frame: ExecutingFrame, vm: VirtualMachine
+        ) -> Optional[ExecutionResult]:
+            value = frame.locals.mapping().subscript_opt(name, vm)
+            if value is None:
+                value = frame.load_global_or_builtin(name, vm)
+            frame.push_value(value)
+            return None
+
+        return load_name
+
 
 @final
 @dataclass
 class LoadGlobal(Instruction):
     idx: NameIdx
+    cache: vm_frame.GlobalCache = field(
+        default_factory=lambda: vm_frame.GlobalCache(), compare=False, repr=False
+    )
 
     def stack_effect(self, jump: bool) -> int:
         return 1
@@ -217,10 +280,7 @@ class LoadGlobal(Instruction):
     def execute(
         self, frame: ExecutingFrame, vm: VirtualMachine
     ) -> Optional[ExecutionResult]:
-        name = frame._get_name(self.idx)
-        x = frame.load_global_or_builtin(vm.mk_str(name), vm)
-        frame.push_value(x)
-        return None
+        return frame.load_global(vm, self.idx, self.cache)
 
 
 @final
@@ -278,6 +338,17 @@ class StoreFast(Instruction):
         frame.fastlocals[self.idx] = value
         return None
 
+    def threaded(self, code: bytecode.CodeObject[PyConstant, pystr.PyStrRef]) -> Op:
+        idx = self.idx
+
+        def store_fast(
+            frame: ExecutingFrame, vm: VirtualMachine
+        ) -> Optional[ExecutionResult]:
+            frame.fastlocals[idx] = frame.pop_value()
+            return None
+
+        return store_fast
+
 
 @final
 @dataclass
@@ -295,6 +366,17 @@ class StoreLocal(Instruction):
         frame.locals.mapping().ass_subscript_(name, value, vm)
         return None
 
+    def threaded(self, code: bytecode.CodeObject[PyConstant, pystr.PyStrRef]) -> Op:
+        name = code.names[self.idx]
+
+        def store_local(
+            frame: ExecutingFrame, vm: VirtualMachine
+        ) -> Optional[ExecutionResult]:
+            frame.locals.mapping().ass_subscript_(name, frame.pop_value(), vm)
+            return None
+
+        return store_local
+
 
 @final
 @dataclass
@@ -354,7 +436,7 @@ class DeleteLocal(Instruction):
     def execute(
         self, frame: ExecutingFrame, vm: VirtualMachine
     ) -> Optional[ExecutionResult]:
-        name = vm.mk_str(frame._get_name(self.idx))
+        name = frame.code._.code.names[self.idx]
         map = frame.locals.mapping()
         try:
             map.ass_subscript_(name, None, vm)
@@ -459,6 +541,9 @@ class DeleteSubscript(Instruction):
 @dataclass
 class StoreAttr(Instruction):
     idx: NameIdx
+    cache: vm_frame.AttrCache = field(
+        default_factory=lambda: vm_frame.AttrCache(), compare=False, repr=False
+    )
 
     def stack_effect(self, jump: bool) -> int:
         return -2
@@ -466,7 +551,7 @@ class StoreAttr(Instruction):
     def execute(
         self, frame: ExecutingFrame, vm: VirtualMachine
     ) -> Optional[ExecutionResult]:
-        return frame.store_attr(vm, self.idx)
+        return frame.store_attr(vm, self.idx, self.cache)
 
 
 @final
@@ -497,6 +582,18 @@ class LoadConst(Instruction):
         frame.push_value(frame.code._.code.constants[self.idx].value)
         return None
 
+    def threaded(self, code: bytecode.CodeObject[PyConstant, pystr.PyStrRef]) -> Op:
+        value = code.constants[self.idx].value
+
+        def load_const(
+            frame: ExecutingFrame, vm: VirtualMachine
+        ) -> Optional[ExecutionResult]:
+            frame.stack[frame.sp] = value
+            frame.sp += 1
+            return None
+
+        return load_const
+
 
 @final
 @dataclass
@@ -516,12 +613,21 @@ class UnaryOperation(Instruction):
 @dataclass
 class BinaryOperation(Instruction):
     op: BinaryOperator
+    counter: int = field(default=ADAPTIVE_WARMUP, compare=False, repr=False)
 
     def stack_effect(self, jump: bool) -> int:
         return -1
 
     def execute(
         self, frame: ExecutingFrame, vm: VirtualMachine
+    ) -> Optional[ExecutionResult]:
+        self.counter -= 1
+        if self.counter <= 0:
+            specialize_binop(self, frame, vm)
+        return frame.execute_binop(vm, self.op)
+
+    def execute_generic(
+        self, frame: ExecutingFrame, vm: VirtualMachine
     ) -> Optional[ExecutionResult]:
         return frame.execute_binop(vm, self.op)
 
@@ -530,12 +636,23 @@ class BinaryOperation(Instruction):
 @dataclass
 class BinaryOperationInplace(Instruction):
     op: BinaryOperator
+    counter: int = field(default=ADAPTIVE_WARMUP, compare=False, repr=False)
 
     def stack_effect(self, jump: bool) -> int:
         return -1
 
     def execute(
         self, frame: ExecutingFrame, vm: VirtualMachine
+    ) -> Optional[ExecutionResult]:
+        self.counter -= 1
+        if self.counter <= 0:
+            # int, float and str have no inplace dunders, so the specialized
+            # binary form is equivalent for them
+            specialize_binop(self, frame, vm)
+        return frame.execute_binop_inplace(vm, self.op)
+
+    def execute_generic(
+        self, frame: ExecutingFrame, vm: VirtualMachine
     ) -> Optional[ExecutionResult]:
         return frame.execute_binop_inplace(vm, self.op)
 
@@ -544,6 +661,9 @@ class BinaryOperationInplace(Instruction):
 @dataclass
 class LoadAttr(Instruction):
     idx: NameIdx
+    cache: vm_frame.AttrCache = field(
+        default_factory=lambda: vm_frame.AttrCache(), compare=False, repr=False
+    )
 
     def stack_effect(self, jump: bool) -> int:
         return 0
@@ -551,19 +671,28 @@ class LoadAttr(Instruction):
     def execute(
         self, frame: ExecutingFrame, vm: VirtualMachine
     ) -> Optional[ExecutionResult]:
-        return frame.load_attr(vm, self.idx)
+        return frame.load_attr(vm, self.idx, self.cache)
 
 
 @final
 @dataclass
 class CompareOperation(Instruction):
     op: ComparisonOperator
+    counter: int = field(default=ADAPTIVE_WARMUP, compare=False, repr=False)
 
     def stack_effect(self, jump: bool) -> int:
         return -1
 
     def execute(
         self, frame: ExecutingFrame, vm: VirtualMachine
+    ) -> Optional[ExecutionResult]:
+        self.counter -= 1
+        if self.counter <= 0:
+            specialize_compare(self, frame, vm)
+        return frame.execute_compare(vm, self.op)
+
+    def execute_generic(
+        self, frame: ExecutingFrame, vm: VirtualMachine
     ) -> Optional[ExecutionResult]:
         return frame.execute_compare(vm, self.op)
 
@@ -703,14 +832,14 @@ class SetupAnnotation(Instruction):
         try:
             d = frame.locals.obj.downcast_exact(pydict.PyDict, vm)
         except PyImplError as e:
-            needle = vm.mk_str("__annotations__")
+            needle = vm.ctx.intern_str("__annotations__")
             has_annotations = frame._in(vm, needle, e.obj)
         else:
-            has_annotations = d._.contains_key(vm.mk_str("__annotations__"), vm)
+            has_annotations = d._.contains_key(vm.ctx.intern_str("__annotations__"), vm)
 
         if not has_annotations:
             frame.locals.obj.set_item(
-                vm.mk_str("__annotations__"), vm.ctx.new_dict(), vm
+                vm.ctx.intern_str("__annotations__"), vm.ctx.new_dict(), vm
             )
         return None
 
@@ -800,8 +929,7 @@ class PopBlock(Instruction):
     def execute(
         self, frame: ExecutingFrame, vm: VirtualMachine
     ) -> Optional[ExecutionResult]:
-        frame.pop_block()
-        return None
+        frame.fatal("PopBlock is resolved by the compiler")
 
 
 @final
@@ -816,7 +944,7 @@ class PrintExpr(Instruction):
         expr = frame.pop_value()
 
         try:
-            displayhook = vm.sys_module.get_attr(vm.mk_str("displayhook"), vm)
+            displayhook = vm.sys_module.get_attr(vm.ctx.intern_str("displayhook"), vm)
         except PyImplBase:
             vm.new_runtime_error("lost sys.displayhook")
 
@@ -833,7 +961,7 @@ class LoadBuildClass(Instruction):
     def execute(
         self, frame: ExecutingFrame, vm: VirtualMachine
     ) -> Optional[ExecutionResult]:
-        frame.push_value(vm.builtins.get_attr(vm.mk_str("__build_class__"), vm))
+        frame.push_value(vm.builtins.get_attr(vm.ctx.intern_str("__build_class__"), vm))
         return None
 
 
@@ -887,7 +1015,7 @@ class BeforeAsyncWith(Instruction):
         self, frame: ExecutingFrame, vm: VirtualMachine
     ) -> Optional[ExecutionResult]:
         mgr = frame.pop_value()
-        aexit = mgr.clone().get_attr(vm.mk_str("__aexit__"), vm)
+        aexit = mgr.clone().get_attr(vm.ctx.intern_str("__aexit__"), vm)
         frame.push_value(aexit)
         aenter_res = vm.call_special_method(mgr, "__aenter__", fn.FuncArgs.empty())
         frame.push_value(aenter_res)
@@ -956,7 +1084,10 @@ class EnterFinally(Instruction):
     def execute(
         self, frame: ExecutingFrame, vm: VirtualMachine
     ) -> Optional[ExecutionResult]:
-        frame.push_block(vm_frame.BlockFinallyHandler(None, vm.current_exception()))
+        frame.push_block(
+            vm_frame.BlockFinallyHandler(None, vm.current_exception()),
+            len(frame.exception_handlers()),
+        )
         return None
 
 
@@ -973,7 +1104,7 @@ class EndFinally(Instruction):
         if isinstance(block.type, vm_frame.BlockFinallyHandler):
             vm.set_exception(block.type.prev_exc)
             if block.type.reason is not None:
-                frame.unwind_blocks(vm, block.type.reason)
+                return frame.unwind_blocks(vm, block.type.reason)
         else:
             frame.fatal(
                 "Block type must be finally handler when reaching EndFinally instruction!"
@@ -1007,7 +1138,7 @@ class Jump(Instruction, LabelArgMixin):
     def execute(
         self, frame: ExecutingFrame, vm: VirtualMachine
     ) -> Optional[ExecutionResult]:
-        frame.jump(self.target)
+        frame.jump_checked(self.target, vm)
         return None
 
 
@@ -1015,17 +1146,26 @@ class Jump(Instruction, LabelArgMixin):
 @dataclass
 class JumpIfTrue(Instruction, LabelArgMixin):
     target: Label
+    counter: int = field(default=ADAPTIVE_WARMUP, compare=False, repr=False)
 
     def stack_effect(self, jump: bool) -> int:
         return -1
 
     def execute(
         self, frame: ExecutingFrame, vm: VirtualMachine
+    ) -> Optional[ExecutionResult]:
+        self.counter -= 1
+        if self.counter <= 0:
+            specialize_jump_if(self, True, frame, vm)
+        return self.execute_generic(frame, vm)
+
+    def execute_generic(
+        self, frame: ExecutingFrame, vm: VirtualMachine
     ) -> Optional[ExecutionResult]:
         obj = frame.pop_value()
         value = obj.try_to_bool(vm)
         if value:
-            frame.jump(self.target)
+            frame.jump_checked(self.target, vm)
         return None
 
 
@@ -1033,17 +1173,26 @@ class JumpIfTrue(Instruction, LabelArgMixin):
 @dataclass
 class JumpIfFalse(Instruction, LabelArgMixin):
     target: Label
+    counter: int = field(default=ADAPTIVE_WARMUP, compare=False, repr=False)
 
     def stack_effect(self, jump: bool) -> int:
         return -1
 
     def execute(
         self, frame: ExecutingFrame, vm: VirtualMachine
+    ) -> Optional[ExecutionResult]:
+        self.counter -= 1
+        if self.counter <= 0:
+            specialize_jump_if(self, False, frame, vm)
+        return self.execute_generic(frame, vm)
+
+    def execute_generic(
+        self, frame: ExecutingFrame, vm: VirtualMachine
     ) -> Optional[ExecutionResult]:
         obj = frame.pop_value()
         value = obj.try_to_bool(vm)
         if not value:
-            frame.jump(self.target)
+            frame.jump_checked(self.target, vm)
         return None
 
 
@@ -1104,9 +1253,17 @@ class CallFunctionPositional(Instruction):
     def execute(
         self, frame: ExecutingFrame, vm: VirtualMachine
     ) -> Optional[ExecutionResult]:
-        args = frame.collect_positional_args(self.nargs)
-        frame.execute_call(args, vm)
-        return None
+        return frame.execute_vectorcall(self.nargs, None, vm)
+
+    def threaded(self, code: bytecode.CodeObject[PyConstant, pystr.PyStrRef]) -> Op:
+        nargs = self.nargs
+
+        def call_function(
+            frame: ExecutingFrame, vm: VirtualMachine
+        ) -> Optional[ExecutionResult]:
+            return frame.execute_vectorcall(nargs, None, vm)
+
+        return call_function
 
 
 @final
@@ -1120,9 +1277,8 @@ class CallFunctionKeyword(Instruction):
     def execute(
         self, frame: ExecutingFrame, vm: VirtualMachine
     ) -> Optional[ExecutionResult]:
-        args = frame.collect_keyword_args(self.nargs)
-        frame.execute_call(args, vm)
-        return None
+        kwnames = frame.pop_kwnames()
+        return frame.execute_vectorcall(self.nargs, kwnames, vm)
 
 
 @final
@@ -1136,9 +1292,7 @@ class CallMethodPositional(Instruction):
     def execute(
         self, frame: ExecutingFrame, vm: VirtualMachine
     ) -> Optional[ExecutionResult]:
-        args = frame.collect_positional_args(self.nargs)
-        frame.execute_method_call(args, vm)
-        return None
+        return frame.execute_method_vectorcall(self.nargs, None, vm)
 
 
 @final
@@ -1152,9 +1306,8 @@ class CallMethodKeyword(Instruction):
     def execute(
         self, frame: ExecutingFrame, vm: VirtualMachine
     ) -> Optional[ExecutionResult]:
-        args = frame.collect_keyword_args(self.nargs)
-        frame.execute_method_call(args, vm)
-        return None
+        kwnames = frame.pop_kwnames()
+        return frame.execute_method_vectorcall(self.nargs, kwnames, vm)
 
 
 @final
@@ -1191,14 +1344,16 @@ class CallFunctionEx(Instruction):
         self, frame: ExecutingFrame, vm: VirtualMachine
     ) -> Optional[ExecutionResult]:
         args = frame.collect_ex_args(vm, self.has_kwargs)
-        frame.execute_call(args, vm)
-        return None
+        return frame.execute_call(args, vm)
 
 
 @final
 @dataclass
 class LoadMethod(Instruction):
     idx: NameIdx
+    cache: vm_frame.AttrCache = field(
+        default_factory=lambda: vm_frame.AttrCache(), compare=False, repr=False
+    )
 
     def stack_effect(self, jump: bool) -> int:
         return -1 + 3
@@ -1206,20 +1361,7 @@ class LoadMethod(Instruction):
     def execute(
         self, frame: ExecutingFrame, vm: VirtualMachine
     ) -> Optional[ExecutionResult]:
-        obj = frame.pop_value()
-        method_name = frame.code._.code.names[self.idx]
-        method = po.PyMethod.get(obj, method_name, vm)
-        if isinstance(method, po.PyMethodFunction):
-            target, is_method, func = method.target, True, method.func
-        elif isinstance(method, po.PyMethodAttribute):
-            target, is_method, func = vm.ctx.get_none(), False, method.func
-        else:
-            assert False, method
-
-        frame.push_value(target)
-        frame.push_value(vm.ctx.new_bool(is_method))
-        frame.push_value(func)
-        return None
+        return frame.load_method(vm, self.idx, self.cache)
 
 
 @final
@@ -1234,14 +1376,14 @@ class CallMethodEx(Instruction):
         self, frame: ExecutingFrame, vm: VirtualMachine
     ) -> Optional[ExecutionResult]:
         args = frame.collect_ex_args(vm, self.has_kwargs)
-        frame.execute_method_call(args, vm)
-        return None
+        return frame.execute_method_call(args, vm)
 
 
 @final
 @dataclass
 class ForIter(Instruction, LabelArgMixin):
     target: Label
+    counter: int = field(default=ADAPTIVE_WARMUP, compare=False, repr=False)
 
     def stack_effect(self, jump: bool) -> int:
         if jump:
@@ -1251,6 +1393,15 @@ class ForIter(Instruction, LabelArgMixin):
 
     def execute(
         self, frame: ExecutingFrame, vm: VirtualMachine
+    ) -> Optional[ExecutionResult]:
+        self.counter -= 1
+        if self.counter <= 0:
+            specialize_for_iter(self, frame, vm)
+        frame.execute_for_iter(vm, self.target)
+        return None
+
+    def execute_generic(
+        self, frame: ExecutingFrame, vm: VirtualMachine
     ) -> Optional[ExecutionResult]:
         frame.execute_for_iter(vm, self.target)
         return None
@@ -1258,8 +1409,9 @@ class ForIter(Instruction, LabelArgMixin):
 
 @final
 @dataclass
-class SetupLoop(Instruction, LabelArgMixin):
+class SetupLoop(Instruction, SetupBlockMixin):
     target: Label
+    kind = bytecode.HandlerKind.LOOP
 
     def stack_effect(self, jump: bool) -> int:
         return 0
@@ -1267,14 +1419,14 @@ class SetupLoop(Instruction, LabelArgMixin):
     def execute(
         self, frame: ExecutingFrame, vm: VirtualMachine
     ) -> Optional[ExecutionResult]:
-        frame.push_block(vm_frame.BlockLoop(self.target))
-        return None
+        frame.fatal("SetupLoop is resolved by the compiler")
 
 
 @final
 @dataclass
-class SetupFinally(Instruction, LabelArgMixin):
+class SetupFinally(Instruction, SetupBlockMixin):
     target: Label
+    kind = bytecode.HandlerKind.FINALLY
 
     def stack_effect(self, jump: bool) -> int:
         return 0
@@ -1282,14 +1434,14 @@ class SetupFinally(Instruction, LabelArgMixin):
     def execute(
         self, frame: ExecutingFrame, vm: VirtualMachine
     ) -> Optional[ExecutionResult]:
-        frame.push_block(vm_frame.BlockFinally(self.target))
-        return None
+        frame.fatal("SetupFinally is resolved by the compiler")
 
 
 @final
 @dataclass
-class SetupExcept(Instruction, LabelArgMixin):
+class SetupExcept(Instruction, SetupBlockMixin):
     target: Label
+    kind = bytecode.HandlerKind.TRY_EXCEPT
 
     def stack_effect(self, jump: bool) -> int:
         if jump:
@@ -1300,14 +1452,14 @@ class SetupExcept(Instruction, LabelArgMixin):
     def execute(
         self, frame: ExecutingFrame, vm: VirtualMachine
     ) -> Optional[ExecutionResult]:
-        frame.push_block(vm_frame.BlockTryExcept(self.target))
-        return None
+        frame.fatal("SetupExcept is resolved by the compiler")
 
 
 @final
 @dataclass
-class SetupWith(Instruction, LabelArgMixin):
+class SetupWith(Instruction, SetupBlockMixin):
     target: Label
+    kind = bytecode.HandlerKind.FINALLY
 
     def stack_effect(self, jump: bool) -> int:
         if jump:
@@ -1319,13 +1471,12 @@ class SetupWith(Instruction, LabelArgMixin):
         self, frame: ExecutingFrame, vm: VirtualMachine
     ) -> Optional[ExecutionResult]:
         context_manager = frame.pop_value()
-        exit = context_manager.get_attr(vm.mk_str("__exit__"), vm)
+        exit = context_manager.get_attr(vm.ctx.intern_str("__exit__"), vm)
         frame.push_value(exit)
 
         enter_res = vm.call_special_method(
             context_manager, "__enter__", fn.FuncArgs.empty()
         )
-        frame.push_block(vm_frame.BlockFinally(self.target))
         frame.push_value(enter_res)
         return None
 
@@ -1358,7 +1509,7 @@ class BuildString(Instruction):
     size: int
 
     def stack_effect(self, jump: bool) -> int:
-        return self.size
+        return -self.size + 1
 
     def execute(
         self, frame: ExecutingFrame, vm: VirtualMachine
@@ -1380,7 +1531,7 @@ class BuildTuple(Instruction):
     size: int
 
     def stack_effect(self, jump: bool) -> int:
-        return self.size
+        return -self.size + 1
 
     def execute(
         self, frame: ExecutingFrame, vm: VirtualMachine
@@ -1398,7 +1549,7 @@ class BuildList(Instruction):
     size: int
 
     def stack_effect(self, jump: bool) -> int:
-        return self.size
+        return -self.size + 1
 
     def execute(
         self, frame: ExecutingFrame, vm: VirtualMachine
@@ -1416,7 +1567,7 @@ class BuildSet(Instruction):
     size: int
 
     def stack_effect(self, jump: bool) -> int:
-        return self.size
+        return -self.size + 1
 
     def execute(
         self, frame: ExecutingFrame, vm: VirtualMachine
@@ -1476,7 +1627,7 @@ class ListAppend(Instruction):
         self, frame: ExecutingFrame, vm: VirtualMachine
     ) -> Optional[ExecutionResult]:
         obj = frame.nth_value(self.i)
-        list_ = obj.downcast_unchecked(PyList)
+        list_ = obj.downcast_unchecked(pylist.PyList)
         item = frame.pop_value()
         list_._.append(item, vm=vm)
         return None
@@ -1511,8 +1662,9 @@ class MapAdd(Instruction):
     def execute(
         self, frame: ExecutingFrame, vm: VirtualMachine
     ) -> Optional[ExecutionResult]:
-        obj = frame.nth_value(self.i)
-        dict_ = obj.downcast_unchecked(PyDict)
+        # below the key and the value
+        obj = frame.nth_value(self.i + 1)
+        dict_ = obj.downcast_unchecked(pydict.PyDict)
         key = frame.pop_value()
         value = frame.pop_value()
         dict_._.set_item(key, value, vm)
@@ -1541,7 +1693,7 @@ class UnpackSequence(Instruction):
             raise
 
         if len(elements) == self.size:
-            frame.state.stack.extend(reversed(elements))
+            frame.push_multiple(elements[::-1])
         elif len(elements) > self.size:
             vm.new_value_error(f"too many values to unpack (expected {self.size})")
         else:
@@ -1606,14 +1758,18 @@ class Reverse(Instruction):
     def execute(
         self, frame: ExecutingFrame, vm: VirtualMachine
     ) -> Optional[ExecutionResult]:
-        frame.state.stack[-self.amount :] = reversed(frame.state.stack[-self.amount :])
+        stack = frame.stack
+        sp = frame.sp
+        stack[sp - self.amount : sp] = stack[sp - self.amount : sp][::-1]
         return None
 
 
 @final
 @dataclass
-class SetupAsyncWith(Instruction, LabelArgMixin):
+class SetupAsyncWith(Instruction, SetupBlockMixin):
     target: Label
+    kind = bytecode.HandlerKind.FINALLY
+    level_offset = -1
 
     def stack_effect(self, jump: bool) -> int:
         if jump:
@@ -1624,10 +1780,7 @@ class SetupAsyncWith(Instruction, LabelArgMixin):
     def execute(
         self, frame: ExecutingFrame, vm: VirtualMachine
     ) -> Optional[ExecutionResult]:
-        enter_res = frame.pop_value()
-        frame.push_block(vm_frame.BlockFinally(self.target))
-        frame.push_value(enter_res)
-        return None
+        frame.fatal("SetupAsyncWith is resolved by the compiler")
 
 
 @final
@@ -1641,9 +1794,489 @@ class MapAddRev(Instruction):
     def execute(
         self, frame: ExecutingFrame, vm: VirtualMachine
     ) -> Optional[ExecutionResult]:
-        obj = frame.nth_value(self.i)
-        dict_ = obj.downcast_unchecked(PyDict)
+        # below the key and the value
+        obj = frame.nth_value(self.i + 1)
+        dict_ = obj.downcast_unchecked(pydict.PyDict)
         value = frame.pop_value()
         key = frame.pop_value()
         dict_._.set_item(key, value, vm)
         return None
+
+
+# Adaptive specialization: the generic `BinaryOperation`, `BinaryOperationInplace`,
+# `CompareOperation`, `JumpIfTrue` and `JumpIfFalse` count their executions and,
+# once warmed up, rewrite themselves in `CodeObject.instructions` into one of the
+# variants below, guarded on the exact operand types. A guard failure restores the
+# generic instruction.
+
+
+def quicken(frame: ExecutingFrame, old: Instruction, new: Instruction) -> None:
+    instrs = frame.code._.code.instructions
+    idx = frame.lasti - 1
+    if instrs[idx] is old:
+        instrs[idx] = new
+        if (ops := frame.code._.ops) is not None:
+            ops[idx] = new.threaded(frame.code._.code)
+    elif isinstance(sup := instrs[idx], Superinstruction) and sup.first is old:
+        sup.first = new
+
+
+AdaptiveBinaryOperation = BinaryOperation | BinaryOperationInplace
+AdaptiveJumpIf = JumpIfTrue | JumpIfFalse
+
+# op -> (host function, whether the right operand must be non-zero)
+INT_BINOPS: dict[BinaryOperator, tuple[Callable[[Any, Any], Any], bool]] = {
+    BinaryOperator.Add: (operator.add, False),
+    BinaryOperator.Subtract: (operator.sub, False),
+    BinaryOperator.Multiply: (operator.mul, False),
+    BinaryOperator.FloorDivide: (operator.floordiv, True),
+    BinaryOperator.Modulo: (operator.mod, True),
+    BinaryOperator.And: (operator.and_, False),
+    BinaryOperator.Or: (operator.or_, False),
+    BinaryOperator.Xor: (operator.xor, False),
+}
+FLOAT_BINOPS: dict[BinaryOperator, tuple[Callable[[Any, Any], Any], bool]] = {
+    BinaryOperator.Add: (operator.add, False),
+    BinaryOperator.Subtract: (operator.sub, False),
+    BinaryOperator.Multiply: (operator.mul, False),
+    BinaryOperator.Divide: (operator.truediv, True),
+    BinaryOperator.FloorDivide: (operator.floordiv, True),
+    BinaryOperator.Modulo: (operator.mod, True),
+}
+STR_BINOPS: dict[BinaryOperator, tuple[Callable[[Any, Any], Any], bool]] = {
+    BinaryOperator.Add: (operator.add, False),
+}
+COMPARE_OPS: dict[ComparisonOperator, Callable[[Any, Any], bool]] = {
+    ComparisonOperator.Equal: operator.eq,
+    ComparisonOperator.NotEqual: operator.ne,
+    ComparisonOperator.Less: operator.lt,
+    ComparisonOperator.LessOrEqual: operator.le,
+    ComparisonOperator.Greater: operator.gt,
+    ComparisonOperator.GreaterOrEqual: operator.ge,
+}
+
+
+def specialize_binop(
+    instr: AdaptiveBinaryOperation, frame: ExecutingFrame, vm: VirtualMachine
+) -> None:
+    a = frame.nth_value(1)
+    b = frame.nth_value(0)
+    cls = a.class_()._
+    types = vm.ctx.types
+    box: Callable[[Any], PyObjectRef]
+    if cls is not b.class_()._:
+        ops = None
+    elif cls is types.int_type._:
+        ops, box = INT_BINOPS, vm.ctx.new_int
+    elif cls is types.float_type._:
+        ops, box = FLOAT_BINOPS, vm.ctx.new_float
+    elif cls is types.str_type._:
+        ops, box = STR_BINOPS, vm.ctx.new_str
+    else:
+        ops = None
+    if ops is None or (entry := ops.get(instr.op)) is None:
+        instr.counter = ADAPTIVE_BACKOFF
+        vm_stats.specialization(BinaryOperationSpecialized.__name__, False)
+        return
+    func, nonzero = entry
+    vm_stats.specialization(BinaryOperationSpecialized.__name__, True)
+    quicken(
+        frame,
+        instr,
+        BinaryOperationSpecialized(instr.op, cls, func, box, nonzero, instr),
+    )
+
+
+def specialize_compare(
+    instr: CompareOperation, frame: ExecutingFrame, vm: VirtualMachine
+) -> None:
+    a = frame.nth_value(1)
+    b = frame.nth_value(0)
+    cls = a.class_()._
+    types = vm.ctx.types
+    func = COMPARE_OPS.get(instr.op)
+    if (
+        func is None
+        or cls is not b.class_()._
+        or not (
+            cls is types.int_type._
+            or cls is types.float_type._
+            or cls is types.str_type._
+        )
+    ):
+        instr.counter = ADAPTIVE_BACKOFF
+        vm_stats.specialization(CompareOperationSpecialized.__name__, False)
+        return
+    vm_stats.specialization(CompareOperationSpecialized.__name__, True)
+    quicken(frame, instr, CompareOperationSpecialized(instr.op, cls, func, instr))
+
+
+def specialize_jump_if(
+    instr: AdaptiveJumpIf, jump_if: bool, frame: ExecutingFrame, vm: VirtualMachine
+) -> None:
+    cls = frame.last_value().class_()._
+    types = vm.ctx.types
+    truth: Callable[[Any], bool]
+    if cls is types.bool_type._ or cls is types.int_type._:
+        truth = lambda p: p.value != 0
+    elif cls is types.none_type._:
+        truth = lambda p: False
+    elif cls is types.list_type._ or cls is types.tuple_type._:
+        truth = lambda p: len(p.elements) != 0
+    elif cls is types.str_type._:
+        truth = lambda p: len(p.value) != 0
+    else:
+        instr.counter = ADAPTIVE_BACKOFF
+        vm_stats.specialization(JumpIfSpecialized.__name__, False)
+        return
+    vm_stats.specialization(JumpIfSpecialized.__name__, True)
+    quicken(frame, instr, JumpIfSpecialized(instr.target, jump_if, cls, truth, instr))
+
+
+@final
+@dataclass
+class BinaryOperationSpecialized(Instruction):
+    op: BinaryOperator
+    guard: PyType
+    func: Callable[[Any, Any], Any]
+    box: Callable[[Any], PyObjectRef]
+    nonzero: bool
+    generic: AdaptiveBinaryOperation
+
+    def stack_effect(self, jump: bool) -> int:
+        return -1
+
+    def execute(
+        self, frame: ExecutingFrame, vm: VirtualMachine
+    ) -> Optional[ExecutionResult]:
+        stack = frame.stack
+        sp = frame.sp
+        a = stack[sp - 2]
+        b = stack[sp - 1]
+        if a.type._ is self.guard and b.type._ is self.guard:
+            rhs = b._.value
+            if rhs or not self.nonzero:
+                if vm_stats.STATS is not None:
+                    vm_stats.STATS.hit[BinaryOperationSpecialized.__name__] += 1
+                frame.sp = sp - 1
+                stack[sp - 1] = None  # type: ignore
+                stack[sp - 2] = self.box(self.func(a._.value, rhs))
+                return None
+            # let the generic path raise ZeroDivisionError
+            vm_stats.miss(self, False)
+            return self.generic.execute_generic(frame, vm)
+        self.generic.counter = ADAPTIVE_BACKOFF
+        vm_stats.miss(self, True)
+        quicken(frame, self, self.generic)
+        return self.generic.execute_generic(frame, vm)
+
+
+@final
+@dataclass
+class CompareOperationSpecialized(Instruction):
+    op: ComparisonOperator
+    guard: PyType
+    func: Callable[[Any, Any], bool]
+    generic: CompareOperation
+
+    def stack_effect(self, jump: bool) -> int:
+        return -1
+
+    def execute(
+        self, frame: ExecutingFrame, vm: VirtualMachine
+    ) -> Optional[ExecutionResult]:
+        stack = frame.stack
+        sp = frame.sp
+        a = stack[sp - 2]
+        b = stack[sp - 1]
+        if a.type._ is self.guard and b.type._ is self.guard:
+            if vm_stats.STATS is not None:
+                vm_stats.STATS.hit[CompareOperationSpecialized.__name__] += 1
+            frame.sp = sp - 1
+            stack[sp - 1] = None  # type: ignore
+            stack[sp - 2] = vm.ctx.new_bool(self.func(a._.value, b._.value))
+            return None
+        self.generic.counter = ADAPTIVE_BACKOFF
+        vm_stats.miss(self, True)
+        quicken(frame, self, self.generic)
+        return self.generic.execute_generic(frame, vm)
+
+
+@final
+@dataclass
+class JumpIfSpecialized(Instruction, LabelArgMixin):
+    target: Label
+    jump_if: bool
+    guard: PyType
+    truth: Callable[[Any], bool]
+    generic: AdaptiveJumpIf
+
+    def stack_effect(self, jump: bool) -> int:
+        return -1
+
+    def execute(
+        self, frame: ExecutingFrame, vm: VirtualMachine
+    ) -> Optional[ExecutionResult]:
+        obj = frame.last_value()
+        if obj.type._ is self.guard:
+            if vm_stats.STATS is not None:
+                vm_stats.STATS.hit[JumpIfSpecialized.__name__] += 1
+            frame.pop_value()
+            if self.truth(obj._) is self.jump_if:
+                frame.jump_checked(self.target, vm)
+            return None
+        self.generic.counter = ADAPTIVE_BACKOFF
+        vm_stats.miss(self, True)
+        quicken(frame, self, self.generic)
+        return self.generic.execute_generic(frame, vm)
+
+
+def specialize_for_iter(
+    instr: ForIter, frame: ExecutingFrame, vm: VirtualMachine
+) -> None:
+    cls = frame.last_value().class_()._
+    types = vm.ctx.types
+    new: ForIterSpecialized
+    if cls is types.list_iterator_type._ or cls is types.tuple_iterator_type._:
+        new = ForIterSequence(instr.target, cls, instr)
+    elif cls is types.range_iterator_type._ or cls is types.longrange_iterator_type._:
+        new = ForIterRange(instr.target, cls, instr)
+    elif cls is types.dict_keyiterator_type._:
+        new = ForIterDict(instr.target, cls, instr, False)
+    elif cls is types.dict_itemiterator_type._:
+        new = ForIterDict(instr.target, cls, instr, True)
+    else:
+        instr.counter = ADAPTIVE_BACKOFF
+        vm_stats.specialization(ForIter.__name__, False)
+        return
+    vm_stats.specialization(type(new).__name__, True)
+    quicken(frame, instr, new)
+
+
+@dataclass
+class ForIterSpecialized(Instruction, LabelArgMixin):
+    # reads the next element straight out of the iterator's storage; the iterator
+    # is popped and `target` jumped to on exhaustion, as in `execute_for_iter`
+    target: Label
+    guard: PyType
+    generic: ForIter
+
+    def stack_effect(self, jump: bool) -> int:
+        return self.generic.stack_effect(jump)
+
+    def deopt(
+        self, frame: ExecutingFrame, vm: VirtualMachine
+    ) -> Optional[ExecutionResult]:
+        self.generic.counter = ADAPTIVE_BACKOFF
+        vm_stats.miss(self, True)
+        quicken(frame, self, self.generic)
+        return self.generic.execute_generic(frame, vm)
+
+
+@final
+@dataclass
+class ForIterSequence(ForIterSpecialized):
+    # list and tuple iterators
+    def execute(
+        self, frame: ExecutingFrame, vm: VirtualMachine
+    ) -> Optional[ExecutionResult]:
+        it = frame.stack[frame.sp - 1]
+        if it.type._ is not self.guard:
+            return self.deopt(frame, vm)
+        if vm_stats.STATS is not None:
+            vm_stats.STATS.hit[ForIterSequence.__name__] += 1
+        internal = it._.internal
+        status = internal.status
+        if type(status) is pyiter.IterStatusActive:
+            elements = status.value._.elements
+            pos = internal.position
+            if pos < len(elements):
+                internal.position = pos + 1
+                frame.push_value(elements[pos])
+                return None
+            internal.status = pyiter.IterStatusExhausted()
+        frame.pop_value()
+        frame.jump(self.target)
+        return None
+
+
+@final
+@dataclass
+class ForIterRange(ForIterSpecialized):
+    def execute(
+        self, frame: ExecutingFrame, vm: VirtualMachine
+    ) -> Optional[ExecutionResult]:
+        it = frame.stack[frame.sp - 1]
+        if it.type._ is not self.guard:
+            return self.deopt(frame, vm)
+        if vm_stats.STATS is not None:
+            vm_stats.STATS.hit[ForIterRange.__name__] += 1
+        zelf = it._
+        index = zelf.index
+        zelf.index = index + 1
+        if index < zelf.length:
+            frame.push_value(vm.ctx.new_int(zelf.start + index * zelf.step))
+            return None
+        frame.pop_value()
+        frame.jump(self.target)
+        return None
+
+
+@final
+@dataclass
+class ForIterDict(ForIterSpecialized):
+    # key and item iterators
+    items: bool
+
+    def execute(
+        self, frame: ExecutingFrame, vm: VirtualMachine
+    ) -> Optional[ExecutionResult]:
+        it = frame.stack[frame.sp - 1]
+        if it.type._ is not self.guard:
+            return self.deopt(frame, vm)
+        if vm_stats.STATS is not None:
+            vm_stats.STATS.hit[ForIterDict.__name__] += 1
+        try:
+            item = next(it._.iterator, None)
+        except RuntimeError:
+            vm.new_runtime_error("dictionary changed size during iteration")
+        if item is not None:
+            frame.push_value(vm.ctx.new_tuple(list(item)) if self.items else item)
+            return None
+        frame.pop_value()
+        frame.jump(self.target)
+        return None
+
+
+@dataclass
+class Superinstruction(Instruction):
+    # runs `first` and then the instruction after it, saving a trip through the
+    # dispatch loop. the second instruction stays in place (and is what runs, so it
+    # can still be quickened), which keeps jump targets, `locations` and the
+    # exception table valid
+    first: Instruction
+    second: Instruction
+
+    def stack_effect(self, jump: bool) -> int:
+        return self.first.stack_effect(False) + self.second.stack_effect(jump)
+
+    def opname(self) -> str:
+        return f"{self.first.opname()}+{self.second.opname()}"
+
+    def execute(
+        self, frame: ExecutingFrame, vm: VirtualMachine
+    ) -> Optional[ExecutionResult]:
+        return self.unfused(frame, vm)
+
+    def unfused(
+        self, frame: ExecutingFrame, vm: VirtualMachine
+    ) -> Optional[ExecutionResult]:
+        self.first.execute(frame, vm)
+        idx = frame.lasti
+        frame.lasti = idx + 1
+        return frame.code._.code.instructions[idx].execute(frame, vm)
+
+
+@final
+@dataclass
+class LoadFastLoadFast(Superinstruction):
+    first: LoadFast
+    second: LoadFast
+
+    def execute(
+        self, frame: ExecutingFrame, vm: VirtualMachine
+    ) -> Optional[ExecutionResult]:
+        fastlocals = frame.fastlocals
+        a = fastlocals[self.first.idx]
+        b = fastlocals[self.second.idx]
+        if a is None or b is None:
+            return self.unfused(frame, vm)
+        stack = frame.stack
+        sp = frame.sp
+        stack[sp] = a
+        stack[sp + 1] = b
+        frame.sp = sp + 2
+        frame.lasti += 1
+        return None
+
+    def threaded(self, code: bytecode.CodeObject[PyConstant, pystr.PyStrRef]) -> Op:
+        idx_a = self.first.idx
+        idx_b = self.second.idx
+        unfused = self.unfused
+
+        def load_fast_load_fast(
+            frame: ExecutingFrame, vm: VirtualMachine
+        ) -> Optional[ExecutionResult]:
+            fastlocals = frame.fastlocals
+            a = fastlocals[idx_a]
+            b = fastlocals[idx_b]
+            if a is None or b is None:
+                return unfused(frame, vm)
+            stack = frame.stack
+            sp = frame.sp
+            stack[sp] = a
+            stack[sp + 1] = b
+            frame.sp = sp + 2
+            frame.lasti += 1
+            return None
+
+        return load_fast_load_fast
+
+
+@final
+@dataclass
+class LoadFastLoadAttr(Superinstruction):
+    first: LoadFast
+    second: LoadAttr
+
+    def execute(
+        self, frame: ExecutingFrame, vm: VirtualMachine
+    ) -> Optional[ExecutionResult]:
+        obj = frame.fastlocals[self.first.idx]
+        if obj is None:
+            return self.unfused(frame, vm)
+        frame.lasti += 1
+        second = self.second
+        frame.push_value(frame.get_attr_cached(vm, obj, second.idx, second.cache))
+        return None
+
+
+@final
+@dataclass
+class StoreFastLoadFast(Superinstruction):
+    first: StoreFast
+    second: LoadFast
+
+    def execute(
+        self, frame: ExecutingFrame, vm: VirtualMachine
+    ) -> Optional[ExecutionResult]:
+        stack = frame.stack
+        fastlocals = frame.fastlocals
+        fastlocals[self.first.idx] = stack[frame.sp - 1]
+        value = fastlocals[self.second.idx]
+        frame.lasti += 1
+        if value is None:
+            frame.pop_value()
+            return self.second.execute(frame, vm)
+        stack[frame.sp - 1] = value
+        return None
+
+
+def superinstruction(first: Instruction, second: Instruction) -> Optional[Instruction]:
+    if isinstance(first, LoadFast):
+        if isinstance(second, LoadFast):
+            return LoadFastLoadFast(first, second)
+        elif isinstance(second, LoadAttr):
+            return LoadFastLoadAttr(first, second)
+    elif isinstance(first, StoreFast):
+        if isinstance(second, LoadFast):
+            return StoreFastLoadFast(first, second)
+    elif isinstance(first, LoadConst):
+        if isinstance(
+            second, (BinaryOperation, BinaryOperationInplace, CompareOperation)
+        ):
+            return Superinstruction(first, second)
+    elif isinstance(first, CompareOperation):
+        if isinstance(second, (JumpIfTrue, JumpIfFalse)):
+            return Superinstruction(first, second)
+    return None
@@ -101,6 +101,7 @@ class MethodData:
     # cast: bool
     # casts: Callable[[VirtualMachine, FuncArgs], PyObjectRef]
     casts: Optional[dict[str, Callable[[VirtualMachine, PyObjectRef], PyObjectRef]]]
+    binder: Optional[ArgBinder] = None
 
     @staticmethod
     def from_method(method: Callable, type: ImplMethodType, cast: bool) -> MethodData:
@@ -117,8 +118,16 @@ class MethodData:
         elif name.startswith("r__"):
             name = name[3:]
 
+        if not cast:
+            return MethodData(name=name, method=method, type=type, casts=None)
+        # the receiver of an instance method is passed through uncast
+        skip = 1 if type == ImplMethodType.INSTANCE else 0
         return MethodData(
-            name=name, method=method, type=type, casts=get_casts(func) if cast else None
+            name=name,
+            method=method,
+            type=type,
+            casts=get_casts(func),
+            binder=ArgBinder.from_function(func, skip),
         )
 
 
@@ -306,18 +315,14 @@ class TypeProxy:
         return TypeProxy(name, module=module, typ=None, is_optional=is_optional)
 
     def try_from_object(self, vm: VirtualMachine, obj: PyObjectRef):
-        import vm.pyobjectrc as prc
-
         if self.name == "PyRef":
             return obj
-        if self.typ is None:
-            self.typ = getattr(__import__(self.module, fromlist=[self.name]), self.name)
-        ret = self.typ.try_from_object(vm, obj)
-        assert isinstance(ret, prc.PyRef), (
-            type(ret),
-            self.typ.try_from_object,
-        )  # TODO: rm
-        return ret
+        typ = self.typ
+        if typ is None:
+            typ = self.typ = getattr(
+                __import__(self.module, fromlist=[self.name]), self.name
+            )
+        return typ.try_from_object(vm, obj)
 
 
 def cast_to_int(vm: VirtualMachine, obj: PyObjectRef, /) -> int:
@@ -399,16 +404,131 @@ def get_casts(
 
 
 def cast_args(f: Callable) -> Callable[[VirtualMachine, FuncArgs], PyObjectRef]:
-    sig = inspect.signature(f, eval_str=False)
-    casts = get_casts(f)
+    binder = ArgBinder.from_function(f, 0)
 
     def foo(vm: VirtualMachine, fargs: FuncArgs) -> PyObjectRef:
-        bs = sig.bind(*fargs.args, **fargs.kwargs, vm=vm)
-        res = f(
-            *(casts[name](vm, obj) for name, obj in zip(bs.arguments, bs.args)),
-            **{k: casts[k](vm, v) for k, v in bs.kwargs.items() if k != "vm"},
-            vm=vm,
-        )
-        return primitive_to_pyobject(res, vm)
+        args, kwargs = binder.bind(vm, fargs.args, fargs.kwargs)
+        return primitive_to_pyobject(f(*args, **kwargs), vm)
 
     return foo
+
+
+Cast: TypeAlias = "Callable[[VirtualMachine, PyObjectRef], Any]"
+
+
+# `None` for the casts that return the object unchanged
+def cast_or_none(cast: Cast) -> Optional[Cast]:
+    proxy = getattr(cast, "__self__", None)
+    if isinstance(proxy, TypeProxy) and proxy.name == "PyRef":
+        return None
+    return cast
+
+
+# binds the arguments of a call to the parameters of a native function. the plan
+# is made once from the signature, so a call with only positional arguments is an
+# arity check and a cast per argument; keywords fall back to `inspect`
+@dataclass
+class ArgBinder:
+    name: str
+    signature: inspect.Signature
+    # the first `skip` arguments are passed through uncast
+    skip: int
+    # one entry per parameter that can be passed positionally, after `skip`
+    casts: list[Optional[Cast]]
+    nrequired: int
+    varargs: bool
+    varargs_cast: Optional[Cast]
+    named_casts: dict[str, Optional[Cast]]
+    takes_vm: bool
+
+    @staticmethod
+    def from_function(f: Callable, skip: int) -> ArgBinder:
+        sig = inspect.signature(f, eval_str=False)
+        named_casts = {
+            n: cast_or_none(cast)
+            for n, cast in get_casts(f).items()
+            if sig.parameters[n].kind is not inspect.Parameter.VAR_KEYWORD
+        }
+        positional = [
+            p
+            for p in sig.parameters.values()
+            if p.name != "vm"
+            and p.kind
+            in (
+                inspect.Parameter.POSITIONAL_ONLY,
+                inspect.Parameter.POSITIONAL_OR_KEYWORD,
+            )
+        ]
+        varargs = next(
+            (
+                p.name
+                for p in sig.parameters.values()
+                if p.kind is inspect.Parameter.VAR_POSITIONAL
+            ),
+            None,
+        )
+        return ArgBinder(
+            name=f.__name__,
+            signature=sig,
+            skip=skip,
+            casts=[named_casts.get(p.name) for p in positional[skip:]],
+            nrequired=sum(p.default is inspect.Parameter.empty for p in positional),
+            varargs=varargs is not None,
+            varargs_cast=named_casts.get(varargs) if varargs is not None else None,
+            named_casts=named_casts,
+            takes_vm="vm" in sig.parameters,
+        )
+
+    # returns `(args, kwargs)` such that `f(*args, **kwargs)` makes the call
+    def bind(
+        self,
+        vm: VirtualMachine,
+        args: list[PyObjectRef],
+        kwargs: dict[str, PyObjectRef],
+    ) -> tuple[list[Any], dict[str, Any]]:
+        nargs = len(args)
+        skip = self.skip
+        casts = self.casts
+        if (
+            not kwargs
+            and nargs >= self.nrequired
+            and (self.varargs or nargs <= skip + len(casts))
+        ):
+            bound = args[:skip]
+            bound.extend(
+                a if c is None else c(vm, a) for c, a in zip(casts, args[skip:])
+            )
+            if self.varargs and nargs > skip + len(casts):
+                c = self.varargs_cast
+                rest = args[skip + len(casts) :]
+                bound.extend(rest if c is None else (c(vm, a) for a in rest))
+            return bound, {"vm": vm} if self.takes_vm else {}
+        return self.bind_generic(vm, args, kwargs)
+
+    def bind_generic(
+        self,
+        vm: VirtualMachine,
+        args: list[PyObjectRef],
+        kwargs: dict[str, PyObjectRef],
+    ) -> tuple[list[Any], dict[str, Any]]:
+        if "vm" in kwargs:
+            vm.new_type_error(f"{self.name}() got an unexpected keyword argument 'vm'")
+        try:
+            if self.takes_vm:
+                bs = self.signature.bind(*args, **kwargs, vm=vm)
+            else:
+                bs = self.signature.bind(*args, **kwargs)
+        except TypeError as e:
+            vm.new_type_error(f"{self.name}() {e}")
+        receivers = list(self.signature.parameters)[: self.skip]
+        for name, value in bs.arguments.items():
+            if name == "vm" or name in receivers:
+                continue
+            kind = self.signature.parameters[name].kind
+            if kind is inspect.Parameter.VAR_POSITIONAL:
+                if (c := self.varargs_cast) is not None:
+                    bs.arguments[name] = tuple(c(vm, a) for a in value)
+            elif kind is not inspect.Parameter.VAR_KEYWORD:
+                if (c := self.named_casts.get(name)) is not None:
+                    bs.arguments[name] = c(vm, value)
+        return list(bs.args), bs.kwargs
@@ -36,6 +36,7 @@ from bytecode.instruction import (
 from compiler.ir import MAX_LABEL, Block, BlockIdx, CodeInfo, InstructionInfo
 from compiler.symboltable import (
     Location,
+    Symbol,
     SymbolScope,
     SymbolTable,
     make_symbol_table,
@@ -426,7 +427,11 @@ class Compiler:
         name = self.mangle(name)
         self.check_forbidden_name(name, usage)
         symbol_table = self.symbol_table_stack[-1]
-        symbol = symbol_table.lookup(name)
+        symbol: Optional[Symbol]
+        if symbol_table.inlined:
+            name, symbol = self.inlined_symbol(name)
+        else:
+            symbol = symbol_table.lookup(name)
         # # TODO: rm
         # if symbol is None:
         #     print([st.lookup(name) for st in self.symbol_table_stack])
@@ -508,6 +513,24 @@ class Compiler:
             assert False, op_type
         self.emit(op(idx))
 
+    # resolves a name used inside an inlined comprehension: the comprehension's own
+    # variables get a fast local of the enclosing code that can't clash with a real
+    # name, and the rest are looked up in the enclosing scopes
+    def inlined_symbol(self, name: str) -> tuple[str, Symbol]:
+        depth = sum(table.inlined for table in self.symbol_table_stack)
+        for table in reversed(self.symbol_table_stack):
+            symbol = table.lookup(name)
+            assert symbol is not None
+            if not table.inlined or symbol.scope not in (
+                SymbolScope.LOCAL,
+                SymbolScope.FREE,
+            ):
+                return name, symbol
+            if symbol.scope == SymbolScope.LOCAL:
+                return f"{name}.{depth}", symbol
+            depth -= 1
+        assert False, name
+
     def compile_statement(self, statement: ast.stmt) -> None:
         self.set_source_location(Location.from_ast(statement))
 
@@ -1762,6 +1785,12 @@ class Compiler:
         generators: list[ast.comprehension],
         compile_element: Callable[[Compiler], None],
     ) -> None:
+        if self.symbol_table_stack[-1].sub_tables[0].inlined:
+            assert init_collection is not None
+            return self.compile_inlined_comprehension(
+                init_collection, generators, compile_element
+            )
+
         prev_ctx = self.ctx
 
         self.ctx = CompileContext(
@@ -1839,6 +1868,58 @@ class Compiler:
 
         self.emit(instruction.CallFunctionPositional(1))
 
+    # runs the comprehension in the current frame: the iterators stay on the stack
+    # above the collection, and the loops have no block since `break` and
+    # `continue` can't occur in them
+    def compile_inlined_comprehension(
+        self,
+        init_collection: Instruction,
+        generators: list[ast.comprehension],
+        compile_element: Callable[[Compiler], None],
+    ) -> None:
+        table = self.symbol_table_stack[-1].sub_tables.pop(0)
+
+        self.emit(init_collection)
+        self.compile_expression(generators[0].iter)
+        self.emit(instruction.GetIter())
+
+        self.symbol_table_stack.append(table)
+
+        loop_labels: list[tuple[BlockIdx, BlockIdx]] = []
+        for i, generator in enumerate(generators):
+            if generator.is_async:
+                raise NotImplementedError("async for comprehensions")
+
+            loop_block = self.new_block()
+            after_block = self.new_block()
+
+            if i > 0:
+                self.compile_expression(generator.iter)
+                self.emit(instruction.GetIter())
+            loop_labels.append((loop_block, after_block))
+
+            self.switch_to_block(loop_block)
+            self.emit(instruction.ForIter(after_block))
+
+            self.compile_store(generator.target)
+
+            for if_condition in generator.ifs:
+                self.compile_jump_if(if_condition, False, loop_block)
+
+        compile_element(self)
+
+        for loop_block, after_block in reversed(loop_labels):
+            self.emit(instruction.Jump(loop_block))
+            self.switch_to_block(after_block)
+
+        # the iteration variables are unbound again once the comprehension is done
+        for name, symbol in table.symbols.items():
+            if symbol.is_iter:
+                self.compile_name(name, NameUsage.DELETE)
+
+        self.symbol_table_stack.pop()
+        assert not table.sub_tables
+
     def compile_future_features(self, features: list[ast.alias]) -> None:
         if self.done_with_future_stmts:
             self.error(CompileErrorType.INVALID_FUTURE_PLACEMENT, ())
@@ -9,8 +9,10 @@ from bytecode.bytecode import (
     CodeFlags,
     CodeObject,
     ConstantData,
+    ExceptionHandler,
+    ExceptionTableEntry,
 )
-from bytecode.instruction import Instruction, LabelArgMixin
+from bytecode.instruction import Instruction, LabelArgMixin, SetupBlockMixin
 from indexset import IndexSet
 
 from compiler.symboltable import Location
@@ -48,19 +50,18 @@ class CodeInfo:
     cellvar_cache: IndexSet[str]
     freevar_cache: IndexSet[str]
 
-    def max_stacksize(self) -> int:
-        return 2**32  # FIXME
+    def stackdepth(self) -> tuple[int, list[int]]:
+        # the maximum stack depth, and the depth at the start of each block
         maxdepth = 0
         stack: list[instruction.Label] = []
         startdepths = [MAX_LABEL.value] * len(self.blocks)
         startdepths[0] = 0
         stack.append(instruction.Label(0))
-        # debug = False
 
         while stack:
-            block = stack.pop()
-            depth = startdepths[block.value]
-            block = self.blocks[block.value]
+            label = stack.pop()
+            depth = startdepths[label.value]
+            block = self.blocks[label.value]
             for i in block.instructions:
                 instr = i.instr
                 effect = instr.stack_effect(False)
@@ -68,10 +69,12 @@ class CodeInfo:
                 if new_depth > maxdepth:
                     maxdepth = new_depth
 
-                jump_label = instr.label_arg()
-                if jump_label is not None and not isinstance(
-                    instr, instruction.Continue
+                # `Continue` unwinds to its loop block, which restores the stack
+                # level that was recorded by `SetupLoop`
+                if not isinstance(instr, instruction.Continue) and isinstance(
+                    instr, LabelArgMixin
                 ):
+                    jump_label = instr.get_label()
                     effect = instr.stack_effect(True)
                     target_depth = add_ui(depth, effect)
                     if target_depth > maxdepth:
@@ -81,9 +84,62 @@ class CodeInfo:
                 if instr.unconditional_branch():
                     break
             else:
-                stackdepth_push(stack, startdepths, block.next, depth)
+                if block.next != MAX_LABEL:
+                    stackdepth_push(stack, startdepths, block.next, depth)
+
+        return maxdepth, startdepths
+
+    def block_handlers(
+        self, startdepths: list[int]
+    ) -> list[list[tuple[ExceptionHandler, ...]]]:
+        # the blocks set up by `SetupBlockMixin` instructions around each
+        # instruction, targets are still block indices
+        entries: list[Optional[tuple[ExceptionHandler, ...]]] = [None] * len(
+            self.blocks
+        )
+        entries[0] = ()
+        todo = [instruction.Label(0)]
+        result: list[list[tuple[ExceptionHandler, ...]]] = [
+            [()] * len(block.instructions) for block in self.blocks
+        ]
+
+        def visit(label: BlockIdx, handlers: tuple[ExceptionHandler, ...]) -> None:
+            if entries[label.value] is None:
+                entries[label.value] = handlers
+                todo.append(label)
+
+        while todo:
+            label = todo.pop()
+            handlers = entries[label.value]
+            assert handlers is not None
+            depth = startdepths[label.value]
+            block = self.blocks[label.value]
+            for i, info in enumerate(block.instructions):
+                instr = info.instr
+                result[label.value][i] = handlers
+                if isinstance(instr, SetupBlockMixin):
+                    # the handler runs outside of its own block
+                    visit(instr.target, handlers)
+                    handlers = (
+                        *handlers,
+                        ExceptionHandler(
+                            instr.kind, instr.target, depth + instr.level_offset
+                        ),
+                    )
+                elif isinstance(instr, instruction.PopBlock):
+                    handlers = handlers[:-1]
+                elif not isinstance(instr, instruction.Continue) and isinstance(
+                    instr, LabelArgMixin
+                ):
+                    visit(instr.get_label(), handlers)
+                depth = add_ui(depth, instr.stack_effect(False))
+                if instr.unconditional_branch():
+                    break
+            else:
+                if block.next != MAX_LABEL:
+                    visit(block.next, handlers)
 
-        return maxdepth
+        return result
 
     def cell2arg(self) -> Optional[list[int]]:
         if not self.cellvar_cache:
@@ -121,24 +177,52 @@ class CodeInfo:
                 del block.instructions[last_instr + 1 :]
 
     def finalize_code(self, optimize: int) -> CodeObject[ConstantData, str]:
-        max_stacksize = self.max_stacksize()
+        max_stacksize, startdepths = self.stackdepth()
         cell2arg = self.cell2arg()
         if optimize > 0:
             self.dce()
+        block_handlers = self.block_handlers(startdepths)
 
         num_instructions = 0
         block_to_offset = [instruction.Label(0) for _ in range(len(self.blocks))]
 
         for idx, block in iter_blocks(self.blocks):
             block_to_offset[idx.value] = instruction.Label(num_instructions)
-            num_instructions += len(block.instructions)
+            num_instructions += sum(
+                not info.instr.is_pseudo() for info in block.instructions
+            )
 
-        instructions = []
+        instructions: list[instruction.Instruction] = []
         locations = []
+        exception_table: list[ExceptionTableEntry] = []
+        resolved: dict[ExceptionHandler, ExceptionHandler] = {}
 
-        for _, block in iter_blocks(self.blocks):
-            for info in block.instructions:
+        for idx, block in iter_blocks(self.blocks):
+            for info, handlers in zip(block.instructions, block_handlers[idx.value]):
                 instr = info.instr
+                if instr.is_pseudo():
+                    continue
+                if handlers:
+                    handlers = tuple(
+                        resolved.setdefault(
+                            h,
+                            dataclasses.replace(
+                                h, target=block_to_offset[h.target.value]
+                            ),
+                        )
+                        for h in handlers
+                    )
+                    offset = len(instructions)
+                    if (
+                        exception_table
+                        and exception_table[-1].end == offset
+                        and exception_table[-1].handlers == handlers
+                    ):
+                        exception_table[-1].end += 1
+                    else:
+                        exception_table.append(
+                            ExceptionTableEntry(offset, offset + 1, handlers)
+                        )
                 if isinstance(instr, LabelArgMixin):
                     instr.set_label(block_to_offset[instr.get_label().value])
                     # FIXME!
@@ -147,6 +231,8 @@ class CodeInfo:
                 instructions.append(instr)
                 locations.append(info.location)
 
+        fuse_superinstructions(instructions)
+
         return CodeObject(
             flags=self.flags,
             posonlyarg_count=self.posonlyarg_count,
@@ -156,6 +242,7 @@ class CodeInfo:
             first_line_number=self.first_line_number,
             obj_name=self.obj_name,
             max_stacksize=max_stacksize,
+            exception_table=exception_table,
             instructions=instructions,
             locations=locations,
             constants=list(self.constants),
@@ -179,6 +266,18 @@ def iter_blocks(blocks: list[Block]) -> Iterable[tuple[BlockIdx, Block]]:
         r = get_idx(r[1].next)
 
 
+def fuse_superinstructions(instructions: list[Instruction]) -> None:
+    i = 0
+    while i < len(instructions) - 1:
+        fused = instruction.superinstruction(instructions[i], instructions[i + 1])
+        if fused is not None:
+            instructions[i] = fused
+            # the second instruction is left as it is
+            i += 2
+        else:
+            i += 1
+
+
 def stackdepth_push(
     stack: list[instruction.Label],
     startdepths: list[int],
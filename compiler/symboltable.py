@@ -97,16 +97,45 @@ class SymbolTable:
     is_nested: bool
     symbols: dict[str, Symbol] = field(default_factory=dict)
     sub_tables: list[SymbolTable] = field(default_factory=list)
+    # a comprehension compiled into the code of its parent scope; see `mark_inlined`
+    inlined: bool = False
 
     def lookup(self, name: str) -> Optional[Symbol]:
         return self.symbols.get(name)
 
 
 def analyze_symbol_table(symbol_table: SymbolTable) -> None:
+    mark_inlined(symbol_table)
     analyzer = SymbolTableAnalyzer([])
     analyzer.analyze_symbol_table(symbol_table)
 
 
+# list, set and dict comprehensions directly inside a function (or inside another
+# comprehension) are inlined, as in CPython 3.12, unless they contain a scope that
+# could capture their variables or an assignment expression that binds in the
+# parent. they are still analyzed as their own scope, so their iteration variables
+# stay isolated; the compiler maps them to hidden fast locals of the parent
+def can_inline(table: SymbolTable) -> bool:
+    return (
+        table.type == SymbolTableType.COMPREHENSION
+        and table.name != "genexpr"
+        and not any(
+            s.is_assign_namedexpr_in_comprehension for s in table.symbols.values()
+        )
+        and all(can_inline(sub_table) for sub_table in table.sub_tables)
+    )
+
+
+def mark_inlined(table: SymbolTable) -> None:
+    for sub_table in table.sub_tables:
+        if table.type in (
+            SymbolTableType.FUNCTION,
+            SymbolTableType.COMPREHENSION,
+        ) and can_inline(sub_table):
+            sub_table.inlined = True
+        mark_inlined(sub_table)
+
+
 SymbolMap = Dict[str, Symbol]
 
 
@@ -218,6 +247,10 @@ class SymbolTableAnalyzer:
         self, sub_tables: list[SymbolTable], name: str, st_type: SymbolTableType
     ) -> Optional[SymbolScope]:
         for st in sub_tables:
+            # the free variables of an inlined comprehension are read from the
+            # parent's frame, so they don't need a cell
+            if st.inlined:
+                continue
             if (sym := st.lookup(name)) is not None:
                 if sym.scope == SymbolScope.FREE or sym.is_free_class:
                     if not (st_type == SymbolTableType.CLASS and name != "__class__"):
@@ -521,13 +554,21 @@ class SymbolTableBuilder:
         # elif isinstance(expression, ast.Index):
         #     expression
         #     self.scan_expression(expression.value, context)
-        elif isinstance(expression, (ast.GeneratorExp, ast.ListComp, ast.SetComp)):
+        elif isinstance(expression, ast.GeneratorExp):
             self.scan_comprehension(
                 "genexpr", expression.elt, None, expression.generators, location
             )
+        elif isinstance(expression, ast.ListComp):
+            self.scan_comprehension(
+                "listcomp", expression.elt, None, expression.generators, location
+            )
+        elif isinstance(expression, ast.SetComp):
+            self.scan_comprehension(
+                "setcomp", expression.elt, None, expression.generators, location
+            )
         elif isinstance(expression, ast.DictComp):
             self.scan_comprehension(
-                "genexpr",
+                "dictcomp",
                 expression.key,
                 expression.value,
                 expression.generators,
@@ -619,9 +660,8 @@ class SymbolTableBuilder:
     ) -> None:
         self.enter_scope(scope_name, SymbolTableType.COMPREHENSION, location.row())
         self.register_name(".0", SymbolUsage.PARAMETER, location)
-        self.scan_expression(elt1, ExpressionContext.LOAD)
-        if elt2 is not None:
-            self.scan_expression(elt2, ExpressionContext.LOAD)
+        # in the order the compiler visits them, which takes the nested scopes from
+        # `sub_tables` one by one
         is_first_generator = True
         for generator in generators:
             self.scan_expression(generator.target, ExpressionContext.ITER)
@@ -633,6 +673,9 @@ class SymbolTableBuilder:
                 )
             for if_expr in generator.ifs:
                 self.scan_expression(if_expr, ExpressionContext.LOAD)
+        self.scan_expression(elt1, ExpressionContext.LOAD)
+        if elt2 is not None:
+            self.scan_expression(elt2, ExpressionContext.LOAD)
         self.leave_scope()
         assert generators
         self.scan_expression(generators[0].iter, ExpressionContext.ITER_DEFINITION_EXP)
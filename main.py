@@ -1,3 +1,4 @@
+import sys
 from pathlib import Path
 from common.error import PyImplBase, PyImplError, PyImplException
 from compiler.compile import CompileError
@@ -18,7 +19,7 @@ def repl(vm: VirtualMachine) -> None:
         try:
             res = vm.run_code_object(code_obj, scope)
         except PyImplBase as e:
-            print_exception(e)
+            print_exception(vm, e)
         except BaseException:
             raise
         else:
@@ -27,9 +28,9 @@ def repl(vm: VirtualMachine) -> None:
                 print(f"last: {res.class_()._.name()} = {res.repr(vm)._.as_str()}")
 
 
-def print_exception(exc: PyImplBase) -> None:
+def print_exception(vm: VirtualMachine, exc: PyImplBase) -> None:
     if isinstance(exc, PyImplException):
-        tr = exc.exception._.traceback
+        tr = exc.exception._.get_traceback(vm)
         if tr is not None:
             print("TRACEBACK: line =", tr._.lineno)
             tr = tr._.next
@@ -41,13 +42,14 @@ def print_exception(exc: PyImplBase) -> None:
 
 def do(vm: VirtualMachine) -> None:
     scope = vm.new_scope_with_builtins()
-    with open("prog.py") as f:
+    path = sys.argv[1] if len(sys.argv) > 1 else "prog.py"
+    with open(path) as f:
         prog = f.read()
     try:
         code_obj = vm.compile(
             prog,
             Mode.Exec,
-            "prog.py",
+            path,
         )
     except CompileError as e:
         vm.new_syntax_error(e)
@@ -67,7 +69,7 @@ settings.path_list.append(str(Path.cwd().resolve()))
 interpreter = Interpreter.new_with_init(settings, lambda vm: InitParameter.External)
 # Interpreter.default().enter(do)
 try:
-    interpreter.enter(do)
+    interpreter.run(do)
 except PyImplException as e:
     print(e.exception.type._.name())
     print(e.exception._.args._.fast_getitem(0).debug_repr())
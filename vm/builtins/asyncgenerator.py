@@ -107,7 +107,7 @@ class PyAsyncGen(po.PyClassImpl):
 
     @pyproperty()
     def get_ag_await(self, *, vm: VirtualMachine) -> Optional[PyObjectRef]:
-        return self.inner.frame._.yield_from_target()
+        return self.inner.frame._.yield_from_target(vm)
 
     @pyproperty()
     def get_ag_frame(self, *, vm: VirtualMachine) -> PyObjectRef:
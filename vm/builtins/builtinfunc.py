@@ -14,8 +14,9 @@ if TYPE_CHECKING:
     from vm.vm import VirtualMachine
     from vm.function_ import PyNativeFunc
 
-from common.deco import pymethod, pyproperty
+from common.deco import pymethod, pyproperty, pyslot
 import vm.builtins.function as pyfunction
+import vm.function_ as fn
 import vm.pyobject as po
 import vm.pyobjectrc as prc
 import vm.builtins.pystr as pystr
@@ -127,6 +128,21 @@ class PyBuiltinFunction(po.PyClassImpl, slot.CallableMixin):
     ) -> PyObjectRef:
         return zelf._.value.func(vm, args)
 
+    # native functions take the generic form
+    @pyslot
+    @staticmethod
+    def slot_vectorcall(
+        zelf: PyRef[PyBuiltinFunction],
+        args: list[PyObjectRef],
+        start: int,
+        nargs: int,
+        kwnames: Optional[tuple[str, ...]],
+        vm: VirtualMachine,
+    ) -> PyObjectRef:
+        return zelf._.value.func(
+            vm, fn.FuncArgs.from_vector(args, start, nargs, kwnames)
+        )
+
 
 @po.tp_flags(method_descr=True)
 @po.pyimpl(get_descriptor=True, callable=True, constructor=False)
@@ -196,6 +212,20 @@ class PyBuiltinMethod(po.PyClassImpl, slot.CallableMixin, slot.GetDescriptorMixi
     ) -> PyObjectRef:
         return zelf._.value.func(vm, args)
 
+    @pyslot
+    @staticmethod
+    def slot_vectorcall(
+        zelf: PyRef[PyBuiltinMethod],
+        args: list[PyObjectRef],
+        start: int,
+        nargs: int,
+        kwnames: Optional[tuple[str, ...]],
+        vm: VirtualMachine,
+    ) -> PyObjectRef:
+        return zelf._.value.func(
+            vm, fn.FuncArgs.from_vector(args, start, nargs, kwnames)
+        )
+
 
 def init(context: PyContext) -> None:
     PyBuiltinFunction.extend_class(
@@ -60,7 +60,9 @@ class PyClassMethod(po.PyClassImpl, slot.GetDescriptorMixin, slot.ConstructorMix
     @pyproperty()
     def get_isabstractmethod(self, vm: VirtualMachine) -> PyObjectRef:
         try:
-            r = vm.get_attribute_opt(self.callable, vm.mk_str("__isabstractmethod__"))
+            r = vm.get_attribute_opt(
+                self.callable, vm.ctx.intern_str("__isabstractmethod__")
+            )
         except PyImplBase as _:
             pass
         else:
@@ -70,7 +72,7 @@ class PyClassMethod(po.PyClassImpl, slot.GetDescriptorMixin, slot.ConstructorMix
 
     @pyproperty()
     def set_isabstractmethod(self, value: PyObjectRef, vm: VirtualMachine) -> None:
-        self.callable.set_attr(vm.mk_str("__isabstractmethod__"), value, vm)
+        self.callable.set_attr(vm.ctx.intern_str("__isabstractmethod__"), value, vm)
 
 
 def init(context: PyContext) -> None:
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import TYPE_CHECKING, Any, ClassVar, TypeAlias
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, ClassVar, Optional, TypeAlias
 
 if TYPE_CHECKING:
 
@@ -9,6 +9,9 @@ if TYPE_CHECKING:
     from vm.pyobject import PyContext
     from vm.pyobjectrc import PyRef
     from bytecode.bytecode import ConstantData, CodeObject
+    from bytecode.instruction import Op
+    from vm.jit import JitCode
+    from vm.frame import Frame
     from vm.builtins.pytype import PyTypeRef
     from vm.vm import VirtualMachine
 
@@ -41,18 +44,74 @@ class PyObjBag:
         return PyConstant(constant.to_pyobj(self.value))
 
     def make_name(self, name: str) -> pystr.PyStrRef:
-        # TODO: `return self.value.intern_string(name)`
-        return self.value.ctx.new_str(name)
+        return self.value.ctx.intern_str(name)
 
 
 # TODO: impl ConstantBag for PyObjBag
 
 
+# how a call's arguments map onto the fast locals of a code object; depends only on
+# the code, so it is computed once. the defaults live on the function, since they
+# can be reassigned
+@dataclass
+class ArgLayout:
+    name: str
+    total_args: int
+    # keyword name -> fast local, for every parameter that can be passed by keyword
+    kwarg_index: dict[str, int]
+    posonly_names: frozenset[str]
+    # names of the first `total_args` fast locals, for error messages
+    arg_names: list[str]
+    vararg_index: Optional[int]
+    varkw_index: Optional[int]
+    # no `*args`, `**kwargs` or keyword-only parameters: a call with exactly
+    # `arg_count` positionals and no keywords copies them straight into the locals
+    plain: bool
+
+    @staticmethod
+    def new(code: CodeObject[PyConstant, pystr.PyStrRef]) -> ArgLayout:
+        total_args = code.arg_count + code.kwonlyarg_count
+        arg_names = [name._.as_str() for name in code.varnames[:total_args]]
+        has_varargs = bytecode.CodeFlags.HAS_VARARGS in code.flags
+        has_varkw = bytecode.CodeFlags.HAS_VARKEYWORDS in code.flags
+        return ArgLayout(
+            name=code.obj_name._.as_str(),
+            total_args=total_args,
+            kwarg_index={
+                arg_names[i]: i for i in range(code.posonlyarg_count, total_args)
+            },
+            posonly_names=frozenset(arg_names[: code.posonlyarg_count]),
+            arg_names=arg_names,
+            vararg_index=total_args if has_varargs else None,
+            varkw_index=total_args + has_varargs if has_varkw else None,
+            plain=code.kwonlyarg_count == 0 and not has_varargs and not has_varkw,
+        )
+
+
 @po.pyimpl(py_ref=True)
 @po.pyclass("code")
 @dataclass
 class PyCode(po.PyClassImpl):
     code: CodeObject[PyConstant, pystr.PyStrRef]
+    # `code.instructions` compiled for the threaded engine, built on first use
+    ops: Optional[list[Op]] = field(default=None, compare=False, repr=False)
+    # see `vm.jit`
+    calls: int = field(default=0, compare=False, repr=False)
+    jit: Optional[JitCode] = field(default=None, compare=False, repr=False)
+    jit_failed: bool = field(default=False, compare=False, repr=False)
+    # returned frames of this code, reused by `Frame.new`; see `Frame.recycle`
+    free_frames: list[Frame] = field(default_factory=list, compare=False, repr=False)
+    layout: Optional[ArgLayout] = field(default=None, compare=False, repr=False)
+
+    def threaded_code(self) -> list[Op]:
+        if self.ops is None:
+            self.ops = [instr.threaded(self.code) for instr in self.code.instructions]
+        return self.ops
+
+    def arg_layout(self) -> ArgLayout:
+        if self.layout is None:
+            self.layout = ArgLayout.new(self.code)
+        return self.layout
 
     @classmethod
     def class_(cls, vm: VirtualMachine) -> PyTypeRef:
@@ -45,6 +45,7 @@ class PyDict(
     MAPPING_METHODS: ClassVar = mapping.PyMappingMethods(
         length=lambda m, vm: PyDict.mapping_downcast(m)._.len(),
         subscript=lambda m, k, vm: PyDict.mapping_downcast(m)._.get_item(k, vm),
+        subscript_opt=lambda m, k, vm: PyDict.mapping_downcast(m)._.get_item_opt(k, vm),
         ass_subscript=lambda m, k, v, vm: PyDict.ass_subscript(m, k, v, vm),
     )
 
@@ -83,6 +84,9 @@ class PyDict(
             d.insert(vm, vm.ctx.new_str(key), value)
         return PyDict(d)
 
+    def version(self) -> int:
+        return self.entries.version
+
     def get_keys(self) -> Iterator[PyObjectRef]:
         return iter(self.entries.keys())
 
@@ -409,7 +413,7 @@ class DictViewMixin(slot.IterableMixin):
         raise NotImplementedError
 
 
-class DictIterNextMixin(slot.IterNextMixin, slot.IterNextIterableMixin):
+class DictIterNextMixin(slot.IterNextFastMixin, slot.IterNextIterableMixin):
     iterator: Iterator
 
     @classmethod
@@ -417,16 +421,16 @@ class DictIterNextMixin(slot.IterNextMixin, slot.IterNextIterableMixin):
         return nv
 
     @classmethod
-    def next(cls: Type[TV], zelf: PyRef[TV], vm: VirtualMachine) -> viter.PyIterReturn:
+    def next_fast(cls: Type[TV], zelf: PyRef[TV], vm: VirtualMachine) -> viter.IterNext:
         try:
             item = next(zelf._.iterator, None)
         except RuntimeError as e:
             # TODO: find a better way to do this
             vm.new_runtime_error("dictionary changed size during iteration")
         if item is None:
-            return viter.PyIterReturnStopIteration(None)
+            return viter.ITER_EXHAUSTED
         else:
-            return viter.PyIterReturnReturn(cls.next_to_pyobj(item, vm))
+            return cls.next_to_pyobj(item, vm)
 
 
 class ViewSetOps(DictViewMixin, slot.ComparableMixin):
@@ -1,7 +1,6 @@
 from __future__ import annotations
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, Optional
-from common.error import unreachable
 from vm.builtins.iter import IterStatusActive
 
 if TYPE_CHECKING:
@@ -27,7 +26,7 @@ from common.deco import pyclassmethod, pymethod
 class PyEnumerate(
     po.PyClassImpl,
     slot.ConstructorMixin,
-    slot.IterNextMixin,
+    slot.IterNextFastMixin,
     slot.IterNextIterableMixin,
 ):
     counter: int
@@ -69,21 +68,15 @@ class PyEnumerate(
         return PyEnumerate(counter=counter, iterator=args["iterator"]).into_ref(vm)
 
     @classmethod
-    def next(
+    def next_fast(
         cls, zelf: PyRef[PyEnumerate], vm: VirtualMachine
-    ) -> protocol_iter.PyIterReturn:
-        v = zelf._.iterator.next(vm)
-        if isinstance(v, protocol_iter.PyIterReturnStopIteration):
-            return v
-        elif isinstance(v, protocol_iter.PyIterReturnReturn):
-            next_obj = v.value
-        else:
-            unreachable()
+    ) -> protocol_iter.IterNext:
+        next_obj = zelf._.iterator.next_fast(vm)
+        if next_obj is protocol_iter.ITER_EXHAUSTED:
+            return next_obj
         position = zelf._.counter
         zelf._.counter += 1
-        return protocol_iter.PyIterReturnReturn(
-            vm.ctx.new_tuple([vm.ctx.new_int(position), next_obj])
-        )
+        return vm.ctx.new_tuple([vm.ctx.new_int(position), next_obj])
 
 
 def __py_new_args(iterator: PyIter, start: Optional[PyIntRef]):
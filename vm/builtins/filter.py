@@ -22,7 +22,7 @@ import vm.protocol.iter as protocol_iter
 @dataclass
 class PyFilter(
     po.PyClassImpl,
-    slot.IterNextMixin,
+    slot.IterNextFastMixin,
     slot.IterNextIterableMixin,
     slot.ConstructorMixin,
 ):
@@ -43,34 +43,27 @@ class PyFilter(
         ).into_pyresult_with_type(vm, class_)
 
     @classmethod
-    def next(
+    def next_fast(
         cls, zelf: PyRef[PyFilter], vm: VirtualMachine
-    ) -> protocol_iter.PyIterReturn:
+    ) -> protocol_iter.IterNext:
         predicate = zelf._.predicate
         while 1:
-            v = zelf._.iterator.next(vm)
-            if isinstance(v, protocol_iter.PyIterReturnReturn):
-                next_obj = v.value
-            elif isinstance(v, protocol_iter.PyIterReturnStopIteration):
-                return v
-            else:
-                unreachable()
+            next_obj = zelf._.iterator.next_fast(vm)
+            if next_obj is protocol_iter.ITER_EXHAUSTED:
+                return next_obj
             predicate_value: PyObjectRef
             if vm.is_none(predicate):
                 predicate_value = next_obj
             else:
-                r = protocol_iter.PyIterReturn.from_pyresult(
+                r = protocol_iter.next_fast_from_pyresult(
                     lambda: vm.invoke(predicate, fn.FuncArgs([next_obj])), vm
                 )
-                if isinstance(r, protocol_iter.PyIterReturnReturn):
-                    predicate_value = r.value
-                elif isinstance(r, protocol_iter.PyIterReturnStopIteration):
+                if r is protocol_iter.ITER_EXHAUSTED:
                     return r
-                else:
-                    unreachable()
+                predicate_value = r
 
             if predicate_value.try_to_bool(vm):
-                return protocol_iter.PyIterReturnReturn(next_obj)
+                return next_obj
         unreachable()
 
 
@@ -19,13 +19,14 @@ import vm.pyobjectrc as prc
 import vm.types.slot as slot
 import vm.builtins.pystr as pystr
 import vm.frame as vframe
+import vm.function_ as fn
 import vm.function.arguments as arguments
 import vm.scope as vscope
 import vm.builtins.asyncgenerator as pyasyncgenerator
 import vm.builtins.generator as pygenerator
 import vm.builtins.coroutine as pycoroutine
 import bytecode.bytecode as bytecode
-from common.deco import pymethod, pyproperty
+from common.deco import pymethod, pyproperty, pyslot
 from common.error import PE, Ok, PyImplBase, Result
 
 
@@ -118,102 +119,72 @@ class PyFunction(po.PyClassImpl, slot.CallableMixin, slot.GetDescriptorMixin):
         self, frame: vframe.Frame, func_args: FuncArgs, vm: VirtualMachine
     ) -> None:
         code: bytecode.CodeObject[PyConstant, PyStrRef] = self.code._.code
-        nargs = len(func_args.args)
+        layout = self.code._.arg_layout()
+        args = func_args.args
+        nargs = len(args)
         nexpected_args = code.arg_count
-        total_args = code.arg_count + code.kwonlyarg_count
 
         fastlocals = frame.fastlocals
 
-        args_iter = list(func_args.args)
+        if nargs == nexpected_args and not func_args.kwargs and layout.plain:
+            fastlocals[:nargs] = args
+            if code.cell2arg is not None:
+                self.fill_cells_from_args(frame)
+            return
 
         nargs_taken = min(nargs, nexpected_args)
+        fastlocals[:nargs_taken] = args[:nargs_taken]
 
-        for i, arg in enumerate(args_iter[:nargs_taken]):
-            fastlocals[i] = arg
-
-        vararg_offset = total_args
-
-        if bytecode.CodeFlags.HAS_VARARGS in code.flags:
-            vararg_value = vm.ctx.new_tuple(args_iter[nargs:])
-            fastlocals[vararg_offset] = vararg_value
-            vararg_offset += 1
-        else:
-            if nargs > nexpected_args:
-                vm.new_type_error(
-                    "{}() takes {} positional arguments but {} were given".format(
-                        code.obj_name, nexpected_args, nargs
-                    )
-                )
+        if layout.vararg_index is not None:
+            fastlocals[layout.vararg_index] = vm.ctx.new_tuple(args[nargs_taken:])
+        elif nargs > nexpected_args:
+            vm.new_type_error(
+                f"{layout.name}() takes {nexpected_args} positional arguments "
+                f"but {nargs} were given"
+            )
 
-        if bytecode.CodeFlags.HAS_VARKEYWORDS in code.flags:
-            d = vm.ctx.new_dict()
-            fastlocals[vararg_offset] = d
-            kwargs = d
+        if layout.varkw_index is not None:
+            kwargs = vm.ctx.new_dict()
+            fastlocals[layout.varkw_index] = kwargs
         else:
             kwargs = None
 
-        def argpos(r: range, name: str) -> Optional[int]:
-            return next(
-                (
-                    p
-                    for p, s in enumerate(code.varnames[r.start : r.stop], r.start)
-                    if s._.as_str() == name
-                    # if s == name
-                ),
-                None,
-            )
-
-        posonly_passed_as_kwarg = []
-        for name, value in func_args.kwargs.items():
-            if (
-                pos := argpos(range(code.posonlyarg_count, total_args), name)
-            ) is not None:
-                slot = fastlocals[pos]
-                if slot is not None:
-                    vm.new_type_error(f"Got multiple values for argument '{name}'")
-                fastlocals[pos] = value
-            elif kwargs is not None:
-                kwargs._.set_item(vm.ctx.new_str(name), value, vm)
-            elif argpos(range(0, code.posonlyarg_count), name) is not None:
-                posonly_passed_as_kwarg.append(name)
-            else:
-                vm.new_type_error(f"got an unexpected keyword argument '{name}'")
+        if func_args.kwargs:
+            kwarg_index = layout.kwarg_index
+            posonly_passed_as_kwarg = []
+            for name, value in func_args.kwargs.items():
+                if (pos := kwarg_index.get(name)) is not None:
+                    if fastlocals[pos] is not None:
+                        vm.new_type_error(f"Got multiple values for argument '{name}'")
+                    fastlocals[pos] = value
+                elif kwargs is not None:
+                    kwargs._.set_item(vm.ctx.new_str(name), value, vm)
+                elif name in layout.posonly_names:
+                    posonly_passed_as_kwarg.append(name)
+                else:
+                    vm.new_type_error(f"got an unexpected keyword argument '{name}'")
 
-        if posonly_passed_as_kwarg:
-            vm.new_type_error(
-                "{}() got some positional-only arguments passed as keyword arguments: '{}'".format(
-                    code.obj_name, ",".join(posonly_passed_as_kwarg)
+            if posonly_passed_as_kwarg:
+                vm.new_type_error(
+                    "{}() got some positional-only arguments passed as keyword "
+                    "arguments: '{}'".format(
+                        layout.name, ",".join(posonly_passed_as_kwarg)
+                    )
                 )
-            )
 
-        default_and_kwdefaults = None
-
-        def get_defaults() -> tuple[Optional[PyTupleRef], Optional[PyDictRef]]:
-            nonlocal default_and_kwdefaults
-            if default_and_kwdefaults is not None:
-                return default_and_kwdefaults
-            else:
-                default_and_kwdefaults = self.defaults_and_kwdefaults
-                return default_and_kwdefaults
+        defaults, kwdefaults = self.defaults_and_kwdefaults
 
         if nargs < nexpected_args:
-            if (v := get_defaults()[0]) is not None:
-                defaults = v._.as_slice()
-                ndefs = len(defaults)
-            else:
-                defaults = None
-                ndefs = 0
-
-            nrequired = code.arg_count - ndefs
+            defaults_ = defaults._.as_slice() if defaults is not None else []
+            nrequired = nexpected_args - len(defaults_)
 
             missing = [
-                code.varnames[i]._.as_str()
-                for i, x in ((i, fastlocals[i]) for i in range(nargs, nrequired))
-                if x is None
+                layout.arg_names[i]
+                for i in range(nargs, nrequired)
+                if fastlocals[i] is None
             ]
-            missing_args_len = len(missing)
-
             if missing:
+                missing_args_len = len(missing)
                 if len(missing) > 1:
                     last = missing.pop()
                     if len(missing) == 1:
@@ -226,7 +197,7 @@ class PyFunction(po.PyClassImpl, slot.CallableMixin, slot.GetDescriptorMixin):
 
                 vm.new_type_error(
                     "{}() missing {} required positional argument{}: '{}{}{}'".format(
-                        code.obj_name,
+                        layout.name,
                         missing_args_len,
                         "" if missing_args_len == 1 else "s",
                         "', '".join(missing),
@@ -235,44 +206,69 @@ class PyFunction(po.PyClassImpl, slot.CallableMixin, slot.GetDescriptorMixin):
                     )
                 )
 
-            if defaults is not None:
-                for i in range(
-                    max(0, min(nargs, nexpected_args) - nrequired), len(defaults)
-                ):
-                    if fastlocals[nrequired + i] is None:
-                        fastlocals[nrequired + i] = defaults[i]
-
-        if code.kwonlyarg_count > 0:
-            for slot, kwarg, i in zip(
-                fastlocals[code.arg_count :],
-                code.varnames[code.arg_count :],
-                range(code.kwonlyarg_count),
+            for i in range(max(nargs, nrequired), nexpected_args):
+                if fastlocals[i] is None:
+                    fastlocals[i] = defaults_[i - nrequired]
+
+        for i in range(nexpected_args, layout.total_args):
+            if fastlocals[i] is not None:
+                continue
+            if (
+                kwdefaults is not None
+                and (default := kwdefaults._.get_item_opt(code.varnames[i], vm))
+                is not None
             ):
-                if slot is not None:
-                    continue
-
-                if (defaults := get_defaults()[1]) is not None and (
-                    default := defaults._.get_item_opt(kwarg, vm)
-                ) is not None:
-                    fastlocals[code.arg_count + i] = default
-                else:  # FIXME?
-                    vm.new_type_error(
-                        f"Missing required kw only argument: '{kwarg._.value}'"
-                    )
+                fastlocals[i] = default
+            else:  # FIXME?
+                vm.new_type_error(
+                    f"Missing required kw only argument: '{layout.arg_names[i]}'"
+                )
 
         if code.cell2arg is not None:
-            for cell_idx, arg_idx in enumerate(code.cell2arg):
-                if arg_idx == -1:
-                    continue
-                x = fastlocals[arg_idx]
-                frame.cells_frees[cell_idx]._.set(x)
+            self.fill_cells_from_args(frame)
 
-    def invoke_with_locals(
+    def fill_cells_from_args(self, frame: vframe.Frame) -> None:
+        cell2arg = self.code._.code.cell2arg
+        assert cell2arg is not None
+        for cell_idx, arg_idx in enumerate(cell2arg):
+            if arg_idx == -1:
+                continue
+            frame.cells_frees[cell_idx]._.set(frame.fastlocals[arg_idx])
+
+    def new_frame(
         self,
         func_args: FuncArgs,
         locals: Optional[arguments.ArgMapping],
         vm: VirtualMachine,
-    ) -> PyObjectRef:
+    ) -> vframe.FrameRef:
+        frame = self.prepare_frame(locals, vm)
+        self.fill_locals_from_args(frame._, func_args, vm)
+        return frame
+
+    def new_frame_vector(
+        self,
+        args: list[PyObjectRef],
+        start: int,
+        nargs: int,
+        kwnames: Optional[tuple[str, ...]],
+        vm: VirtualMachine,
+    ) -> vframe.FrameRef:
+        frame = self.prepare_frame(None, vm)
+        pycode = self.code._
+        code = pycode.code
+        if not kwnames and nargs == code.arg_count and pycode.arg_layout().plain:
+            frame._.fastlocals[:nargs] = args[start : start + nargs]
+            if code.cell2arg is not None:
+                self.fill_cells_from_args(frame._)
+        else:
+            self.fill_locals_from_args(
+                frame._, fn.FuncArgs.from_vector(args, start, nargs, kwnames), vm
+            )
+        return frame
+
+    def prepare_frame(
+        self, locals: Optional[arguments.ArgMapping], vm: VirtualMachine
+    ) -> vframe.FrameRef:
         code = self.code._.code
         if bytecode.CodeFlags.NEW_LOCALS in code.flags:
             locals = arguments.ArgMapping.from_dict_exact(vm.ctx.new_dict())
@@ -287,7 +283,7 @@ class PyFunction(po.PyClassImpl, slot.CallableMixin, slot.GetDescriptorMixin):
         dict_ = vm.builtins.dict_()
         assert dict_ is not None  # FIXME?
 
-        frame = vframe.Frame.new(
+        return vframe.Frame.new(
             code=self.code,
             scope=vscope.Scope.new(locals, self.globals),
             builtins=dict_,
@@ -295,8 +291,24 @@ class PyFunction(po.PyClassImpl, slot.CallableMixin, slot.GetDescriptorMixin):
             vm=vm,
         ).into_ref(vm)
 
-        self.fill_locals_from_args(frame._, func_args, vm)
+    # whether calling this function just runs its frame to completion
+    def is_plain(self) -> bool:
+        flags = self.code._.code.flags
+        return not (
+            bytecode.CodeFlags.IS_GENERATOR in flags
+            or bytecode.CodeFlags.IS_COROUTINE in flags
+        )
+
+    def invoke_with_locals(
+        self,
+        func_args: FuncArgs,
+        locals: Optional[arguments.ArgMapping],
+        vm: VirtualMachine,
+    ) -> PyObjectRef:
+        return self.run_new_frame(self.new_frame(func_args, locals, vm), vm)
 
+    def run_new_frame(self, frame: vframe.FrameRef, vm: VirtualMachine) -> PyObjectRef:
+        code = self.code._.code
         is_gen = bytecode.CodeFlags.IS_GENERATOR in code.flags
         is_coro = bytecode.CodeFlags.IS_COROUTINE in code.flags
         if is_gen and not is_coro:
@@ -306,7 +318,9 @@ class PyFunction(po.PyClassImpl, slot.CallableMixin, slot.GetDescriptorMixin):
         elif is_gen and is_coro:
             return pyasyncgenerator.PyAsyncGen.new(frame, self.name).into_ref(vm)
         else:
-            return vm.run_frame_full(frame)
+            result = vm.run_frame_full(frame)
+            frame._.recycle()
+            return result
 
     def invoke(self, func_args: FuncArgs, vm: VirtualMachine) -> PyObjectRef:
         return self.invoke_with_locals(func_args, None, vm)
@@ -358,7 +372,7 @@ class PyFunction(po.PyClassImpl, slot.CallableMixin, slot.GetDescriptorMixin):
     def i__repr__(zelf: PyRef[PyFunction], *, vm: VirtualMachine) -> str:
         try:
             qualname_attr = zelf.as_object().get_attr(
-                vm.ctx.new_str("__qualname__"), vm
+                vm.ctx.intern_str("__qualname__"), vm
             )
         except PyImplBase as _:
             qualname = None
@@ -388,6 +402,20 @@ class PyFunction(po.PyClassImpl, slot.CallableMixin, slot.GetDescriptorMixin):
     ) -> PyObjectRef:
         return zelf._.invoke(args, vm)
 
+    @pyslot
+    @staticmethod
+    def slot_vectorcall(
+        zelf: PyRef[PyFunction],
+        args: list[PyObjectRef],
+        start: int,
+        nargs: int,
+        kwnames: Optional[tuple[str, ...]],
+        vm: VirtualMachine,
+    ) -> PyObjectRef:
+        function = zelf._
+        frame = function.new_frame_vector(args, start, nargs, kwnames, vm)
+        return function.run_new_frame(frame, vm)
+
 
 @po.tp_flags(has_dict=True)
 @po.pyimpl(callable=True, comparable=True, get_attr=True, constructor=True)
@@ -427,6 +455,26 @@ class PyBoundMethod(
         args.prepend_arg(zelf._.object)
         return vm.invoke(zelf._.function, args)
 
+    @pyslot
+    @staticmethod
+    def slot_vectorcall(
+        zelf: PyRef[PyBoundMethod],
+        args: list[PyObjectRef],
+        start: int,
+        nargs: int,
+        kwnames: Optional[tuple[str, ...]],
+        vm: VirtualMachine,
+    ) -> PyObjectRef:
+        function = zelf._.function
+        if function.class_().is_(vm.ctx.types.function_type):
+            args[start - 1] = zelf._.object
+            return PyFunction.slot_vectorcall(
+                function, args, start - 1, nargs + 1, kwnames, vm
+            )
+        func_args = fn.FuncArgs.from_vector(args, start, nargs, kwnames)
+        func_args.prepend_arg(zelf._.object)
+        return vm.invoke(function, func_args)
+
     @classmethod
     def cmp(
         cls,
@@ -468,11 +516,15 @@ class PyBoundMethod(
     @pymethod(True)
     def i__repr__(self, *, vm: VirtualMachine) -> str:
         if (
-            qname := vm.get_attribute_opt(self.function, vm.ctx.new_str("__qualname__"))
+            qname := vm.get_attribute_opt(
+                self.function, vm.ctx.intern_str("__qualname__")
+            )
         ) is not None:
             funcname = qname
         else:
-            funcname = vm.get_attribute_opt(self.function, vm.ctx.new_str("__name__"))
+            funcname = vm.get_attribute_opt(
+                self.function, vm.ctx.intern_str("__name__")
+            )
         if funcname is None:
             name = "?"
         else:
@@ -481,7 +533,7 @@ class PyBoundMethod(
 
     @pyproperty()
     def get___doc__(self, *, vm: VirtualMachine) -> PyObjectRef:
-        return self.function.get_attr(vm.ctx.new_str("__doc__"), vm)
+        return self.function.get_attr(vm.ctx.intern_str("__doc__"), vm)
 
     @pyproperty()
     def get___func__(self, *, vm: VirtualMachine) -> PyObjectRef:
@@ -493,20 +545,22 @@ class PyBoundMethod(
 
     @pyproperty()
     def get___module__(self, *, vm: VirtualMachine) -> Optional[PyObjectRef]:
-        return self.function.get_attr(vm.ctx.new_str("__module__"), vm)
+        return self.function.get_attr(vm.ctx.intern_str("__module__"), vm)
 
     @pyproperty()
     def get___qualname__(self, *, vm: VirtualMachine) -> PyObjectRef:
         if self.function.isinstance(vm.ctx.types.builtin_function_or_method_type):
             if (
-                v := vm.get_attribute_opt(self.object, vm.ctx.new_str("__qualname__"))
+                v := vm.get_attribute_opt(
+                    self.object, vm.ctx.intern_str("__qualname__")
+                )
             ) is not None:
                 obj_name = v.downcast(pystr.PyStr)._.as_str()
             else:
                 obj_name = "?"
             return vm.ctx.new_str(f"{obj_name}.__new__")
         else:
-            return self.function.get_attr(vm.ctx.new_str("__qualname__"), vm)
+            return self.function.get_attr(vm.ctx.intern_str("__qualname__"), vm)
 
 
 def args_bound_method_py_new(object, function, /):
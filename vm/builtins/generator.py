@@ -12,7 +12,7 @@ if TYPE_CHECKING:
     from vm.pyobjectrc import PyRef, PyObjectRef
     from vm.vm import VirtualMachine
     from vm.builtins.code import PyCode
-    from vm.protocol.iter import PyIterReturn
+    from vm.protocol.iter import IterNext, PyIterReturn
 
 import vm.pyobject as po
 import vm.types.slot as slot
@@ -34,7 +34,9 @@ class PyGenerator(po.PyClassImpl, slot.IterNextMixin, slot.IterNextIterableMixin
 
     @staticmethod
     def new(frame: FrameRef, name: PyStrRef) -> PyGenerator:
-        return PyGenerator(Coro.new(frame, name))
+        import vm.coroutine as coro
+
+        return PyGenerator(coro.Coro.new(frame, name))
 
     @pyproperty()
     def get___name__(self, *, vm: VirtualMachine) -> PyStrRef:
@@ -95,6 +97,10 @@ class PyGenerator(po.PyClassImpl, slot.IterNextMixin, slot.IterNextIterableMixin
     def next(cls, zelf: PyRef[PyGenerator], vm: VirtualMachine) -> PyIterReturn:
         return zelf._.inner.send(zelf, vm.ctx.get_none(), vm)
 
+    @classmethod
+    def next_fast(cls, zelf: PyRef[PyGenerator], vm: VirtualMachine) -> IterNext:
+        return zelf._.inner.next_fast(zelf, vm)
+
 
 def init(ctx: PyContext) -> None:
     return PyGenerator.extend_class(ctx, ctx.types.generator_type)
@@ -512,8 +512,8 @@ def try_int(obj: PyObject, vm: VirtualMachine) -> int:
     if (i := obj.payload_if_exact(PyInt, vm)) is not None:
         return i.as_int()
 
-    if (method := vm.get_method(obj, "__int__")) is not None:
-        result = vm.invoke(method, fn.FuncArgs())
+    if (int_ := obj.class_()._.effective_slots.as_number.int) is not None:
+        result = int_(obj, vm)
         if (i := result.payload_(PyInt)) is not None:
             return i.as_int()
         else:
@@ -88,6 +88,18 @@ class PositionIterInternal(Generic[T]):
 
         return self._next(f, inc_pos)
 
+    def next_fast(self, f: Callable[[T, int], viter.IterNext]) -> viter.IterNext:
+        status = self.status
+        if isinstance(status, IterStatusActive):
+            ret = f(status.value, self.position)
+            if ret is viter.ITER_EXHAUSTED:
+                self.status = IterStatusExhausted()
+            else:
+                self.position += 1
+            return ret
+        else:
+            return viter.ITER_EXHAUSTED
+
     def rev_next(self, f: Callable[[T, int], viter.PyIterReturn]) -> viter.PyIterReturn:
         def do(zelf: PositionIterInternal) -> None:
             if zelf.position == 0:
@@ -105,11 +117,11 @@ class PositionIterInternal(Generic[T]):
 
 
 def builtins_iter(vm: VirtualMachine) -> PyObject:
-    return vm.builtins.get_attr(vm.mk_str("iter"), vm)
+    return vm.builtins.get_attr(vm.ctx.intern_str("iter"), vm)
 
 
 def builtins_reversed(vm: VirtualMachine) -> PyObject:
-    return vm.builtins.get_attr(vm.mk_str("reversed"), vm)
+    return vm.builtins.get_attr(vm.ctx.intern_str("reversed"), vm)
 
 
 @po.pyimpl(iter_next=True)
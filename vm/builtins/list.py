@@ -416,7 +416,9 @@ PyListRef: TypeAlias = "PyRef[PyList]"
 @po.pyimpl(constructor=False, iter_next=True)
 @po.pyclass("list_iterator")
 @dataclass
-class PyListIterator(po.PyClassImpl, slot.IterNextIterableMixin, slot.IterNextMixin):
+class PyListIterator(
+    po.PyClassImpl, slot.IterNextIterableMixin, slot.IterNextFastMixin
+):
     internal: pyiter.PositionIterInternal[PyListRef]
 
     @classmethod
@@ -436,14 +438,18 @@ class PyListIterator(po.PyClassImpl, slot.IterNextIterableMixin, slot.IterNextMi
         return self.internal.builtins_iter_reduce(lambda x: x, vm)
 
     @classmethod
-    def next(
+    def next_fast(
         cls, zelf: PyRef[PyListIterator], vm: VirtualMachine
-    ) -> viter.PyIterReturn:
-        return zelf._.internal.next(
-            lambda l, pos: viter.PyIterReturn.from_getitem_result(
-                lambda: l._.get_item_by_index(vm, pos), vm
-            )
-        )
+    ) -> viter.IterNext:
+        return zelf._.internal.next_fast(list_element)
+
+
+def list_element(l: PyListRef, pos: int) -> viter.IterNext:
+    elements = l._.elements
+    if pos < len(elements):
+        return elements[pos]
+    else:
+        return viter.ITER_EXHAUSTED
 
 
 @po.pyimpl(constructor=False, iter_next=True)
@@ -15,8 +15,6 @@ import vm.types.slot as slot
 import vm.protocol.iter as protocol_iter
 import vm.function_ as fn
 
-from common.error import unreachable
-
 
 @po.tp_flags(basetype=True)
 @po.pyimpl(constructor=True, iter_next=True)
@@ -26,7 +24,7 @@ class PyMap(
     po.PyClassImpl,
     slot.ConstructorMixin,
     slot.IterNextIterableMixin,
-    slot.IterNextMixin,
+    slot.IterNextFastMixin,
 ):
     mapper: PyObjectRef
     iterators: list[PyIter]
@@ -40,23 +38,24 @@ class PyMap(
         cls, class_: PyTypeRef, fargs: fn.FuncArgs, /, vm: VirtualMachine
     ) -> PyObjectRef:
         args = fargs.bind(args_py_new).arguments
+        iterators = [
+            protocol_iter.PyIter.try_from_object(vm, obj) for obj in args["iterators"]
+        ]
         return PyMap(
-            mapper=args["mapper"], iterators=list(args["iterators"])
+            mapper=args["mapper"], iterators=iterators
         ).into_pyresult_with_type(vm, class_)
 
     @classmethod
-    def next(cls, zelf: PyRef[PyMap], vm: VirtualMachine) -> protocol_iter.PyIterReturn:
+    def next_fast(
+        cls, zelf: PyRef[PyMap], vm: VirtualMachine
+    ) -> protocol_iter.IterNext:
         next_objs = []
         for iterator in zelf._.iterators:
-            v = iterator.next(vm)
-            if isinstance(v, protocol_iter.PyIterReturnReturn):
-                item = v.value
-            elif isinstance(v, protocol_iter.PyIterReturnStopIteration):
-                return v
-            else:
-                unreachable()
+            item = iterator.next_fast(vm)
+            if item is protocol_iter.ITER_EXHAUSTED:
+                return item
             next_objs.append(item)
-        return protocol_iter.PyIterReturn.from_pyresult(
+        return protocol_iter.next_fast_from_pyresult(
             lambda: vm.invoke(zelf._.mapper, fn.FuncArgs(next_objs)), vm
         )
 
@@ -36,14 +36,8 @@ class PyModule(po.PyClassImpl, slot.GetAttrMixin):
     def getattr_inner(
         zelf: PyRef[PyModule], name: PyStrRef, vm: VirtualMachine
     ) -> PyObjectRef:
-        if (attr := vm.generic_getattribute_opt(zelf, name, None)) is not None:
+        if (attr := PyModule.getattro_opt(zelf, name, vm)) is not None:
             return attr
-        if zelf.dict is not None:
-            try:
-                getattr_ = zelf.dict.d.get_item(vm.mk_str("__getattr__"), vm)
-                return vm.invoke(getattr_, FuncArgs([name]))
-            except:
-                pass
         vm.new_attribute_error(f"module has no attribute '{name._.as_str()}'")
 
     # # FIXME?
@@ -64,7 +58,7 @@ class PyModule(po.PyClassImpl, slot.GetAttrMixin):
             ("spec", vm.ctx.get_none()),
         ]:
             try:
-                dict_.set_item(vm.mk_str(f"__{attr}__"), value, vm)
+                dict_.set_item(vm.ctx.intern_str(f"__{attr}__"), value, vm)
             except PyImplBase:
                 raise PyImplErrorStr(f"Failed to set __{attr}__ on module")
 
@@ -79,6 +73,18 @@ class PyModule(po.PyClassImpl, slot.GetAttrMixin):
     ) -> PyObjectRef:
         return PyModule.getattr_inner(zelf, name, vm)
 
+    @staticmethod
+    def getattro_opt(
+        zelf: PyRef[PyModule], name: PyStrRef, vm: VirtualMachine
+    ) -> Optional[PyObjectRef]:
+        if (attr := vm.generic_getattribute_opt(zelf, name, None)) is not None:
+            return attr
+        if zelf.dict is not None:
+            getattr_ = zelf.dict.get_item_opt(vm.ctx.intern_str("__getattr__"), vm)
+            if getattr_ is not None:
+                return vm.invoke(getattr_, fn.FuncArgs([name]))
+        return None
+
     @staticmethod
     def slot_new(class_: PyTypeRef, fargs: FuncArgs, vm: VirtualMachine) -> PyObjectRef:
         return PyModule().into_pyresult_with_type(vm, class_)
@@ -95,7 +101,7 @@ class PyModule(po.PyClassImpl, slot.GetAttrMixin):
 
     @staticmethod
     def name_(zelf: PyRef[PyModule], vm: VirtualMachine) -> Optional[PyStrRef]:
-        v = vm.generic_getattribute_opt(zelf, vm.ctx.new_str("__name__"), None)
+        v = vm.generic_getattribute_opt(zelf, vm.ctx.intern_str("__name__"), None)
         if v is None:
             return None
         else:
@@ -104,8 +110,8 @@ class PyModule(po.PyClassImpl, slot.GetAttrMixin):
     @pymethod(True)
     @staticmethod
     def i__repr__(zelf: PyRef[PyModule], *, vm: VirtualMachine) -> PyObjectRef:
-        importlib = vm.import_(vm.ctx.new_str("_frozen_importlib"), None, 0)
-        module_repr = importlib.get_attr(vm.ctx.new_str("_module_repr"), vm)
+        importlib = vm.import_(vm.ctx.intern_str("_frozen_importlib"), None, 0)
+        module_repr = importlib.get_attr(vm.ctx.intern_str("_module_repr"), vm)
         return vm.invoke(module_repr, fn.FuncArgs([zelf]))
 
     @pymethod(True)
@@ -39,6 +39,11 @@ class PyBaseObject(po.PyClassImpl):
     def slot_new(
         class_: PyTypeRef, args: fn.FuncArgs, vm: VirtualMachine
     ) -> PyObjectRef:
+        return PyBaseObject.new_instance(class_, vm)
+
+    # `object.__new__` ignores its arguments
+    @staticmethod
+    def new_instance(class_: PyTypeRef, vm: VirtualMachine) -> PyObjectRef:
         if class_.is_(vm.ctx.types.object_type):
             dict_ = None
         else:
@@ -70,7 +75,7 @@ class PyBaseObject(po.PyClassImpl):
             else:
                 return po.PyComparisonValue(None)
         elif op == slot.PyComparisonOp.Ne:
-            cmp = zelf.class_()._.mro_find_map(lambda cls: cls.slots.richcompare)
+            cmp = zelf.class_()._.effective_slots.richcompare
             assert cmp is not None
             obj = cmp(zelf, other, slot.PyComparisonOp.Eq, vm)
             # FIXME? shouldnt the result be negated
@@ -246,6 +251,13 @@ class PyBaseObject(po.PyClassImpl):
     ) -> PyObjectRef:
         return vm.generic_getattribute(zelf, name)
 
+    @pyslot
+    @staticmethod
+    def slot_getattro_opt(
+        zelf: PyObjectRef, name: PyStrRef, vm: VirtualMachine
+    ) -> Optional[PyObjectRef]:
+        return vm.generic_getattribute_opt(zelf, name, None)
+
     @pymethod(True)
     @staticmethod
     def i__getattribute__(
@@ -260,12 +272,12 @@ class PyBaseObject(po.PyClassImpl):
 
     @staticmethod
     def _reduce_ex(zelf: PyObjectRef, proto: int, vm: VirtualMachine) -> PyObjectRef:
-        reduce = vm.get_attribute_opt(zelf, vm.ctx.new_str("__reduce__"))
+        reduce = vm.get_attribute_opt(zelf, vm.ctx.intern_str("__reduce__"))
         if reduce is not None:
             object_reduce = vm.ctx.types.object_type._.get_attr("__reduce__")
             assert object_reduce is not None
             typ_obj = zelf.clone_class()
-            class_reduce = typ_obj.get_attr(vm.ctx.new_str("__reduce__"), vm)
+            class_reduce = typ_obj.get_attr(vm.ctx.intern_str("__reduce__"), vm)
             if not class_reduce.is_(object_reduce):
                 return vm.invoke(reduce, fn.FuncArgs())
         return common_reduce(zelf, proto, vm)
@@ -312,7 +324,7 @@ def generic_setattr(
     obj: PyObject, attr_name: PyStrRef, value: Optional[PyObjectRef], vm: VirtualMachine
 ) -> None:
     if (attr := obj.get_class_attr(attr_name._.as_str())) is not None:
-        descr_set = attr.class_()._.mro_find_map(lambda cls: cls.slots.descr_set)
+        descr_set = attr.class_()._.effective_slots.descr_set
         if descr_set is not None:
             return descr_set(attr, obj, value, vm)
 
@@ -339,12 +351,12 @@ def generic_setattr(
 
 def common_reduce(obj: PyObjectRef, proto: int, vm: VirtualMachine) -> PyObjectRef:
     if proto >= 2:
-        reducelib = vm.import_(vm.ctx.new_str("__reducelib"), None, 0)
-        reduce_2 = reducelib.get_attr(vm.ctx.new_str("reduce_2"), vm)
+        reducelib = vm.import_(vm.ctx.intern_str("__reducelib"), None, 0)
+        reduce_2 = reducelib.get_attr(vm.ctx.intern_str("reduce_2"), vm)
         return vm.invoke(reduce_2, fn.FuncArgs([obj]))
     else:
-        copyreg = vm.import_(vm.ctx.new_str("copyreg"), None, 0)
-        reduce_ex = copyreg.get_attr(vm.ctx.new_str("_reduce_ex"), vm)
+        copyreg = vm.import_(vm.ctx.intern_str("copyreg"), None, 0)
+        reduce_ex = copyreg.get_attr(vm.ctx.intern_str("_reduce_ex"), vm)
         return vm.invoke(reduce_ex, fn.FuncArgs([obj, vm.ctx.new_int(proto)]))
 
 
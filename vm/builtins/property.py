@@ -151,14 +151,14 @@ class PyProperty(po.PyClassImpl, slot.GetDescriptorMixin):
         if self.getter is not None:
             g = self.getter
             getter_abstract = to_opt(
-                lambda: g.get_attr(vm.ctx.new_str("__isabstractmethod__"), vm)
+                lambda: g.get_attr(vm.ctx.intern_str("__isabstractmethod__"), vm)
             ) or vm.ctx.new_bool(False)
         else:
             getter_abstract = vm.ctx.new_bool(False)
         if self.setter is not None:
             g = self.setter
             setter_abstract = to_opt(
-                lambda: g.get_attr(vm.ctx.new_str("__isabstractmethod__"), vm)
+                lambda: g.get_attr(vm.ctx.intern_str("__isabstractmethod__"), vm)
             ) or vm.ctx.new_bool(False)
         else:
             setter_abstract = vm.ctx.new_bool(False)
@@ -171,7 +171,7 @@ class PyProperty(po.PyClassImpl, slot.GetDescriptorMixin):
         self, value: PyObjectRef, *, vm: VirtualMachine
     ) -> None:
         if self.getter is not None:
-            self.getter.set_attr(vm.ctx.new_str("__isabstractmethod__"), value, vm)
+            self.getter.set_attr(vm.ctx.intern_str("__isabstractmethod__"), value, vm)
 
     @classmethod
     def descr_get(
@@ -85,7 +85,7 @@ def supercheck(ty: PyTypeRef, obj: PyObjectRef, vm: VirtualMachine) -> PyTypeRef
     if obj.isinstance(ty):
         return obj.clone_class()
 
-    class_attr = obj.get_attr(vm.mk_str("__class__"), vm)
+    class_attr = obj.get_attr(vm.ctx.intern_str("__class__"), vm)
     try:
         cls = class_attr.downcast(PyType)
     except PyImplBase as _:
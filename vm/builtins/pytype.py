@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+import dataclasses
 import itertools
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import (
     TYPE_CHECKING,
     Any,
@@ -27,8 +28,10 @@ if TYPE_CHECKING:
     from vm.builtins.tuple import PyTupleRef
 
 import vm.types.slot as slot
+import vm.protocol.number as number
 import vm.pyobject as po
 import vm.pyobjectrc as prc
+import vm.function_ as fn
 
 
 def take_next_base(bases: list[list[PyTypeRef]]) -> Optional[PyTypeRef]:
@@ -68,6 +71,21 @@ def linearise_mro(bases: list[list[PyTypeRef]]) -> list[PyTypeRef]:
 
 R = TypeVar("R")
 
+_version_tags = itertools.count(1)
+
+
+def next_version_tag() -> int:
+    return next(_version_tags)
+
+
+# process wide cache of type attribute lookups, indexed by (version tag, name).
+# a type gets a new version tag whenever it or one of its bases is modified, so
+# stale entries are never matched and simply get overwritten.
+METHOD_CACHE_SIZE = 1 << 12
+_method_cache: list[Optional[tuple[int, str, Optional[PyObjectRef]]]] = [
+    None
+] * METHOD_CACHE_SIZE
+
 
 @po.tp_flags(basetype=True)
 @po.pyimpl(get_attr=True, set_attr=True, callable=True)
@@ -86,10 +104,17 @@ class PyType(
     subclasses: list[PyObjectRef]
     attributes: PyAttributes
     slots: PyTypeSlots
+    # changes whenever the attributes of this type or of one of its bases change
+    version_tag: int = field(default_factory=next_version_tag, compare=False)
+    # `slots` holds the slots defined by this type itself; this holds the slots
+    # actually in effect, i.e. the own slot or the first one found along the mro.
+    # `flags`, `name` and `doc` are not inherited and should be read from `slots`
+    effective_slots: PyTypeSlots = field(init=False, compare=False, repr=False)
 
     # TODO: del
     def __post_init__(self) -> None:
         assert self.slots.name is not None
+        self.resolve_slots()
 
     def into_ref(self: PyType, vm: VirtualMachine) -> PyTypeRef:
         return prc.PyRef.new_ref(self, vm.ctx.types.type_type, None)
@@ -185,30 +210,57 @@ class PyType(
                 (r for r in (f(cls._) for cls in self.mro_) if r is not None), None
             )
 
+    def resolve_slots(self) -> None:
+        effective = dataclasses.replace(self.slots)
+        for name in slot.INHERITED_SLOTS:
+            if getattr(effective, name) is not None:
+                continue
+            for cls in self.mro_:
+                if (value := getattr(cls._.slots, name)) is not None:
+                    setattr(effective, name, value)
+                    break
+        effective.as_number = self.slots.as_number.inherit(
+            [cls._.slots.as_number for cls in self.mro_]
+        )
+        self.effective_slots = effective
+
+    def slots_changed(self) -> None:
+        self.resolve_slots()
+        for subclass in self.subclasses:
+            subclass._.slots_changed()
+
     def set_str_attr(self, attr_name: str, value: PyObjectRef) -> None:
         self.attributes[attr_name] = value
+        self.modified()
+
+    def modified(self) -> None:
+        self.version_tag = next_version_tag()
+        for subclass in self.subclasses:
+            subclass._.modified()
 
     def get_attr(self, attr_name: str) -> Optional[PyObjectRef]:
+        tag = self.version_tag
+        idx = (tag ^ hash(attr_name)) & (METHOD_CACHE_SIZE - 1)
+        entry = _method_cache[idx]
+        if entry is not None and entry[0] == tag and entry[1] == attr_name:
+            return entry[2]
         res = self.get_direct_attr(attr_name)
-        if res is not None:
-            return res
-        return self.get_super_attr(attr_name)
+        if res is None:
+            res = self.get_super_attr(attr_name)
+        _method_cache[idx] = (tag, attr_name, res)
+        return res
 
     def get_direct_attr(self, attr_name: str) -> Optional[PyObjectRef]:
         return self.attributes.get(attr_name, None)
 
     def get_super_attr(self, attr_name: str) -> Optional[PyObjectRef]:
-        return next(
-            (
-                v
-                for v in (cls._.attributes.get(attr_name, None) for cls in self.mro_)
-                if v is not None
-            ),
-            None,
-        )
+        for cls in self.mro_:
+            if (v := cls._.attributes.get(attr_name, None)) is not None:
+                return v
+        return None
 
     def has_attr(self, attr_name: str) -> bool:
-        return any(attr_name in c.attributes for c in self.iter_mro())
+        return self.get_attr(attr_name) is not None
 
     def get_attributes(self) -> PyAttributes:
         attributes = po.PyAttributes()
@@ -252,6 +304,7 @@ class PyType(
             self.slots.call = foo(slot.call_wrapper)
         elif name == "__getattribute__":
             self.slots.getattro = foo(slot.getattro_wrapper)
+            self.slots.getattro_opt = foo(slot.getattro_opt_wrapper)
         elif name in ("__setattr__", "__delattr__"):
             self.slots.setattro = foo(slot.setattro_wrapper)
         elif name in ("__eq__", "__ne__", "__le__", "__lt__", "__ge__", "__gt__"):
@@ -260,6 +313,7 @@ class PyType(
             self.slots.iter = foo(slot.iter_wrapper)
         elif name == "__next__":
             self.slots.iternext = foo(slot.iternext_wrapper)
+            self.slots.iternext_fast = foo(slot.iternext_fast_wrapper)
         elif name == "__get__":
             self.slots.descr_get = foo(slot.descr_get_wrapper)
         elif name in ("__set__", "__delete__"):
@@ -268,8 +322,18 @@ class PyType(
             self.slots.new = foo(slot.new_wrapper)
         elif name == "__del__":
             self.slots.del_ = foo(slot.del_wrapper)
+        elif (number_slot := number.METHOD_TO_SLOT.get(name)) is not None:
+            if not add and number_slot in number.BINARY_SLOTS:
+                # the reflected method might still be there
+                add = any(
+                    self.attributes.contains_key(m)
+                    for m in number.BINARY_SLOTS[number_slot]
+                )
+            wrapper = slot.NUMBER_WRAPPERS[number_slot]
+            setattr(self.slots.as_number, number_slot, foo(wrapper))
         else:
-            pass
+            return
+        self.slots_changed()
 
     # TODO: impl PyType @ 216
 
@@ -326,7 +390,7 @@ class PyType(
         if mod is not None:
             if not mod.isinstance(vm.ctx.types.getset_type):
                 return mod
-        return vm.ctx.new_str("builtins")
+        return vm.ctx.intern_str("builtins")
 
     @classmethod
     def call(
@@ -353,6 +417,41 @@ class PyType(
 
         return obj
 
+    # instances of classes that keep `object.__new__` and define `__init__` in
+    # python are built without `FuncArgs`
+    @pyslot
+    @staticmethod
+    def slot_vectorcall(
+        zelf: PyRef[PyType],
+        args: list[PyObjectRef],
+        start: int,
+        nargs: int,
+        kwnames: Optional[tuple[str, ...]],
+        vm: VirtualMachine,
+    ) -> PyObjectRef:
+        import vm.builtins.function as pyfunction
+        import vm.builtins.object as pyobject
+
+        if zelf.is_(vm.ctx.types.type_type) and nargs == 1 and not kwnames:
+            return args[start].class_()
+        typ = zelf._
+        if (
+            typ.effective_slots.new is pyobject.PyBaseObject.slot_new
+            and (init := typ.get_attr("__init__")) is not None
+            and init.class_().is_(vm.ctx.types.function_type)
+        ):
+            obj = pyobject.PyBaseObject.new_instance(zelf, vm)
+            args[start - 1] = obj
+            res = pyfunction.PyFunction.slot_vectorcall(
+                init, args, start - 1, nargs + 1, kwnames, vm
+            )
+            if not vm.is_none(res):
+                vm.new_type_error("__init__ must return None")
+            return obj
+        return PyType.call(
+            zelf, fn.FuncArgs.from_vector(args, start, nargs, kwnames), vm
+        )
+
     @classmethod
     def setattro(
         cls,
@@ -363,7 +462,7 @@ class PyType(
     ) -> None:
         attr_name = name._.as_str()
         if (attr := zelf.get_class_attr(name._.as_str())) is not None:
-            descr_set = attr.class_()._.mro_find_map(lambda cls: cls.slots.descr_set)
+            descr_set = attr.class_()._.effective_slots.descr_set
             if descr_set is not None:
                 return descr_set(attr, zelf, value, vm)
 
@@ -379,29 +478,34 @@ class PyType(
 
         if attr_name.startswith("__") and attr_name.endswith("__"):
             zelf._.update_slot(attr_name, assign)
+        zelf._.modified()
 
     @classmethod
     def getattro(
         cls, zelf: PyRef[PyType], name: PyStrRef, vm: VirtualMachine
     ) -> PyObjectRef:
+        if (attr := cls.getattro_opt(zelf, name, vm)) is not None:
+            return attr
+        vm.new_attribute_error(
+            f"type object '{zelf._.slot_name()}' has no attribute '{name._.as_str()}'"
+        )
+
+    @classmethod
+    def getattro_opt(
+        cls, zelf: PyRef[PyType], name: PyStrRef, vm: VirtualMachine
+    ) -> Optional[PyObjectRef]:
         mcl = zelf.class_()._
         mcl_attr = mcl.get_attr(name._.as_str())
         if mcl_attr is not None:
             attr_class = mcl_attr.class_()._
-            if attr_class.mro_find_map(lambda cls: cls.slots.descr_set) is not None:
-                if (
-                    descr_get := attr_class.mro_find_map(
-                        lambda cls: cls.slots.descr_get
-                    )
-                ) is not None:
+            if attr_class.effective_slots.descr_set is not None:
+                if (descr_get := attr_class.effective_slots.descr_get) is not None:
                     descr_get(mcl_attr, zelf, mcl.into_ref(vm), vm)
 
         zelf_attr = zelf._.get_attr(name._.as_str())
 
         if zelf_attr is not None:
-            if descr_get := zelf_attr.class_()._.mro_find_map(
-                lambda cls: cls.slots.descr_get
-            ):
+            if descr_get := zelf_attr.class_()._.effective_slots.descr_get:
                 return descr_get(zelf_attr, None, zelf, vm)
 
         if zelf_attr is not None:
@@ -409,9 +513,7 @@ class PyType(
         elif mcl_attr is not None:
             return vm.call_if_get_descriptor(mcl_attr, zelf)
         else:
-            vm.new_attribute_error(
-                f"type object '{zelf._.slot_name()}' has no attribute '{name._.as_str()}'"
-            )
+            return None
 
     def fast_issubclass(self, cls: PyTypeRef, vm: VirtualMachine) -> bool:
         return self.into_ref(vm).is_(cls) or any(m.is_(cls) for m in self.mro_)
@@ -427,9 +529,8 @@ def args_slot_new(name: PyStrRef, bases: PyTupleRef, dict: PyDictRef, **kwargs):
 def call_slot_new(
     typ: PyTypeRef, subtype: PyTypeRef, args: FuncArgs, vm: VirtualMachine
 ) -> PyObjectRef:
-    for cls in typ._.iter_mro():
-        if (slot_new := cls.slots.new) is not None:
-            return slot_new(subtype, args, vm)
+    if (slot_new := typ._.effective_slots.new) is not None:
+        return slot_new(subtype, args, vm)
     unreachable("Should be able to find a new slot somewhere in the mro")
 
 
@@ -372,7 +372,7 @@ class RangeIndexSlice(RangeIndex):
 @dataclass
 class PyLongRangeIterator(
     po.PyClassImpl,
-    slot.IterNextMixin,
+    slot.IterNextFastMixin,
     slot.IterNextIterableMixin,
 ):
     index: int
@@ -387,17 +387,16 @@ class PyLongRangeIterator(
     # TODO: impl PyLongRangeIterator @ 533
 
     @classmethod
-    def next(
+    def next_fast(
         cls, zelf: PyRef[PyLongRangeIterator], vm: VirtualMachine
-    ) -> iter_.PyIterReturn:
-        index = zelf._.index
-        zelf._.index += 1
-        if index < zelf._.length:
-            return iter_.PyIterReturnReturn(
-                vm.ctx.new_int(zelf._.start + index * zelf._.step)
-            )
+    ) -> iter_.IterNext:
+        r = zelf._
+        index = r.index
+        r.index = index + 1
+        if index < r.length:
+            return vm.ctx.new_int(r.start + index * r.step)
         else:
-            return iter_.PyIterReturnStopIteration(None)
+            return iter_.ITER_EXHAUSTED
 
 
 @po.pyimpl(constructor=False, iter_next=True)
@@ -405,7 +404,7 @@ class PyLongRangeIterator(
 @dataclass
 class PyRangeIterator(
     po.PyClassImpl,
-    slot.IterNextMixin,
+    slot.IterNextFastMixin,
     slot.IterNextIterableMixin,
 ):
     index: int
@@ -420,17 +419,16 @@ class PyRangeIterator(
     # TODO: impl PyRangeIterator @ 598
 
     @classmethod
-    def next(
+    def next_fast(
         cls, zelf: PyRef[PyRangeIterator], vm: VirtualMachine
-    ) -> iter_.PyIterReturn:
-        index = zelf._.index
-        zelf._.index += 1
-        if index < zelf._.length:
-            return iter_.PyIterReturnReturn(
-                vm.ctx.new_int(zelf._.start + index * zelf._.step)
-            )
+    ) -> iter_.IterNext:
+        r = zelf._
+        index = r.index
+        r.index = index + 1
+        if index < r.length:
+            return vm.ctx.new_int(r.start + index * r.step)
         else:
-            return iter_.PyIterReturnStopIteration(None)
+            return iter_.ITER_EXHAUSTED
 
 
 def init(context: PyContext) -> None:
@@ -305,7 +305,7 @@ def __py_new_args(x: Optional[PyObjectRef] = None, /):
 @dataclass
 class PyTupleIterator(
     po.PyClassImpl,
-    slot.IterNextMixin,
+    slot.IterNextFastMixin,
     slot.IterNextIterableMixin,
 ):
     internal: pyiter.PositionIterInternal[PyTupleRef]
@@ -327,14 +327,18 @@ class PyTupleIterator(
         raise NotImplementedError
 
     @classmethod
-    def next(
+    def next_fast(
         cls, zelf: PyRef[PyTupleIterator], vm: VirtualMachine
-    ) -> protocol_iter.PyIterReturn:
-        return zelf._.internal.next(
-            lambda tup, pos: protocol_iter.PyIterReturn.from_option(
-                tup._.get_item_by_index_opt(vm, pos)
-            )
-        )
+    ) -> protocol_iter.IterNext:
+        return zelf._.internal.next_fast(tuple_element)
+
+
+def tuple_element(tup: PyTupleRef, pos: int) -> protocol_iter.IterNext:
+    elements = tup._.elements
+    if pos < len(elements):
+        return elements[pos]
+    else:
+        return protocol_iter.ITER_EXHAUSTED
 
 
 T = TypeVar("T")
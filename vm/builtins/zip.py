@@ -2,7 +2,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, Optional
 from common.deco import pymethod
-from common.error import PyImplBase, unreachable
+from common.error import PyImplBase
 
 if TYPE_CHECKING:
     from vm.pyobject import PyContext
@@ -23,7 +23,7 @@ import vm.protocol.iter as protocol_iter
 class PyZip(
     po.PyClassImpl,
     slot.IterNextIterableMixin,
-    slot.IterNextMixin,
+    slot.IterNextFastMixin,
     slot.ConstructorMixin,
 ):
     iterators: list[PyIter]
@@ -63,15 +63,15 @@ class PyZip(
         )
 
     @classmethod
-    def next(cls, zelf: PyRef[PyZip], vm: VirtualMachine) -> protocol_iter.PyIterReturn:
+    def next_fast(
+        cls, zelf: PyRef[PyZip], vm: VirtualMachine
+    ) -> protocol_iter.IterNext:
         if not zelf._.iterators:
-            return protocol_iter.PyIterReturnStopIteration(None)
+            return protocol_iter.ITER_EXHAUSTED
         next_objs = []
         for idx, iterator in enumerate(zelf._.iterators):
-            n = iterator.next(vm)
-            if isinstance(n, protocol_iter.PyIterReturnReturn):
-                item = n.value
-            elif isinstance(n, protocol_iter.PyIterReturnStopIteration):
+            item = iterator.next_fast(vm)
+            if item is protocol_iter.ITER_EXHAUSTED:
                 if zelf._.strict:
                     if idx > 0:
                         plural = " " if idx == 1 else "s 1-"
@@ -81,20 +81,16 @@ class PyZip(
                             )
                         )
                     for idx, iterator in enumerate(zelf._.iterators[1:]):
-                        if isinstance(
-                            iterator.next(vm), protocol_iter.PyIterReturnReturn
-                        ):
+                        if iterator.next_fast(vm) is not protocol_iter.ITER_EXHAUSTED:
                             plural = " " if idx == 1 else "s 1-"
                             vm.new_value_error(
                                 "zip() argument {} is longer than argument{}{}".format(
                                     idx + 2, plural, idx + 1
                                 )
                             )
-                return n
-            else:
-                unreachable()
+                return item
             next_objs.append(item)
-        return protocol_iter.PyIterReturnReturn(vm.ctx.new_tuple(next_objs))
+        return vm.ctx.new_tuple(next_objs)
 
 
 def __py_new_args(*iterators: PyIter, strict: Optional[bool] = None):
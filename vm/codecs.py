@@ -111,7 +111,9 @@ class PyCodec:
         return self.value._.as_slice()[1]
 
     def is_text_codec(self, vm: VirtualMachine) -> bool:
-        is_text = vm.get_attribute_opt(self.value, vm.mk_str("_is_text_encoding"))
+        is_text = vm.get_attribute_opt(
+            self.value, vm.ctx.intern_str("_is_text_encoding")
+        )
         if is_text is None:
             return True
         return is_text.try_to_bool(vm)
@@ -1,6 +1,6 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, Callable, Optional
+from typing import TYPE_CHECKING, Optional
 
 # from vm.frame import ExecutionResult, ExecutionResultReturn, ExecutionResultYield
 
@@ -11,7 +11,7 @@ if TYPE_CHECKING:
     from vm.builtins.pystr import PyStrRef
     from vm.exceptions import PyBaseExceptionRef
     from vm.frame import FrameRef
-    from vm.vm import VirtualMachine
+    from vm.vm import ExceptionStack, VirtualMachine
     from vm.pyobjectrc import PyObject, PyObjectRef
 
 import vm.frame as vframe
@@ -36,42 +36,85 @@ class Coro:
     closed: bool
     running: bool
     name: PyStrRef
-    exception: Optional[PyBaseExceptionRef]
+    # the generator's own entry of the exception stack, made on the first run. it
+    # is linked on top of the caller's while the generator runs, and keeps the
+    # exception being handled in the generator across suspensions
+    exceptions: Optional[ExceptionStack] = None
 
     @staticmethod
     def new(frame: FrameRef, name: PyStrRef) -> Coro:
-        return Coro(frame=frame, closed=False, running=False, name=name, exception=None)
+        return Coro(frame=frame, closed=False, running=False, name=name)
 
     def set_name(self, name: PyStrRef) -> None:
         self.name = name
 
-    def maybe_close(self, res: Optional[vframe.ExecutionResult]) -> None:
-        if res is None or isinstance(res, vframe.ExecutionResultReturn):
-            self.closed = True
-
-    def run_with_context(
+    def run(
         self,
         gen: PyObject,
+        exec: vframe.ExecutingFrame,
         vm: VirtualMachine,
-        func: Callable[[FrameRef], vframe.ExecutionResult],
-    ):
+        throw: Optional[tuple[PyObjectRef, PyObjectRef, PyObjectRef]] = None,
+    ) -> vframe.ExecutionResult:
         if self.running:
             vm.new_value_error("{} already executing".format(gen_name(gen, vm)))
+        vm.enter_frame(self.frame)
         self.running = True
+        if (exceptions := self.exceptions) is None:
+            # `vm.vm` imports the compiler, which imports us
+            import vm.vm as vm_
 
-        vm.push_exception(self.exception)
-
-        result = vm.with_frame(self.frame, func)
-
-        self.exception = vm.pop_exception()
-
-        self.running = False
+            exceptions = self.exceptions = vm_.ExceptionStack(None, None)
+        exceptions.prev = vm.exceptions
+        vm.exceptions = exceptions
+        try:
+            if throw is None:
+                result = exec.run(vm)
+            else:
+                result = exec.gen_throw(vm, *throw)
+        except PyImplException:
+            self.closed = True
+            raise
+        finally:
+            vm.exceptions = exceptions.prev  # type: ignore
+            exceptions.prev = None
+            self.running = False
+            vm.leave_frame()
+        if isinstance(result, vframe.ExecutionResultReturn):
+            self.closed = True
         return result
 
+    def resume(
+        self, gen: PyObject, value: PyObjectRef, vm: VirtualMachine
+    ) -> vframe.ExecutionResult:
+        # the frame keeps its executing view and its stack while suspended, so it is
+        # re-entered at `lasti` with the sent value as the result of the `yield`
+        exec = self.frame._.executing(vm)
+        if exec.lasti == 0:
+            if not vm.is_none(value):
+                vm.new_type_error(
+                    "can't send non-None value to a just-started {}".format(
+                        gen_name(gen, vm)
+                    )
+                )
+        else:
+            exec.push_value(value)
+        return self.run(gen, exec, vm)
+
     def send(
-        self, gen: PyObject, vale: PyObjectRef, vm: VirtualMachine
+        self, gen: PyObject, value: PyObjectRef, vm: VirtualMachine
     ) -> viter.PyIterReturn:
-        raise NotImplementedError
+        if self.closed:
+            return viter.PyIterReturnStopIteration(None)
+        return execution_result_into_iter_return(self.resume(gen, value, vm), vm)
+
+    def next_fast(self, gen: PyObject, vm: VirtualMachine) -> viter.IterNext:
+        # `send(None)` for `for` loops, without a `PyIterReturn` per step
+        if self.closed:
+            return viter.ITER_EXHAUSTED
+        result = self.resume(gen, vm.ctx.get_none(), vm)
+        if isinstance(result, vframe.ExecutionResultYield):
+            return result.value
+        return viter.ITER_EXHAUSTED
 
     def throw(
         self,
@@ -83,34 +126,29 @@ class Coro:
     ) -> viter.PyIterReturn:
         if self.closed:
             raise PyImplException(vm.normalize_exception(exc_type, exc_val, exc_tb))
-        try:
-            result = self.run_with_context(
-                gen, vm, lambda f: f._.gen_throw(vm, exc_type, exc_val, exc_tb)
-            )
-        except PyImplException as _:
-            self.maybe_close(None)
-            raise
-        self.maybe_close(result)
+        result = self.run(
+            gen, self.frame._.executing(vm), vm, (exc_type, exc_val, exc_tb)
+        )
         return execution_result_into_iter_return(result, vm)
 
     def close(self, gen: PyObject, vm: VirtualMachine) -> None:
         if self.closed:
             return None
+        exec = self.frame._.executing(vm)
+        if exec.lasti == 0:
+            # nothing has run yet, so there is no handler to see the `GeneratorExit`
+            self.closed = True
+            return None
+        none = vm.ctx.get_none()
         try:
-            result = self.run_with_context(
-                gen,
-                vm,
-                lambda f: f._.gen_throw(
-                    vm,
-                    vm.ctx.exceptions.generator_exit,
-                    vm.ctx.get_none(),
-                    vm.ctx.get_none(),
-                ),
+            result = self.run(
+                gen, exec, vm, (vm.ctx.exceptions.generator_exit, none, none)
             )
         except PyImplException as e:
-            if not is_gen_exit(e.exception, vm):
+            if not is_gen_exit(e.exception, vm) and not e.exception.isinstance(
+                vm.ctx.exceptions.stop_iteration
+            ):
                 raise
-            self.closed = True
         else:
             self.closed = True
             if isinstance(result, vframe.ExecutionResultYield):
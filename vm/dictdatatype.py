@@ -1,6 +1,7 @@
 from __future__ import annotations
 from collections import OrderedDict
 from dataclasses import dataclass, field
+import itertools
 from typing import TYPE_CHECKING, Callable, Iterable, Optional
 
 if TYPE_CHECKING:
@@ -8,6 +9,13 @@ if TYPE_CHECKING:
     from vm.vm import VirtualMachine
 
 
+_versions = itertools.count(1)
+
+
+def next_version() -> int:
+    return next(_versions)
+
+
 @dataclass
 class DictContext:
     vm: Optional[VirtualMachine]
@@ -26,6 +34,9 @@ class DictKey:
         return self._hash
 
     def __eq__(self, other: DictKey) -> bool:
+        # interned names are found on identity, without a comparison in the vm
+        if self.value is other.value:
+            return True
         assert self.ctx.vm is not None
         return self.ctx.vm.identical_or_equal(self.value, other.value)
 
@@ -40,6 +51,8 @@ class DictItem:
 class Dict:
     inner: dict[DictKey, DictItem] = field(default_factory=dict)
     ctx: DictContext = field(default_factory=lambda: DictContext(None))
+    # renewed on every mutation; versions are unique across all dicts
+    version: int = field(default_factory=next_version)
 
     def _mk(self, key: PyObjectRef) -> DictKey:
         return DictKey(self.ctx, key)
@@ -50,6 +63,7 @@ class Dict:
     def insert(self, vm: VirtualMachine, key: PyObjectRef, value: PyObjectRef) -> None:
         self._sw(vm)
         self.inner[self._mk(key)] = DictItem(key, value)
+        self.version = next_version()
 
     def contains(self, vm: VirtualMachine, key: PyObjectRef) -> bool:
         self._sw(vm)
@@ -73,6 +87,7 @@ class Dict:
 
     def clear(self) -> None:
         self.inner.clear()
+        self.version = next_version()
 
     def delete(self, vm: VirtualMachine, key: PyObjectRef) -> None:
         self._sw(vm)
@@ -81,6 +96,7 @@ class Dict:
 
     def delete_if_exists(self, vm: VirtualMachine, key: PyObjectRef) -> bool:
         self._sw(vm)
+        self.version = next_version()
         return self.inner.pop(self._mk(key), None) is None
 
     def delete_or_insert(
@@ -91,12 +107,14 @@ class Dict:
         if k in self.inner:
             return
         self.inner[k] = DictItem(key, value)
+        self.version = next_version()
 
     def setdefault(
         self, vm: VirtualMachine, key: PyObjectRef, default: Callable[[], PyObjectRef]
     ) -> PyObjectRef:
         self._sw(vm)
         item = self.inner.setdefault(self._mk(key), DictItem(key, default()))  # FIXME
+        self.version = next_version()
         return item.value
 
     def setdefault_entry(
@@ -104,6 +122,7 @@ class Dict:
     ) -> tuple[PyObjectRef, PyObjectRef]:
         self._sw(vm)
         item = self.inner.setdefault(self._mk(key), DictItem(key, default()))  # FIXME
+        self.version = next_version()
         return (item.key, item.value)
 
     def len(self) -> int:
@@ -123,6 +142,7 @@ class Dict:
         item = self.inner.pop(self._mk(key), None)
         if item is None:
             return None
+        self.version = next_version()
         return item.value
 
     def items(self) -> list[tuple[PyObjectRef, PyObjectRef]]:
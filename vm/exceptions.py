@@ -1,9 +1,9 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Any, Callable, Optional, TypeAlias
 from common import to_opt
-from common.deco import pymethod
+from common.deco import pymethod, pyproperty, pyslot
 from common.error import PyImplError
 from vm.builtins.pystr import PyStrRef
 from vm.function_ import FuncArgs
@@ -14,11 +14,14 @@ if TYPE_CHECKING:
     from vm.pyobjectrc import PyObjectRef, PyRef
     from vm.builtins.tuple import PyTupleRef
     from vm.builtins.traceback import PyTracebackRef
+    from vm.frame import FrameRef
     from vm.vm import VirtualMachine
 
 import vm.pyobject as po
+import vm.pyobjectrc as prc
 import vm.builtins.tuple as pytuple
 import vm.builtins.pytype as pytype
+import vm.builtins.traceback as pytraceback
 
 
 @po.tp_flags(basetype=True, has_dict=True)
@@ -31,6 +34,12 @@ class PyBaseException(po.PyClassImpl):
     context: Optional[PyRef[PyBaseException]]
     suppress_context: bool
     args: PyTupleRef
+    # (frame, lasti) of the frames unwound since `traceback` was last materialized,
+    # innermost first. most exceptions are caught a frame or two up and never look
+    # at their traceback, so the `PyTraceback` objects are only built on demand
+    traceback_frames: list[tuple[FrameRef, int]] = field(
+        default_factory=list, compare=False, repr=False
+    )
 
     @classmethod
     def class_(cls, vm: VirtualMachine) -> PyTypeRef:
@@ -46,11 +55,37 @@ class PyBaseException(po.PyClassImpl):
             args=pytuple.PyTuple.new_ref(args, vm.ctx),
         )
 
+    @pyslot
+    @staticmethod
+    def slot_new(class_: PyTypeRef, args: FuncArgs, vm: VirtualMachine) -> PyObjectRef:
+        return prc.PyRef.new_ref(
+            PyBaseException.new(args.args, vm), class_, vm.ctx.new_dict()
+        )
+
     def set_cause(self, cause: Optional[PyBaseExceptionRef]) -> None:
         self.cause = cause
 
-    def get_arg(self, idx: int) -> PyObjectRef:
-        return self.args._.as_slice()[idx]
+    def push_traceback(self, frame: FrameRef, lasti: int) -> None:
+        self.traceback_frames.append((frame, lasti))
+
+    def get_traceback(self, vm: VirtualMachine) -> Optional[PyTracebackRef]:
+        if self.traceback_frames:
+            tb = self.traceback
+            for frame, lasti in self.traceback_frames:
+                loc = frame._.code._.code.locations[lasti - 1]
+                new = pytraceback.PyTraceback.new(tb, frame, lasti, loc.row())
+                tb = new.into_ref(vm)
+            self.traceback_frames.clear()
+            self.traceback = tb
+        return self.traceback
+
+    def set_traceback(self, tb: Optional[PyTracebackRef]) -> None:
+        self.traceback_frames.clear()
+        self.traceback = tb
+
+    def get_arg(self, idx: int) -> Optional[PyObjectRef]:
+        args = self.args._.as_slice()
+        return args[idx] if idx < len(args) else None
 
     def as_str(self, vm: VirtualMachine) -> PyStrRef:
         str_args = vm.exception_args_as_string(self.args, True)
@@ -67,6 +102,19 @@ class PyBaseException(po.PyClassImpl):
     def i__str__(self, vm: VirtualMachine) -> PyObjectRef:
         return self.as_str(vm)
 
+    @pyproperty()
+    def get___traceback__(self, *, vm: VirtualMachine) -> Optional[PyTracebackRef]:
+        return self.get_traceback(vm)
+
+    @pyproperty()
+    def set___traceback__(self, value: PyObjectRef, *, vm: VirtualMachine) -> None:
+        if vm.is_none(value):
+            self.set_traceback(None)
+        elif value.payload_is(pytraceback.PyTraceback):
+            self.set_traceback(value)
+        else:
+            vm.new_type_error("__traceback__ must be a traceback or None")
+
 
 PyBaseExceptionRef: TypeAlias = "PyRef[PyBaseException]"
 
@@ -78,7 +126,7 @@ def none_getter(vm: VirtualMachine, obj: PyObjectRef) -> PyObjectRef:
 def make_arg_getter(
     idx: int,
 ) -> Callable[[VirtualMachine, PyBaseExceptionRef], PyObjectRef]:
-    return lambda vm, exc: exc._.get_arg(idx)
+    return lambda vm, exc: vm.unwrap_or_none(exc._.get_arg(idx))
 
 
 def key_error_str(vm: VirtualMachine, args: FuncArgs) -> PyStrRef:
@@ -617,13 +665,16 @@ class ExceptionCtorClass(ExceptionCtor):
     def instantiate_value(
         self, value: PyObjectRef, vm: VirtualMachine
     ) -> PyBaseExceptionRef:
-        exc_inst = value.downcast(PyBaseException)
+        exc_inst = value.downcast_ref(PyBaseException)
         if exc_inst is not None and exc_inst.isinstance(self.value):
             return exc_inst
+        if vm.is_none(value):
+            args = []
+        elif (tup := value.payload_if_subclass(pytuple.PyTuple, vm)) is not None:
+            args = list(tup.as_slice())
         else:
-            raise NotImplementedError
-            # args = []
-            # vm.invoke_exception(self.value, args)
+            args = [value]
+        return vm.invoke_exception(self.value, args)
 
 
 @dataclass
@@ -2,7 +2,8 @@ from __future__ import annotations
 
 from abc import ABC
 from collections import OrderedDict
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+import enum
 from typing import (
     TYPE_CHECKING,
     Callable,
@@ -38,9 +39,10 @@ import vm.pyobject as po
 import vm.pyobjectrc as prc
 import vm.function_ as fn
 import vm.builtins.code as pycode
-import vm.builtins.traceback as pytraceback
 import vm.builtins.dict as pydict
 import vm.builtins.function as pyfunction
+import vm.builtins.generator as pygenerator
+import vm.builtins.coroutine as pycoroutine
 import vm.types.slot as slot
 import vm.builtins.int as pyint
 import vm.builtins.tuple as pytuple
@@ -50,12 +52,18 @@ import bytecode.bytecode as bytecode
 import vm.protocol.iter as viter
 import vm.builtins.slice as pyslice
 import vm.exceptions as exceptions
+import vm.signal as vm_signal
+import vm.stats as vm_stats
 
 
+# loops, `try` and `with` are described by the code's exception table; only the
+# handlers that are currently running have a block on `FrameState.blocks`
 @dataclass
 class Block:
     type: BlockType
     level: int
+    # the number of exception table blocks around the handler
+    depth: int
 
 
 @dataclass
@@ -63,24 +71,6 @@ class BlockType(ABC):
     pass
 
 
-@final
-@dataclass
-class BlockLoop(BlockType):
-    break_target: Label
-
-
-@final
-@dataclass
-class BlockTryExcept(BlockType):
-    handler: Label
-
-
-@final
-@dataclass
-class BlockFinally(BlockType):
-    handler: Label
-
-
 @final
 @dataclass
 class BlockFinallyHandler(BlockType):
@@ -126,13 +116,106 @@ class UnwindContinue(UnwindReason):
 @final
 @dataclass
 class FrameState:
+    # preallocated to `max_stacksize`; `sp` is the index of the first free slot.
+    # free slots are None, so values popped off hold no reference
     stack: list[PyObjectRef]
+    sp: int
     blocks: list[Block]
     # lasti: int
 
 
 Lasti = int
 
+# returned frames kept per code object, enough for the usual call patterns and a
+# little recursion
+FRAME_FREE_LIST_MAX = 4
+
+
+class AttrCacheKind(enum.Enum):
+    # resolve through the `getattro`/`setattro` slot
+    Generic = enum.auto()
+    # no class attribute: only the instance dict can satisfy the lookup
+    Absent = enum.auto()
+    # class attribute that the instance dict shadows
+    Plain = enum.auto()
+    # data descriptor, takes precedence over the instance dict
+    DataDescr = enum.auto()
+    # method descriptor, left unbound by `LoadMethod`
+    Method = enum.auto()
+
+
+@dataclass
+class AttrCache:
+    # version tags start at 1, so a fresh cache never matches
+    version_tag: int = 0
+    kind: AttrCacheKind = AttrCacheKind.Generic
+    descr: Optional[PyObjectRef] = None
+    descr_get: Optional[slot.DescrGetFunc] = None
+    descr_set: Optional[slot.DescrSetFunc] = None
+
+    def fill_get(self, cls: PyTypeRef, name: str, for_method: bool) -> None:
+        import vm.builtins.object as pyobject
+
+        self.reset(cls)
+        typ = cls._
+        if typ.effective_slots.getattro is not pyobject.PyBaseObject.slot_getattro:
+            return
+        if (descr := typ.get_attr(name)) is None:
+            self.kind = AttrCacheKind.Absent
+            return
+        descr_cls = descr.class_()._
+        if slot.PyTypeFlags.HEAPTYPE in descr_cls.slots.flags:
+            # a user defined descriptor type can gain `__get__`/`__set__` without
+            # changing `cls`
+            return
+        self.descr = descr
+        if for_method and slot.PyTypeFlags.METHOD_DESCR in descr_cls.slots.flags:
+            self.kind = AttrCacheKind.Method
+            return
+        self.descr_get = descr_cls.effective_slots.descr_get
+        if (
+            self.descr_get is not None
+            and descr_cls.effective_slots.descr_set is not None
+        ):
+            self.kind = AttrCacheKind.DataDescr
+        else:
+            self.kind = AttrCacheKind.Plain
+
+    def fill_set(self, cls: PyTypeRef, name: str) -> None:
+        import vm.builtins.object as pyobject
+
+        self.reset(cls)
+        typ = cls._
+        if typ.effective_slots.setattro is not pyobject.PyBaseObject.slot_setattro:
+            return
+        if (descr := typ.get_attr(name)) is None:
+            self.kind = AttrCacheKind.Absent
+            return
+        descr_cls = descr.class_()._
+        if slot.PyTypeFlags.HEAPTYPE in descr_cls.slots.flags:
+            return
+        self.descr = descr
+        self.descr_set = descr_cls.effective_slots.descr_set
+        if self.descr_set is not None:
+            self.kind = AttrCacheKind.DataDescr
+        else:
+            self.kind = AttrCacheKind.Absent
+
+    def reset(self, cls: PyTypeRef) -> None:
+        self.version_tag = cls._.version_tag
+        self.kind = AttrCacheKind.Generic
+        self.descr = None
+        self.descr_get = None
+        self.descr_set = None
+
+
+@dataclass
+class GlobalCache:
+    # dict versions start at 1, so a fresh cache never matches
+    globals_version: int = 0
+    builtins_version: int = 0
+    value: Optional[PyObjectRef] = None
+
 
 @final
 @po.pyimpl(py_ref=True, constructor=False)
@@ -148,6 +231,14 @@ class Frame(po.PyClassImpl):
     lasti: Lasti
     trace: PyObjectRef
     state: FrameState
+    # the view every run of the frame goes through; it also holds the frame's only
+    # `PyRef`. both are made by `into_ref`
+    executing_: Optional[ExecutingFrame] = field(
+        default=None, compare=False, repr=False
+    )
+    # set once the frame may be reached after it returns, e.g. from a traceback.
+    # such frames are never recycled
+    captured: bool = field(default=False, compare=False, repr=False)
 
     @classmethod
     def class_(cls, vm: VirtualMachine) -> PyTypeRef:
@@ -165,7 +256,25 @@ class Frame(po.PyClassImpl):
             pyfunction.PyCell.default().into_ref(vm)
             for _ in range(len(code._.code.cellvars))
         ] + closure
-        state = FrameState(stack=[], blocks=[])
+        if free := code._.free_frames:
+            frame = free.pop()
+            frame.cells_frees = cells_frees
+            frame.locals = scope.locals
+            frame.globals = scope.globals
+            frame.builtins = builtins
+            frame.trace = vm.ctx.get_none()
+            exec = frame.executing_
+            assert exec is not None
+            exec.cells_frees = cells_frees
+            exec.locals = scope.locals
+            exec.globals = scope.globals
+            exec.builtins = builtins
+            return frame
+        state = FrameState(
+            stack=[None] * code._.code.max_stacksize,  # type: ignore
+            sp=0,
+            blocks=[],
+        )
         return Frame(
             fastlocals=[None] * len(code._.code.varnames),
             code=code,
@@ -179,13 +288,16 @@ class Frame(po.PyClassImpl):
         )
 
     def into_ref(self, vm: VirtualMachine) -> FrameRef:
-        return prc.PyRef[Frame](vm.ctx.types.frame_type, None, self)
+        return self.executing(vm).object
 
     def with_exec(
         self: Frame, f: Callable[[ExecutingFrame], R], vm: VirtualMachine
     ) -> R:
-        return f(
-            ExecutingFrame(
+        return f(self.executing(vm))
+
+    def executing(self, vm: VirtualMachine) -> ExecutingFrame:
+        if (exec := self.executing_) is None:
+            exec = self.executing_ = ExecutingFrame(
                 code=self.code,
                 fastlocals=self.fastlocals,
                 cells_frees=self.cells_frees,
@@ -193,10 +305,31 @@ class Frame(po.PyClassImpl):
                 globals=self.globals,
                 builtins=self.builtins,
                 lasti=self.lasti,
-                object=prc.PyRef.new_ref(self, vm.ctx.types.frame_type, None),
+                object=prc.PyRef[Frame](vm.ctx.types.frame_type, None, self),
                 state=self.state,
+                stack=self.state.stack,
+                sp=self.state.sp,
             )
-        )
+        return exec
+
+    def recycle(self) -> None:
+        # called when a plain function's frame has returned. the frame is cleared
+        # and kept for the next call of the same code, unless it may still be seen
+        if self.captured:
+            return
+        free = self.code._.free_frames
+        if len(free) >= FRAME_FREE_LIST_MAX:
+            return
+        exec = self.executing_
+        assert exec is not None
+        fastlocals = self.fastlocals
+        fastlocals[:] = [None] * len(fastlocals)
+        stack = exec.stack
+        stack[:] = [None] * len(stack)  # type: ignore
+        exec.sp = self.state.sp = 0
+        exec.lasti = 0
+        self.state.blocks.clear()
+        free.append(self)
 
     def get_locals(self, vm: VirtualMachine) -> ArgMapping:
         # `fn locals() ...`
@@ -236,34 +369,15 @@ class Frame(po.PyClassImpl):
     def run(self, vm: VirtualMachine) -> ExecutionResult:
         return self.with_exec(lambda exec: exec.run(vm), vm)
 
-    def resume(
-        self, value: Optional[PyObjectRef], vm: VirtualMachine
-    ) -> ExecutionResult:
-        def do(exec: ExecutingFrame) -> ExecutionResult:
-            if value is not None:
-                exec.push_value(value)
-            return exec.run(vm)
-
-        return self.with_exec(do, vm)
-
-    def gen_throw(
-        self,
-        vm: VirtualMachine,
-        exc_type: PyObjectRef,
-        exc_val: PyObjectRef,
-        exc_tb: PyObjectRef,
-    ) -> ExecutionResult:
-        return self.with_exec(
-            lambda exec: exec.gen_throw(vm, exc_type, exc_val, exc_tb), vm
-        )
-
     def current_location(self) -> Location:
-        return self.code._.code.locations[self.lasti - 1]
+        return self.code._.code.locations[self.get_lasti() - 1]
 
     def yield_from_target(self, vm: VirtualMachine) -> Optional[PyObjectRef]:
-        return self.with_exec(lambda exec: exec.yield_from_target(), vm)
+        return self.executing(vm).yield_from_target()
 
     def get_lasti(self) -> int:
+        if self.executing_ is not None:
+            return self.executing_.lasti
         return self.lasti
 
     @pymethod(True)
@@ -297,7 +411,9 @@ class Frame(po.PyClassImpl):
         fs = reversed(vm.frames)
         while not next(fs).is_(self):
             pass
-        return next(fs)
+        back = next(fs)
+        back._.captured = True
+        return back
 
     @pyproperty()
     def get_f_lasti(self, *, vm: VirtualMachine) -> int:
@@ -336,6 +452,13 @@ class ExecutionResultYield(ExecutionResult):
     value: PyObjectRef
 
 
+@final
+@dataclass
+class ExecutionResultCall(ExecutionResult):
+    # a call to a guest function, run by the caller's `ExecutingFrame.run` loop
+    callee: ExecutingFrame
+
+
 PyCellRef: TypeAlias = "PyRef[pyfunction.PyCell]"
 
 
@@ -351,6 +474,9 @@ class ExecutingFrame:
     object: PyRef[Frame]
     lasti: Lasti
     state: FrameState
+    # `state.stack` and its pointer, written back to `state` when `run` returns
+    stack: list[PyObjectRef]
+    sp: int
 
     def unbound_cell_exception(
         self, i: instruction.NameIdx, vm: VirtualMachine
@@ -374,41 +500,130 @@ class ExecutingFrame:
     def get_lasti(self) -> int:
         return self.lasti
 
-    def run(self, vm: VirtualMachine) -> ExecutionResult:
+    def run(
+        self, vm: VirtualMachine, exc: Optional[PyImplException] = None
+    ) -> ExecutionResult:
+        # calls between guest functions don't recurse on the host: the callee is
+        # run by this loop while its callers wait in `callers`. `exc` is raised at
+        # `lasti` first, for an exception thrown into a generator
+        callers: list[ExecutingFrame] = []
+        exec = self
+        try:
+            while 1:
+                try:
+                    result = exec.dispatch(vm, exc)
+                except PyImplException as e:
+                    if not callers:
+                        raise
+                    vm.leave_frame()
+                    exec = callers.pop()
+                    exc = e
+                    continue
+                exc = None
+                if isinstance(result, ExecutionResultCall):
+                    callers.append(exec)
+                    exec = result.callee
+                elif not callers:
+                    return result
+                else:
+                    assert isinstance(result, ExecutionResultReturn), result
+                    vm.leave_frame()
+                    exec.object._.recycle()
+                    exec = callers.pop()
+                    exec.push_value(result.value)
+        finally:
+            # keeps the stack of a suspended generator
+            self.state.sp = self.sp
+        assert False
+
+    def dispatch(
+        self, vm: VirtualMachine, exc: Optional[PyImplException]
+    ) -> ExecutionResult:
+        settings = vm.state.settings
+        stats = vm_stats.STATS
+        # translated code does not count what it runs, so it is off under stats
+        if settings.jit and stats is None and exc is None:
+            # `vm.jit` builds its tables from `bytecode.instruction`, which imports us
+            import vm.jit as vm_jit
+
+            try:
+                jitted = vm_jit.run(self, vm)
+            except PyImplException as e:
+                exc = e
+            else:
+                if jitted is not None:
+                    return jitted
+        if settings.threaded_code:
+            return self.dispatch_threaded(vm, exc)
         instrs = self.code._.code.instructions
-        # print(instrs)
-        print(self.code._.code.obj_name._.value, self.code._.code.source_path._.value)
+        if exc is not None:
+            # raised by the guest callee of the last executed instruction
+            result = self.handle_exception(vm, exc)
+            if result is not None:
+                return result
         while 1:
             idx = self.get_lasti()
             self.update_lasti(lambda i: i + 1)
             assert idx < len(instrs), (idx, instrs)
             instr = instrs[idx]
+            if stats is not None:
+                stats.count(instr)
             try:
-                # print([type(v) for v in self.state.stack])
-                # print([v.class_()._.name() for v in self.state.stack])
-                # print(instr)
-                result = self.execute_instruction(instr, vm)
+                # print([type(v) for v in self.stack[: self.sp]])
+                # print([v.class_()._.name() for v in self.stack[: self.sp]])
+                # print(instr, getattr(self.current_block(), "type", None))
+                result = instr.execute(self, vm)
                 if result is None:
                     continue
                 return result
             except PyImplException as e:
-                loc = self.code._.code.locations[idx]
-                next_ = e.exception._.traceback  # TODO
-                new_traceback = pytraceback.PyTraceback.new(
-                    next_, self.object, self.get_lasti(), loc.row()
-                )
-                e.exception._.traceback = new_traceback.into_ref(vm)
-                vm.contextualize_exception(e.exception)
-                result = self.unwind_blocks(vm, UnwindRaising(e.exception))
+                # not `idx`: the second half of a superinstruction moves `lasti` on
+                result = self.handle_exception(vm, e)
                 if result is None:
                     continue
                 else:
                     return result
         assert False
 
+    def dispatch_threaded(
+        self, vm: VirtualMachine, exc: Optional[PyImplException]
+    ) -> ExecutionResult:
+        code = self.code._
+        ops = code.threaded_code()
+        stats = vm_stats.STATS
+        if exc is not None:
+            result = self.handle_exception(vm, exc)
+            if result is not None:
+                return result
+        while 1:
+            idx = self.lasti
+            self.lasti = idx + 1
+            if stats is not None:
+                stats.count(code.code.instructions[idx])
+            try:
+                result = ops[idx](self, vm)
+                if result is None:
+                    continue
+                return result
+            except PyImplException as e:
+                result = self.handle_exception(vm, e)
+                if result is None:
+                    continue
+                else:
+                    return result
+        assert False
+
+    def handle_exception(self, vm: VirtualMachine, e: PyImplException) -> FrameResult:
+        self.object._.captured = True
+        e.exception._.push_traceback(self.object, self.lasti)
+        vm.contextualize_exception(e.exception)
+        return self.unwind_blocks(vm, UnwindRaising(e.exception))
+
     def yield_from_target(self) -> Optional[PyObject]:
-        if isinstance(
-            self.code._.code.instructions[self.get_lasti()], instruction.YieldFrom
+        # a frame suspended in `yield from` is left on its `YieldFrom`
+        instrs = self.code._.code.instructions
+        if self.lasti < len(instrs) and isinstance(
+            instrs[self.lasti], instruction.YieldFrom
         ):
             return self.last_value_ref()
         return None
@@ -420,18 +635,33 @@ class ExecutingFrame:
         exc_val: PyObjectRef,
         exc_tb: PyObjectRef,
     ) -> ExecutionResult:
-        # gen = self.yield_from_target()
-        # if gen is not None:
-        #     pass
-        raise NotImplementedError
-
-    def execute_instruction(
-        self, instruction: instruction.Instruction, vm: VirtualMachine
-    ) -> Optional[ExecutionResult]:
-        # print(instruction, getattr(self.current_block(), "type", None))
-        vm.check_signals()
-
-        return instruction.execute(self, vm)
+        if (gen := self.yield_from_target()) is not None:
+            # the exception is thrown into the delegated-to iterator first
+            coro = self.builtin_coro(gen)
+            if coro is not None:
+                thrower = lambda: coro.throw(
+                    gen, exc_type, exc_val, exc_tb, vm
+                ).into_pyresult(vm)
+            elif (
+                meth := vm.get_attribute_opt(gen, vm.ctx.intern_str("throw"))
+            ) is not None:
+                args = fn.FuncArgs([exc_type, exc_val, exc_tb])
+                thrower = lambda: vm.invoke(meth, args)
+            else:
+                thrower = None
+            if thrower is not None:
+                try:
+                    return ExecutionResultYield(thrower())
+                except PyImplException as err:
+                    self.pop_value()
+                    self.lasti += 1
+                    if err.exception.isinstance(vm.ctx.exceptions.stop_iteration):
+                        self.push_value(vm.unwrap_or_none(err.exception._.get_arg(0)))
+                        return self.run(vm)
+                    exc_type, exc_val, exc_tb = vm.split_exception(err.exception)
+                    return self.gen_throw(vm, exc_type, exc_val, exc_tb)
+        exception = vm.normalize_exception(exc_type, exc_val, exc_tb)
+        return self.run(vm, PyImplException(exception))
 
     def load_global_or_builtin(
         self, name: pystr.PyStrRef, vm: VirtualMachine
@@ -441,6 +671,25 @@ class ExecutingFrame:
             vm.new_name_error(f"name '{name._.as_str()}' is not defined", name)
         return r
 
+    def load_global(
+        self, vm: VirtualMachine, idx: instruction.NameIdx, cache: GlobalCache
+    ) -> FrameResult:
+        globals_version = self.globals._.entries.version
+        builtins_version = self.builtins._.entries.version
+        value = cache.value
+        if (
+            value is None
+            or cache.globals_version != globals_version
+            or cache.builtins_version != builtins_version
+        ):
+            value = cache.value = self.load_global_or_builtin(
+                self.code._.code.names[idx], vm
+            )
+            cache.globals_version = globals_version
+            cache.builtins_version = builtins_version
+        self.push_value(value)
+        return None
+
     def get_elements(
         self, vm: VirtualMachine, size: int, unpack: bool
     ) -> list[PyObjectRef]:
@@ -473,9 +722,11 @@ class ExecutingFrame:
         if (obj := vm.get_attribute_opt(module, name)) is not None:
             return obj
         try:
-            mod_name = module.get_attr(vm.mk_str("__name__"), vm).downcast(pystr.PyStr)
+            mod_name = module.get_attr(vm.ctx.intern_str("__name__"), vm).downcast(
+                pystr.PyStr
+            )
             full_mod_name = f"{mod_name}.{name}"
-            sys_modules = vm.sys_module.get_attr(vm.mk_str("modules"), vm)
+            sys_modules = vm.sys_module.get_attr(vm.ctx.intern_str("modules"), vm)
             return sys_modules.get_item(vm.mk_str(full_mod_name), vm)
         except PyImplBase:
             vm.new_import_error(f"cannot import name '{name}'", name)
@@ -483,7 +734,9 @@ class ExecutingFrame:
     def import_star(self, vm: VirtualMachine) -> FrameResult:
         module = self.pop_value()
         if module.dict is not None:
-            if (all := module.dict.get_item(vm.mk_str("__all__"), vm)) is not None:
+            if (
+                all := module.dict.get_item(vm.ctx.intern_str("__all__"), vm)
+            ) is not None:
                 all_ = [name.as_str() for name in vm.extract_elements(pystr.PyStr, all)]
                 filter_pred = lambda name: name in all_
             else:
@@ -494,37 +747,50 @@ class ExecutingFrame:
                     self.locals.mapping().ass_subscript_(k, v, vm)
         return None
 
+    def exception_handlers(self) -> tuple[bytecode.ExceptionHandler, ...]:
+        return self.code._.code.exception_handlers(self.lasti - 1)
+
     def unwind_blocks(self, vm: VirtualMachine, reason: UnwindReason) -> FrameResult:
-        while (block := self.current_block()) is not None:
-            if isinstance(block.type, BlockLoop):
-                if isinstance(reason, UnwindBreak):
-                    self.pop_block()
-                    self.jump(block.type.break_target)
-                    return None
-                elif isinstance(reason, UnwindContinue):
-                    self.jump(reason.target)
+        # the table is only consulted here, so entering and leaving a block is free
+        handlers = self.exception_handlers()
+        depth = len(handlers)
+        blocks = self.state.blocks
+        while depth or blocks:
+            if not blocks or depth > blocks[-1].depth:
+                depth -= 1
+                handler = handlers[depth]
+                kind = handler.kind
+                if kind is bytecode.HandlerKind.LOOP:
+                    if isinstance(reason, UnwindBreak):
+                        self.truncate(handler.level)
+                        self.jump(handler.target)
+                        return None
+                    elif isinstance(reason, UnwindContinue):
+                        self.jump_checked(reason.target, vm)
+                        return None
+                elif kind is bytecode.HandlerKind.FINALLY:
+                    self.truncate(handler.level)
+                    prev_exc = vm.current_exception()
+                    if isinstance(reason, UnwindRaising):
+                        vm.set_exception(reason.exception.clone())
+                    self.push_block(
+                        BlockFinallyHandler(reason=reason, prev_exc=prev_exc), depth
+                    )
+                    self.jump(handler.target)
                     return None
-                else:
-                    self.pop_block()
-            elif isinstance(block.type, BlockFinally):
-                self.pop_block()
-                prev_exc = vm.current_exception()
-                if isinstance(reason, UnwindRaising):
-                    vm.set_exception(reason.exception.clone())
-                self.push_block(BlockFinallyHandler(reason=reason, prev_exc=prev_exc))
-                self.jump(block.type.handler)
-                return None
-            elif isinstance(block.type, BlockTryExcept):
-                self.pop_block()
-                if isinstance(reason, UnwindRaising):
-                    self.push_block(BlockExceptHandler(vm.current_exception()))
+                elif isinstance(reason, UnwindRaising):
+                    self.truncate(handler.level)
+                    self.push_block(BlockExceptHandler(vm.current_exception()), depth)
                     vm.contextualize_exception(reason.exception)
                     vm.set_exception(reason.exception.clone())
                     self.push_value(reason.exception.into_pyobj(vm))
-                    self.jump(block.type.handler)
+                    self.jump(handler.target)
                     return None
-            elif isinstance(block.type, (BlockFinallyHandler, BlockExceptHandler)):
-                self.pop_block()
+            else:
+                block = self.pop_block()
+                assert isinstance(
+                    block.type, (BlockFinallyHandler, BlockExceptHandler)
+                ), block
                 vm.set_exception(block.type.prev_exc)
 
         if isinstance(reason, UnwindRaising):
@@ -536,35 +802,120 @@ class ExecutingFrame:
         else:
             assert False
 
-    def _get_name(self, idx: instruction.NameIdx) -> str:
-        return self.code._.code.names[idx]._.as_str()
-
-    def load_attr(self, vm: VirtualMachine, attr: instruction.NameIdx) -> FrameResult:
-        attr_name = self._get_name(attr)
-        parent = self.pop_value()
-        obj = parent.get_attr(vm.mk_str(attr_name), vm)
-        self.push_value(obj)
+    def load_attr(
+        self, vm: VirtualMachine, attr: instruction.NameIdx, cache: AttrCache
+    ) -> FrameResult:
+        self.push_value(self.get_attr_cached(vm, self.pop_value(), attr, cache))
         return None
 
-    def store_attr(self, vm: VirtualMachine, attr: instruction.NameIdx) -> FrameResult:
-        attr_name = self._get_name(attr)
+    def get_attr_cached(
+        self,
+        vm: VirtualMachine,
+        parent: PyObjectRef,
+        attr: instruction.NameIdx,
+        cache: AttrCache,
+    ) -> PyObjectRef:
+        name = self.code._.code.names[attr]
+        cls = parent.class_()
+        if cache.version_tag != cls._.version_tag:
+            cache.fill_get(cls, name._.as_str(), False)
+
+        kind = cache.kind
+        if kind is AttrCacheKind.DataDescr:
+            assert cache.descr is not None and cache.descr_get is not None
+            obj = cache.descr_get(cache.descr, parent, cls, vm)
+        elif kind is not AttrCacheKind.Generic and (
+            parent.dict is not None
+            and (found := parent.dict.get_item_opt(name, vm)) is not None
+        ):
+            obj = found
+        elif kind is AttrCacheKind.Plain:
+            assert cache.descr is not None
+            if cache.descr_get is not None:
+                obj = cache.descr_get(cache.descr, parent, cls, vm)
+            else:
+                obj = cache.descr
+        else:
+            obj = parent.get_attr(name, vm)
+        return obj
+
+    def store_attr(
+        self, vm: VirtualMachine, attr: instruction.NameIdx, cache: AttrCache
+    ) -> FrameResult:
+        name = self.code._.code.names[attr]
         parent = self.pop_value()
         value = self.pop_value()
-        parent.set_attr(vm.mk_str(attr_name), value, vm)
+        cls = parent.class_()
+        if cache.version_tag != cls._.version_tag:
+            cache.fill_set(cls, name._.as_str())
+
+        kind = cache.kind
+        if kind is AttrCacheKind.DataDescr:
+            assert cache.descr is not None and cache.descr_set is not None
+            cache.descr_set(cache.descr, parent, value, vm)
+        elif kind is AttrCacheKind.Absent and parent.dict is not None:
+            parent.dict.set_item(name, value, vm)
+        else:
+            parent.set_attr(name, value, vm)
+        return None
+
+    def load_method(
+        self, vm: VirtualMachine, idx: instruction.NameIdx, cache: AttrCache
+    ) -> FrameResult:
+        name = self.code._.code.names[idx]
+        obj = self.pop_value()
+        cls = obj.class_()
+        if cache.version_tag != cls._.version_tag:
+            cache.fill_get(cls, name._.as_str(), True)
+
+        kind = cache.kind
+        if kind is AttrCacheKind.Generic:
+            method = po.PyMethod.get(obj, name, vm)
+            if isinstance(method, po.PyMethodFunction):
+                target, is_method, func = method.target, True, method.func
+            elif isinstance(method, po.PyMethodAttribute):
+                target, is_method, func = vm.ctx.get_none(), False, method.func
+            else:
+                assert False, method
+        elif kind is AttrCacheKind.DataDescr:
+            assert cache.descr is not None and cache.descr_get is not None
+            target, is_method = vm.ctx.get_none(), False
+            func = cache.descr_get(cache.descr, obj, cls, vm)
+        elif (
+            obj.dict is not None
+            and (found := obj.dict.get_item_opt(name, vm)) is not None
+        ):
+            target, is_method, func = vm.ctx.get_none(), False, found
+        elif kind is AttrCacheKind.Method:
+            assert cache.descr is not None
+            target, is_method, func = obj, True, cache.descr
+        elif kind is AttrCacheKind.Plain:
+            assert cache.descr is not None
+            target, is_method = vm.ctx.get_none(), False
+            if cache.descr_get is not None:
+                func = cache.descr_get(cache.descr, obj, cls, vm)
+            else:
+                func = cache.descr
+        else:
+            target, is_method = vm.ctx.get_none(), False
+            func = obj.get_attr(name, vm)
+
+        self.push_value(target)
+        self.push_value(vm.ctx.new_bool(is_method))
+        self.push_value(func)
         return None
 
     def delete_attr(self, vm: VirtualMachine, attr: instruction.NameIdx) -> FrameResult:
-        attr_name = self._get_name(attr)
         parent = self.pop_value()
-        parent.del_attr(vm.mk_str(attr_name), vm)
+        parent.del_attr(self.code._.code.names[attr], vm)
         return None
 
-    def push_block(self, type: BlockType) -> None:
-        self.state.blocks.append(Block(type, len(self.state.stack)))
+    def push_block(self, type: BlockType, depth: int) -> None:
+        self.state.blocks.append(Block(type, self.sp, depth))
 
     def pop_block(self) -> Block:
         block = self.state.blocks.pop()
-        del self.state.stack[block.level :]
+        self.truncate(block.level)
         return block
 
     def current_block(self) -> Optional[Block]:
@@ -572,40 +923,61 @@ class ExecutingFrame:
             return self.state.blocks[-1]
         return None
 
+    # the stack is sized by the compiler's `max_stacksize`, so none of these check
+    # for overflow
     def push_value(self, obj: PyObjectRef) -> None:
+        self.stack[self.sp] = obj
+        self.sp += 1
 
-        from vm.pyobjectrc import PyRef
-
-        assert isinstance(obj, PyRef)
-        if len(self.state.stack) >= self.code._.code.max_stacksize:
-            self.fatal("tried to push value onto stack but overflowed max_stacksize")
-        self.state.stack.append(obj)
+    def push_multiple(self, objs: list[PyObjectRef]) -> None:
+        sp = self.sp
+        self.sp = sp + len(objs)
+        self.stack[sp : self.sp] = objs
 
     def pop_value(self) -> PyObjectRef:
-        return self.state.stack.pop()
+        sp = self.sp = self.sp - 1
+        stack = self.stack
+        obj = stack[sp]
+        stack[sp] = None  # type: ignore
+        return obj
 
     def pop_multiple(self, count: int) -> list[PyObjectRef]:
-        if count == 0:
-            return []
-        res = self.state.stack[-count:]
-        del self.state.stack[-count:]
-        return res
+        sp = self.sp
+        start = self.sp = sp - count
+        stack = self.stack
+        objs = stack[start:sp]
+        stack[start:sp] = [None] * count  # type: ignore
+        return objs
+
+    def truncate(self, sp: int) -> None:
+        # drops the values from `sp` up
+        top = self.sp
+        if top > sp:
+            self.stack[sp:top] = [None] * (top - sp)  # type: ignore
+        self.sp = sp
+
+    def clear_above(self, end: int) -> None:
+        # drops the values an instruction left between `sp` and `end` after
+        # lowering `sp` before it was done with them
+        sp = self.sp
+        self.stack[sp:end] = [None] * (end - sp)  # type: ignore
 
     def last_value(self) -> PyObjectRef:
-        return self.state.stack[-1]
+        return self.stack[self.sp - 1]
 
     def last_value_ref(self) -> PyObject:
-        return self.state.stack[-1]
+        return self.stack[self.sp - 1]
 
     def nth_value(self, depth: int) -> PyObjectRef:
-        return self.state.stack[-depth - 1]
+        return self.stack[self.sp - depth - 1]
 
     def fatal(self, msg: str) -> NoReturn:
         assert False, (msg, self)
 
     def execute_rotate(self, amount: int) -> FrameResult:
-        self.state.stack[-amount:-amount] = [self.state.stack[-1]]
-        self.state.stack.pop()
+        stack = self.stack
+        sp = self.sp
+        stack[sp - amount : sp] = [stack[sp - 1], *stack[sp - amount : sp - 1]]
         return None
 
     def execute_subscript(self, vm: VirtualMachine) -> FrameResult:
@@ -668,15 +1040,9 @@ class ExecutingFrame:
         self.push_value(obj)
         return None
 
-    def collect_positional_args(self, nargs: int) -> FuncArgs:
-        return fn.FuncArgs(args=self.pop_multiple(nargs), kwargs=OrderedDict())
-
-    def collect_keyword_args(self, nargs: int) -> FuncArgs:
+    def pop_kwnames(self) -> tuple[str, ...]:
         kwarg_names = self.pop_value().downcast(pytuple.PyTuple)
-        args = self.pop_multiple(nargs)
-        return fn.FuncArgs.with_kwargs_names(
-            args, [pyobj._.as_str() for pyobj in kwarg_names._.elements]
-        )
+        return tuple(pyobj._.as_str() for pyobj in kwarg_names._.elements)
 
     def collect_ex_args(self, vm: VirtualMachine, has_kwargs: bool) -> FuncArgs:
         kwargs = OrderedDict()
@@ -694,25 +1060,109 @@ class ExecutingFrame:
         args = vm.extract_elements_as_pyobjects(self.pop_value())
         return fn.FuncArgs(args, kwargs)
 
+    # calls the function below the `nvalues` arguments on top of the stack, the
+    # last `len(kwnames)` of them being keyword values. the arguments are passed
+    # as a slice of the stack, see `slot.VectorCallFunc`
+    def execute_vectorcall(
+        self, nvalues: int, kwnames: Optional[tuple[str, ...]], vm: VirtualMachine
+    ) -> FrameResult:
+        start = self.sp - nvalues
+        func = self.stack[start - 1]
+        self.sp = start - 1
+        nargs = nvalues - len(kwnames) if kwnames else nvalues
+        return self.vectorcall_function(func, start, nargs, kwnames, vm)
+
+    # like `execute_vectorcall`, below the function are the target and whether
+    # the target is its first argument; the target then takes the function's slot
+    def execute_method_vectorcall(
+        self, nvalues: int, kwnames: Optional[tuple[str, ...]], vm: VirtualMachine
+    ) -> FrameResult:
+        stack = self.stack
+        start = self.sp - nvalues
+        func = stack[start - 1]
+        self.sp = start - 3
+        nargs = nvalues - len(kwnames) if kwnames else nvalues
+        if stack[start - 2].is_(vm.ctx.true_value):
+            start -= 1
+            nargs += 1
+            stack[start] = stack[start - 2]
+        return self.vectorcall_function(func, start, nargs, kwnames, vm)
+
+    # the arguments stay above `sp` until the callee has taken them
+    def vectorcall_function(
+        self,
+        func: PyObjectRef,
+        start: int,
+        nargs: int,
+        kwnames: Optional[tuple[str, ...]],
+        vm: VirtualMachine,
+    ) -> FrameResult:
+        stack = self.stack
+        function_type = vm.ctx.types.function_type
+        if func.class_().is_(vm.ctx.types.bound_method_type) and (
+            func._.function.class_().is_(function_type)
+        ):
+            stack[start - 1] = func._.object
+            start -= 1
+            nargs += 1
+            func = func._.function
+        end = start + nargs + (len(kwnames) if kwnames else 0)
+        if func.class_().is_(function_type) and func._.is_plain():
+            if vm_signal.EVAL_BREAKER:
+                vm_signal.handle_eval_breaker(vm)
+            frame = func._.new_frame_vector(stack, start, nargs, kwnames, vm)
+            self.clear_above(end)
+            vm.enter_frame(frame)
+            return ExecutionResultCall(frame._.executing(vm))
+        result = vm.vectorcall(func, stack, start, nargs, kwnames)
+        self.clear_above(end)
+        self.push_value(result)
+        return None
+
     def execute_call(self, args: FuncArgs, vm: VirtualMachine) -> FrameResult:
         func_ref = self.pop_value()
-        value = vm.invoke(func_ref, args)
-        self.push_value(value)
-        return None
+        return self.call_function(func_ref, args, vm)
 
     def execute_method_call(self, args: FuncArgs, vm: VirtualMachine) -> FrameResult:
         func = self.pop_value()
         is_method = self.pop_value().is_(vm.ctx.true_value)
         target = self.pop_value()
-        method: po.PyMethod
         if is_method:
-            method = po.PyMethodFunction(target=target, func=func)
-        else:
-            method = po.PyMethodAttribute(func)
-        value = method.invoke(args, vm)
-        self.push_value(value)
+            args.prepend_arg(target)
+        return self.call_function(func, args, vm)
+
+    def call_function(
+        self, func: PyObjectRef, args: FuncArgs, vm: VirtualMachine
+    ) -> FrameResult:
+        if (callee := self.guest_callee(func, args, vm)) is not None:
+            return ExecutionResultCall(callee)
+        self.push_value(vm.invoke(func, args))
         return None
 
+    def guest_callee(
+        self, func: PyObjectRef, args: FuncArgs, vm: VirtualMachine
+    ) -> Optional[ExecutingFrame]:
+        cls = func.class_()
+        if cls.is_(vm.ctx.types.function_type):
+            function = func._
+            if not function.is_plain():
+                return None
+        elif cls.is_(vm.ctx.types.bound_method_type):
+            bound = func._
+            if not bound.function.class_().is_(vm.ctx.types.function_type):
+                return None
+            function = bound.function._
+            if not function.is_plain():
+                return None
+            args.prepend_arg(bound.object)
+        else:
+            return None
+        if vm_signal.EVAL_BREAKER:
+            vm_signal.handle_eval_breaker(vm)
+        frame = function.new_frame(args, None, vm)
+        vm.enter_frame(frame)
+        return frame._.executing(vm)
+
     def execute_raise(
         self, vm: VirtualMachine, kind: bytecode.RaiseKind
     ) -> FrameResult:
@@ -738,25 +1188,38 @@ class ExecutingFrame:
         raise PyImplException(exception)
 
     def builtin_coro(self, coro: PyObject) -> Optional[Coro]:
-        raise NotImplementedError
+        if (gen := coro.downcast_ref(pygenerator.PyGenerator)) is not None:
+            return gen._.inner
+        if (cor := coro.downcast_ref(pycoroutine.PyCoroutine)) is not None:
+            return cor._.inner
+        return None
 
     def _send(
         self, gen: PyObject, val: PyObjectRef, vm: VirtualMachine
     ) -> PyIterReturn:
-        raise NotImplementedError
+        if (coro := self.builtin_coro(gen)) is not None:
+            return coro.send(gen, val, vm)
+        elif vm.is_none(val):
+            return viter.PyIter.new(gen, None).next(vm)
+        else:
+            return viter.PyIterReturn.from_pyresult(
+                lambda: vm.call_method(gen, "send", fn.FuncArgs([val])), vm
+            )
 
     def execute_yield_from(self, vm: VirtualMachine) -> Optional[ExecutionResult]:
         val = self.pop_value()
         coro = self.last_value_ref()
         result = self._send(coro, val, vm)
 
-        if isinstance(result, ExecutionResultReturn):
-            self.update_lasti(lambda i: i - 1)
+        if isinstance(result, viter.PyIterReturnReturn):
+            # suspended on this instruction, so the next value sent goes to `coro`
+            self.lasti -= 1
             return ExecutionResultYield(result.value)
-        elif isinstance(result, ExecutionResultYield):
-            return None
         else:
-            assert False, result
+            assert isinstance(result, viter.PyIterReturnStopIteration), result
+            self.pop_value()
+            self.push_value(vm.unwrap_or_none(result.value))
+            return None
 
     def execute_unpack_ex(
         self, vm: VirtualMachine, before: int, after: int
@@ -771,45 +1234,38 @@ class ExecutingFrame:
                 f"not enough values to unpack (expected at least {min_expected}, got {len(elements)})",
             )
 
-        self.state.stack.extend(reversed(elements[before + middle :]))
+        self.push_multiple(elements[before + middle :][::-1])
         middle_elements = elements[before : before + middle]
         t = vm.ctx.new_list(middle_elements)
         self.push_value(t.into_pyobj(vm))
-        self.state.stack.extend(reversed(elements[:before]))
+        self.push_multiple(elements[:before][::-1])
 
         return None
 
     def jump(self, label: Label):
         self.update_lasti(lambda i: label.value)
 
+    def jump_checked(self, label: Label, vm: VirtualMachine) -> None:
+        # every loop goes through a backward jump, so asynchronous work is handled
+        # here instead of before each instruction
+        if label.value < self.lasti and vm_signal.EVAL_BREAKER:
+            vm_signal.handle_eval_breaker(vm)
+        self.lasti = label.value
+
     def execute_for_iter(
         self, vm: VirtualMachine, target: Label
     ) -> Optional[ExecutionResult]:
-        top_of_stack: viter.PyIter[PyObjectRef] = viter.PyIter.new(
-            self.last_value(), None
-        )
-        # top_of_stack = viter.PyIter.try_from_object(vm, self.last_value())  # FIXME?
-
         try:
-            next_obj = top_of_stack.next(vm)
+            next_obj = viter.next_fast(self.last_value(), vm)
         except PyImplBase:
             self.pop_value()
             raise
 
-        if isinstance(next_obj, viter.PyIterReturnReturn):
-            # TODO: del
-            from vm.pyobjectrc import PyRef
-
-            assert isinstance(next_obj.value, PyRef), (
-                type(next_obj.value),
-                type(top_of_stack.value._),
-            )
-            self.push_value(next_obj.value)
-        elif isinstance(next_obj, viter.PyIterReturnStopIteration):
+        if next_obj is viter.ITER_EXHAUSTED:
             self.pop_value()
             self.jump(target)
         else:
-            assert False
+            self.push_value(next_obj)
         return None
 
     def execute_make_function(
@@ -853,16 +1309,16 @@ class ExecutingFrame:
             code_obj, self.globals, closure, defaults, kw_only_defaults
         ).into_object(vm)
 
-        func_obj.set_attr(vm.mk_str("__doc__"), vm.ctx.get_none(), vm)
+        func_obj.set_attr(vm.ctx.intern_str("__doc__"), vm.ctx.get_none(), vm)
 
         name = qualified_name._.as_str().split(".")[-1]
-        func_obj.set_attr(vm.mk_str("__name__"), vm.ctx.new_str(name), vm)
-        func_obj.set_attr(vm.mk_str("__qualname__"), qualified_name, vm)
+        func_obj.set_attr(vm.ctx.intern_str("__name__"), vm.ctx.intern_str(name), vm)
+        func_obj.set_attr(vm.ctx.intern_str("__qualname__"), qualified_name, vm)
         module = vm.unwrap_or_none(
-            self.globals._.get_item_opt(vm.mk_str("__name__"), vm)
+            self.globals._.get_item_opt(vm.ctx.intern_str("__name__"), vm)
         )
-        func_obj.set_attr(vm.mk_str("__module__"), module, vm)
-        func_obj.set_attr(vm.mk_str("__annotations__"), annotations, vm)
+        func_obj.set_attr(vm.ctx.intern_str("__module__"), module, vm)
+        func_obj.set_attr(vm.ctx.intern_str("__annotations__"), annotations, vm)
 
         self.push_value(func_obj)
         return None
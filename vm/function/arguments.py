@@ -57,7 +57,7 @@ class ArgIterable(Generic[T]):
     @staticmethod
     def try_from_object(vm: VirtualMachine, obj: PyObjectRef) -> ArgIterable:
         cls = obj.class_()
-        iterfn = cls._.mro_find_map(lambda x: x.slots.iter)
+        iterfn = cls._.effective_slots.iter
         if iterfn is None and not cls._.has_attr("__getitem__"):
             vm.new_type_error(f"'{cls._.name()}' object is not iterable")
         return ArgIterable(obj, iterfn)
@@ -16,6 +16,10 @@ if TYPE_CHECKING:
     from vm.vm import VirtualMachine
 
 
+# `FuncArgs.bind` targets -> their signature
+SIGNATURES: dict[Callable, inspect.Signature] = {}
+
+
 @dataclass
 class FuncArgs:
     args: list[PyObjectRef] = field(default_factory=list)
@@ -49,6 +53,20 @@ class FuncArgs:
 
         return FuncArgs(posargs, kwargs)
 
+    # the generic form of a vectorcall, see `slot.VectorCallFunc`
+    @staticmethod
+    def from_vector(
+        args: list[PyObjectRef],
+        start: int,
+        nargs: int,
+        kwnames: Optional[tuple[str, ...]],
+    ) -> FuncArgs:
+        end = start + nargs
+        if not kwnames:
+            return FuncArgs(args[start:end], OrderedDict())
+        kwvalues = args[end : end + len(kwnames)]
+        return FuncArgs(args[start:end], OrderedDict(zip(kwnames, kwvalues)))
+
     def take_positional(self, nargs: int) -> list[PyObjectRef]:
         assert len(self.args) == nargs
         assert not self.kwargs
@@ -73,7 +91,9 @@ class FuncArgs:
         return args[0]
 
     def bind(self, func: Callable) -> inspect.BoundArguments:
-        args = inspect.signature(func).bind(*self.args, **self.kwargs)
+        if (sig := SIGNATURES.get(func)) is None:
+            sig = SIGNATURES[func] = inspect.signature(func)
+        args = sig.bind(*self.args, **self.kwargs)
         args.apply_defaults()
         return args
 
@@ -29,13 +29,13 @@ def init_importlib(vm: VirtualMachine, initialize_parameter: vm_.InitParameter)
     def do() -> PyObjectRef:
         importlib = import_frozen(vm, "_frozen_importlib")
         impmod = import_builtin(vm, "_imp")
-        install = importlib.get_attr(vm.ctx.new_str("_install"), vm)
+        install = importlib.get_attr(vm.ctx.intern_str("_install"), vm)
         # FIXME
         vm.invoke(install, fn.FuncArgs([vm.sys_module, impmod]))
         return importlib
 
     importlib = vm_.enter_vm(vm, do)
-    vm.import_func = importlib.get_attr(vm.ctx.new_str("__import__"), vm)
+    vm.import_func = importlib.get_attr(vm.ctx.intern_str("__import__"), vm)
 
     if initialize_parameter == vm_.InitParameter.External:
 
@@ -45,23 +45,23 @@ def init_importlib(vm: VirtualMachine, initialize_parameter: vm_.InitParameter)
             import_builtin(vm, "marshal")
 
             install_external = importlib.get_attr(
-                vm.ctx.new_str("_install_external_importers"), vm
+                vm.ctx.intern_str("_install_external_importers"), vm
             )
             vm.invoke(install_external, fn.FuncArgs())
 
             importlib_external = vm.import_(
-                vm.ctx.new_str("_frozen_importlib_external"), None, 0
+                vm.ctx.intern_str("_frozen_importlib_external"), None, 0
             )
             magic_bytes = b""  # TODO: `get_git_revision()[:4]`
             if len(magic_bytes) != 4:
                 magic_bytes = random.randbytes(4)
             magic = vm.ctx.new_bytes(magic_bytes)
-            importlib_external.set_attr(vm.ctx.new_str("MAGIC_NUMBER"), magic, vm)
+            importlib_external.set_attr(vm.ctx.intern_str("MAGIC_NUMBER"), magic, vm)
             try:
-                zipimport = vm.import_(vm.ctx.new_str("zipimport"), None, 0)
-                zipimporter = zipimport.get_attr(vm.ctx.new_str("zipimporter"), vm)
+                zipimport = vm.import_(vm.ctx.intern_str("zipimport"), None, 0)
+                zipimporter = zipimport.get_attr(vm.ctx.intern_str("zipimporter"), vm)
                 path_hooks = pylist.PyList.try_from_object(
-                    vm, vm.sys_module.get_attr(vm.ctx.new_str("path_hooks"), vm)
+                    vm, vm.sys_module.get_attr(vm.ctx.intern_str("path_hooks"), vm)
                 )
                 path_hooks._.insert(0, zipimporter, vm=vm)
             except PyImplBase as _:
@@ -88,7 +88,7 @@ def import_builtin(vm: VirtualMachine, module_name: str) -> PyObjectRef:
             f"Cannot import builtin module {module_name}", vm.ctx.new_str(module_name)
         )
     module = make_module_func(vm)
-    sys_modules = vm.sys_module.get_attr(vm.ctx.new_str("modules"), vm)
+    sys_modules = vm.sys_module.get_attr(vm.ctx.intern_str("modules"), vm)
     sys_modules.set_item(vm.ctx.new_str(module_name), module, vm)
     return module
 
@@ -112,12 +112,12 @@ def import_codeobj(
     set_file_attr: bool,
 ) -> PyObjectRef:
     attrs = vm.ctx.new_dict()
-    attrs._.set_item(vm.ctx.new_str("__name__"), vm.ctx.new_str(module_name), vm)
+    attrs._.set_item(vm.ctx.intern_str("__name__"), vm.ctx.new_str(module_name), vm)
     if set_file_attr:
-        attrs._.set_item(vm.ctx.new_str("__file__"), code_obj.source_path, vm)
+        attrs._.set_item(vm.ctx.intern_str("__file__"), code_obj.source_path, vm)
     module = vm.new_module(module_name, attrs, None)
 
-    vm.sys_module.get_attr(vm.ctx.new_str("modules"), vm).set_item(
+    vm.sys_module.get_attr(vm.ctx.intern_str("modules"), vm).set_item(
         vm.ctx.new_str(module_name), module, vm
     )
 
@@ -0,0 +1,498 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+import operator
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+if TYPE_CHECKING:
+    from vm.builtins.code import PyCode, PyConstant
+    from vm.builtins.pystr import PyStrRef
+    from vm.frame import ExecutingFrame, ExecutionResult
+    from vm.vm import VirtualMachine
+
+import bytecode.bytecode as bytecode
+import bytecode.instruction as instruction
+import vm.frame as vm_frame
+import vm.signal as vm_signal
+
+# A second tier for guest functions: once a code object has been entered
+# `JIT_THRESHOLD` times it is translated into the source of a host function that
+# keeps the value stack in host locals, inlines the specializations the adaptive
+# instructions have settled on (behind the same type guards) and runs everything
+# else by spilling the stack into the frame and calling the instruction. The
+# translated function runs *in* the guest frame, keeping `lasti` up to date
+# wherever the frame can be observed, so tracebacks and the call trampoline see no
+# difference: a call to a guest function spills the stack and returns the
+# `ExecutionResultCall`, and the trampoline re-enters the translation right after
+# the call.
+
+# well above `ADAPTIVE_WARMUP`, so the translation sees settled specializations
+JIT_THRESHOLD = 64
+
+JitCode = Callable[["ExecutingFrame", "VirtualMachine"], Optional["ExecutionResult"]]
+
+# run by spilling the stack into the frame and calling `execute`
+GENERIC = (
+    instruction.ImportName,
+    instruction.ImportNameless,
+    instruction.ImportFrom,
+    instruction.LoadNameAny,
+    instruction.LoadGlobal,
+    instruction.LoadDeref,
+    instruction.LoadClassDeref,
+    instruction.StoreLocal,
+    instruction.StoreGlobal,
+    instruction.StoreDeref,
+    instruction.DeleteFast,
+    instruction.DeleteLocal,
+    instruction.DeleteGlobal,
+    instruction.DeleteDeref,
+    instruction.LoadClosure,
+    instruction.Subscript,
+    instruction.StoreSubscript,
+    instruction.DeleteSubscript,
+    instruction.StoreAttr,
+    instruction.DeleteAttr,
+    instruction.UnaryOperation,
+    instruction.BinaryOperation,
+    instruction.BinaryOperationInplace,
+    instruction.CompareOperation,
+    instruction.Duplicate2,
+    instruction.GetIter,
+    instruction.LoadBuildClass,
+    instruction.BuildString,
+    instruction.BuildTuple,
+    instruction.BuildList,
+    instruction.BuildSet,
+    instruction.BuildMap,
+    instruction.BuildSlice,
+    instruction.ListAppend,
+    instruction.SetAdd,
+    instruction.MapAdd,
+    instruction.MapAddRev,
+    instruction.UnpackSequence,
+    instruction.UnpackEx,
+    instruction.FormatValue,
+    instruction.Reverse,
+    instruction.MakeFunction,
+    instruction.LoadMethod,
+    instruction.Raise,
+) + (
+    # may jump, by setting `lasti`
+    instruction.ForIter,
+    instruction.ForIterSequence,
+    instruction.ForIterRange,
+    instruction.ForIterDict,
+    instruction.JumpIfTrueOrPop,
+    instruction.JumpIfFalseOrPop,
+)
+
+# generic instructions that return an `ExecutionResultCall` for guest callees
+CALLS = (
+    instruction.CallFunctionPositional,
+    instruction.CallFunctionKeyword,
+    instruction.CallFunctionEx,
+    instruction.CallMethodPositional,
+    instruction.CallMethodKeyword,
+    instruction.CallMethodEx,
+)
+
+# translated inline
+INLINE = (
+    instruction.LoadFast,
+    instruction.StoreFast,
+    instruction.LoadConst,
+    instruction.LoadAttr,
+    instruction.Pop,
+    instruction.Duplicate,
+    instruction.Rotate2,
+    instruction.Rotate3,
+    instruction.BinaryOperationSpecialized,
+    instruction.CompareOperationSpecialized,
+    instruction.Jump,
+    instruction.JumpIfTrue,
+    instruction.JumpIfFalse,
+    instruction.JumpIfSpecialized,
+    instruction.Continue,
+    instruction.Break,
+    instruction.ReturnValue,
+)
+
+SUPPORTED = GENERIC + CALLS + INLINE
+
+# run through `execute_generic`, so the translation does not quicken them
+ADAPTIVE = (
+    instruction.BinaryOperation,
+    instruction.BinaryOperationInplace,
+    instruction.CompareOperation,
+    instruction.ForIter,
+)
+JUMP_IF = (
+    instruction.JumpIfTrue,
+    instruction.JumpIfFalse,
+    instruction.JumpIfSpecialized,
+)
+
+OPERATORS: dict[Callable[[Any, Any], Any], str] = {
+    operator.add: "+",
+    operator.sub: "-",
+    operator.mul: "*",
+    operator.truediv: "/",
+    operator.floordiv: "//",
+    operator.mod: "%",
+    operator.and_: "&",
+    operator.or_: "|",
+    operator.xor: "^",
+    operator.eq: "==",
+    operator.ne: "!=",
+    operator.lt: "<",
+    operator.le: "<=",
+    operator.gt: ">",
+    operator.ge: ">=",
+}
+
+
+def run(frame: ExecutingFrame, vm: VirtualMachine) -> Optional[ExecutionResult]:
+    # `None` means the frame goes on in the interpreter, from `frame.lasti`
+    code = frame.code._
+    if code.jit is None:
+        if frame.lasti != 0 or code.jit_failed:
+            return None
+        code.calls += 1
+        if code.calls < JIT_THRESHOLD:
+            return None
+        code.jit = compile_code(code, vm)
+        if code.jit is None:
+            code.jit_failed = True
+            return None
+    return code.jit(frame, vm)
+
+
+def compile_code(code: PyCode, vm: VirtualMachine) -> Optional[JitCode]:
+    translator = Translator(code.code, vm)
+    if not translator.analyze():
+        return None
+    source = translator.translate()
+    name = f"jit_{code.code.obj_name._.as_str()}"
+    namespace = translator.namespace
+    exec(compile(source, f"<jit {name}>", "exec"), namespace)
+    return namespace["jitted"]
+
+
+def jumps_if(instr: instruction.Instruction) -> bool:
+    if isinstance(instr, instruction.JumpIfSpecialized):
+        return instr.jump_if
+    return isinstance(instr, instruction.JumpIfTrue)
+
+
+def unfused(instr: instruction.Instruction) -> instruction.Instruction:
+    # the second half of a superinstruction is translated on its own
+    if isinstance(instr, instruction.Superinstruction):
+        return instr.first
+    return instr
+
+
+@dataclass
+class Translator:
+    code: bytecode.CodeObject[PyConstant, PyStrRef]
+    vm: VirtualMachine
+    namespace: dict[str, Any] = field(default_factory=dict)
+    lines: list[str] = field(default_factory=list)
+    # stack depth before each reachable instruction
+    depths: list[Optional[int]] = field(default_factory=list)
+    # first instructions of the basic blocks
+    leaders: set[int] = field(default_factory=set)
+    # where the trampoline can re-enter the translation
+    entries: set[int] = field(default_factory=set)
+
+    def analyze(self) -> bool:
+        code = self.code
+        flags = code.flags
+        if (
+            bytecode.CodeFlags.IS_GENERATOR in flags
+            or bytecode.CodeFlags.IS_COROUTINE in flags
+        ):
+            return False
+        # try blocks are left to the interpreter; loops only matter to `break`
+        for entry in code.exception_table:
+            for handler in entry.handlers:
+                if handler.kind is not bytecode.HandlerKind.LOOP:
+                    return False
+        instrs = [unfused(instr) for instr in code.instructions]
+        if not all(isinstance(instr, SUPPORTED) for instr in instrs):
+            return False
+
+        self.depths = [None] * len(instrs)
+        self.leaders = {0}
+        self.entries = {0}
+        todo = [(0, 0)]
+        while todo:
+            idx, depth = todo.pop()
+            if idx >= len(instrs):
+                return False
+            if self.depths[idx] is not None:
+                if self.depths[idx] != depth:
+                    return False
+                continue
+            self.depths[idx] = depth
+            for target, target_depth in self.successors(idx, instrs[idx], depth):
+                todo.append((target, target_depth))
+        return True
+
+    def successors(
+        self, idx: int, instr: instruction.Instruction, depth: int
+    ) -> list[tuple[int, int]]:
+        after = depth + instr.stack_effect(False)
+        if isinstance(instr, (instruction.ReturnValue, instruction.Raise)):
+            self.leaders.add(idx + 1)
+            return []
+        elif isinstance(instr, instruction.Break):
+            handler = self.loop_handler(idx)
+            self.leaders.update((idx + 1, handler.target.value))
+            return [(handler.target.value, handler.level)]
+        elif isinstance(instr, (instruction.Jump, instruction.Continue)):
+            self.leaders.update((idx + 1, instr.target.value))
+            return [(instr.target.value, depth)]
+        elif isinstance(instr, instruction.LabelArgMixin):
+            target = instr.get_label().value
+            self.leaders.update((idx + 1, target))
+            return [(idx + 1, after), (target, depth + instr.stack_effect(True))]
+        elif isinstance(instr, CALLS):
+            self.leaders.add(idx + 1)
+            self.entries.add(idx + 1)
+        return [(idx + 1, after)]
+
+    def loop_handler(self, idx: int) -> bytecode.ExceptionHandler:
+        handlers = self.code.exception_handlers(idx)
+        assert handlers and handlers[-1].kind is bytecode.HandlerKind.LOOP
+        return handlers[-1]
+
+    def bind(self, name: str, idx: int, value: Any) -> str:
+        key = f"{name}{idx}"
+        self.namespace[key] = value
+        return key
+
+    def emit(self, indent: int, line: str) -> None:
+        self.lines.append("    " * indent + line)
+
+    def translate(self) -> str:
+        ctx = self.vm.ctx
+        self.namespace.update(
+            TRUE=ctx.true_value,
+            FALSE=ctx.false_value,
+            RETURN=vm_frame.ExecutionResultReturn,
+            signal=vm_signal,
+        )
+        self.emit(0, "def jitted(frame, vm):")
+        self.emit(1, "st = frame.stack")
+        self.emit(1, "fl = frame.fastlocals")
+        self.emit(1, "pc = frame.lasti")
+        keyword = "if"
+        for idx in sorted(self.entries):
+            depth = self.depths[idx]
+            if depth is None:
+                continue
+            self.emit(1, f"{keyword} pc == {idx}:")
+            self.emit(2, "pass")
+            self.reload(2, depth)
+            keyword = "elif"
+        self.emit(1, "else:")
+        self.emit(2, "return None")
+
+        self.emit(1, "while 1:")
+        keyword = "if"
+        n = len(self.code.instructions)
+        leaders = sorted(
+            i for i in self.leaders if i < n and self.depths[i] is not None
+        )
+        for start, end in zip(leaders, leaders[1:] + [n]):
+            self.emit(2, f"{keyword} pc == {start}:")
+            keyword = "elif"
+            self.translate_block(start, end)
+        self.emit(2, "else:")
+        self.emit(3, "assert False, pc")
+        return "\n".join(self.lines) + "\n"
+
+    def translate_block(self, start: int, end: int) -> None:
+        idx = start
+        while idx < end:
+            instr = unfused(self.code.instructions[idx])
+            depth = self.depths[idx]
+            assert depth is not None
+            next_idx = self.translate_instruction(idx, instr, depth, end)
+            if next_idx is None:
+                return
+            idx = next_idx
+        # falls through into the next block
+        self.emit(3, f"pc = {end}")
+
+    def translate_instruction(
+        self, idx: int, instr: instruction.Instruction, d: int, end: int
+    ) -> Optional[int]:
+        # returns the index to go on from, `None` when the block ends here
+        s = [f"s{i}" for i in range(d + 2)]
+        if isinstance(instr, instruction.LoadFast):
+            self.emit(3, f"{s[d]} = fl[{instr.idx}]")
+            self.emit(3, f"if {s[d]} is None:")
+            # raises the UnboundLocalError
+            self.generic(4, idx, instr.execute, d, d + 1)
+        elif isinstance(instr, instruction.StoreFast):
+            self.emit(3, f"fl[{instr.idx}] = {s[d - 1]}")
+        elif isinstance(instr, instruction.LoadConst):
+            const = self.bind("K", idx, self.code.constants[instr.idx].value)
+            self.emit(3, f"{s[d]} = {const}")
+        elif isinstance(instr, instruction.LoadAttr):
+            cache = self.bind("C", idx, instr.cache)
+            self.emit(3, f"frame.lasti = {idx + 1}")
+            self.emit(
+                3,
+                f"{s[d - 1]} = frame.get_attr_cached(vm, {s[d - 1]}, "
+                f"{instr.idx}, {cache})",
+            )
+        elif isinstance(instr, instruction.Pop):
+            pass
+        elif isinstance(instr, instruction.Duplicate):
+            self.emit(3, f"{s[d]} = {s[d - 1]}")
+        elif isinstance(instr, instruction.Rotate2):
+            self.emit(3, f"{s[d - 2]}, {s[d - 1]} = {s[d - 1]}, {s[d - 2]}")
+        elif isinstance(instr, instruction.Rotate3):
+            self.emit(
+                3,
+                f"{s[d - 3]}, {s[d - 2]}, {s[d - 1]} = "
+                f"{s[d - 1]}, {s[d - 3]}, {s[d - 2]}",
+            )
+        elif isinstance(instr, instruction.BinaryOperationSpecialized):
+            self.binop(idx, instr, d)
+        elif isinstance(instr, instruction.CompareOperationSpecialized):
+            return self.compare(idx, instr, d, end)
+        elif isinstance(instr, instruction.Jump):
+            self.jump(3, idx, instr.target.value)
+            return None
+        elif isinstance(instr, instruction.Continue):
+            self.jump(3, idx, instr.target.value)
+            return None
+        elif isinstance(instr, instruction.Break):
+            self.jump(3, idx, self.loop_handler(idx).target.value)
+            return None
+        elif isinstance(instr, JUMP_IF):
+            self.truth(3, idx, s[d - 1])
+            self.emit(3, "if t:" if jumps_if(instr) else "if not t:")
+            self.jump(4, idx, instr.target.value)
+        elif isinstance(instr, instruction.ReturnValue):
+            self.emit(3, "frame.truncate(0)")
+            self.emit(3, f"return RETURN({s[d - 1]})")
+            return None
+        else:
+            execute = (
+                instr.execute_generic if isinstance(instr, ADAPTIVE) else instr.execute
+            )
+            after = d + instr.stack_effect(False)
+            self.generic(3, idx, execute, d, after, instr)
+            if isinstance(instr, instruction.Raise):
+                return None
+        return idx + 1
+
+    def generic(
+        self,
+        indent: int,
+        idx: int,
+        execute: Callable[..., Any],
+        d: int,
+        after: int,
+        instr: Optional[instruction.Instruction] = None,
+    ) -> None:
+        func = self.bind("X", idx, execute)
+        self.emit(indent, f"frame.lasti = {idx + 1}")
+        self.spill(indent, d)
+        if isinstance(instr, CALLS):
+            self.emit(indent, f"r = {func}(frame, vm)")
+            self.emit(indent, "if r is not None:")
+            self.emit(indent + 1, "return r")
+        else:
+            self.emit(indent, f"{func}(frame, vm)")
+        if instr is not None and isinstance(instr, instruction.LabelArgMixin):
+            target = instr.get_label().value
+            self.emit(indent, f"if frame.lasti != {idx + 1}:")
+            self.reload(indent + 1, d + instr.stack_effect(True))
+            self.emit(indent + 1, f"pc = {target}")
+            self.emit(indent + 1, "continue")
+        self.reload(indent, after)
+
+    def spill(self, indent: int, depth: int) -> None:
+        for i in range(depth):
+            self.emit(indent, f"st[{i}] = s{i}")
+        # an earlier spill may have left values above `depth`
+        self.emit(indent, f"frame.truncate({depth})")
+
+    def reload(self, indent: int, depth: int) -> None:
+        for i in range(depth):
+            self.emit(indent, f"s{i} = st[{i}]")
+
+    def jump(self, indent: int, idx: int, target: int) -> None:
+        if target <= idx:
+            self.emit(indent, "if signal.EVAL_BREAKER:")
+            self.emit(indent + 1, f"frame.lasti = {idx + 1}")
+            self.emit(indent + 1, "signal.handle_eval_breaker(vm)")
+        self.emit(indent, f"pc = {target}")
+        self.emit(indent, "continue")
+
+    def truth(self, indent: int, idx: int, value: str) -> None:
+        # sets `t` to the truth of `value`
+        self.emit(indent, f"if {value} is TRUE:")
+        self.emit(indent + 1, "t = True")
+        self.emit(indent, f"elif {value} is FALSE:")
+        self.emit(indent + 1, "t = False")
+        self.emit(indent, "else:")
+        self.emit(indent + 1, f"frame.lasti = {idx + 1}")
+        self.emit(indent + 1, f"t = {value}.try_to_bool(vm)")
+
+    def guard(self, idx: int, guard: Any, a: str, b: str) -> str:
+        cls = self.bind("G", idx, guard)
+        return f"{a}.type.payload is {cls} and {b}.type.payload is {cls}"
+
+    def binop(
+        self, idx: int, instr: instruction.BinaryOperationSpecialized, d: int
+    ) -> None:
+        a, b = f"s{d - 2}", f"s{d - 1}"
+        cond = self.guard(idx, instr.guard, a, b)
+        if instr.nonzero:
+            cond += f" and {b}.payload.value"
+        box = self.bind("B", idx, instr.box)
+        if (symbol := OPERATORS.get(instr.func)) is not None:
+            result = f"{box}({a}.payload.value {symbol} {b}.payload.value)"
+        else:
+            func = self.bind("F", idx, instr.func)
+            result = f"{box}({func}({a}.payload.value, {b}.payload.value))"
+        self.emit(3, f"if {cond}:")
+        self.emit(4, f"{a} = {result}")
+        self.emit(3, "else:")
+        self.generic(4, idx, instr.generic.execute_generic, d, d - 1)
+
+    def compare(
+        self,
+        idx: int,
+        instr: instruction.CompareOperationSpecialized,
+        d: int,
+        end: int,
+    ) -> Optional[int]:
+        a, b = f"s{d - 2}", f"s{d - 1}"
+        cond = self.guard(idx, instr.guard, a, b)
+        symbol = OPERATORS[instr.func]
+        jump = None
+        if idx + 1 < end:
+            jump = unfused(self.code.instructions[idx + 1])
+        compared = f"{a}.payload.value {symbol} {b}.payload.value"
+        if not isinstance(jump, JUMP_IF):
+            self.emit(3, f"if {cond}:")
+            self.emit(4, f"{a} = TRUE if {compared} else FALSE")
+            self.emit(3, "else:")
+            self.generic(4, idx, instr.generic.execute_generic, d, d - 1)
+            return idx + 1
+        # branch on the comparison without boxing it
+        self.emit(3, f"if {cond}:")
+        self.emit(4, f"t = {compared}")
+        self.emit(3, "else:")
+        self.generic(4, idx, instr.generic.execute_generic, d, d - 1)
+        self.truth(4, idx + 1, a)
+        self.emit(3, "if t:" if jumps_if(jump) else "if not t:")
+        self.jump(4, idx + 1, jump.target.value)
+        return idx + 2
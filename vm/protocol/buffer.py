@@ -24,7 +24,7 @@ class PyBuffer:
     @staticmethod
     def try_from_borrowed_object(vm: VirtualMachine, obj: PyObjectRef) -> PyBuffer:
         cls = obj.class_()
-        if (f := cls._.mro_find_map(lambda c: c.slots.as_buffer)) is not None:
+        if (f := cls._.effective_slots.as_buffer) is not None:
             return f(obj, vm)
         vm.new_type_error(f"a bytes-like object is required, not '{cls._.name()}'")
 
@@ -1,7 +1,19 @@
 from __future__ import annotations
+import enum
 from dataclasses import dataclass
 from operator import length_hint
-from typing import TYPE_CHECKING, Callable, Generic, Iterator, Optional, Type, TypeVar
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Final,
+    Generic,
+    Iterator,
+    Literal,
+    Optional,
+    Type,
+    TypeVar,
+    Union,
+)
 from common.error import PyImplBase, PyImplException, PyImplError
 
 if TYPE_CHECKING:
@@ -15,6 +27,38 @@ import vm.builtins.iter as pyiter
 TR = TypeVar("TR", bound="PyRef")
 
 
+class IterExhausted(enum.Enum):
+    # what `iternext_fast` slots return once the iterator is exhausted. unlike
+    # `PyIterReturn` nothing is allocated per step, but the value of the
+    # `StopIteration` is lost, so `yield from` and `next()` keep using `iternext`
+    ITER_EXHAUSTED = enum.auto()
+
+
+Exhausted = Literal[IterExhausted.ITER_EXHAUSTED]
+
+ITER_EXHAUSTED: Final[Exhausted] = IterExhausted.ITER_EXHAUSTED
+
+IterNext = Union["PyObjectRef", Exhausted]
+
+
+def next_fast(obj: PyObjectRef, vm: VirtualMachine) -> IterNext:
+    iternext = obj.class_()._.effective_slots.iternext_fast
+    if iternext is None:
+        vm.new_type_error(f"'{obj.class_()._.name()}' object is not an iterator")
+    return iternext(obj, vm)
+
+
+def next_fast_from_pyresult(
+    result: Callable[[], PyObjectRef], vm: VirtualMachine
+) -> IterNext:
+    try:
+        return result()
+    except PyImplException as err:
+        if err.exception.isinstance(vm.ctx.exceptions.stop_iteration):
+            return ITER_EXHAUSTED
+        raise
+
+
 @dataclass
 class PyIter(Generic[TR]):
     value: PyObjectRef
@@ -29,16 +73,19 @@ class PyIter(Generic[TR]):
 
     @staticmethod
     def check(obj: PyObjectRef) -> bool:
-        return obj.class_()._.mro_find_map(lambda x: x.slots.iternext) is not None
+        return obj.class_()._.effective_slots.iternext is not None
 
     def next(self, vm: VirtualMachine) -> PyIterReturn[TR]:
-        iternext = self.value.class_()._.mro_find_map(lambda x: x.slots.iternext)
+        iternext = self.value.class_()._.effective_slots.iternext
         if iternext is None:
             vm.new_type_error(
                 f"'{self.value.class_()._.name()}' object is not an iterator"
             )
         return iternext(self.value, vm)
 
+    def next_fast(self, vm: VirtualMachine) -> IterNext:
+        return next_fast(self.value, vm)
+
     def iter(self, vm: VirtualMachine) -> PyIterIter[TR]:
         length_hint = vm.length_hint_opt(self.as_ref())
         return PyIterIter.new(vm, self.value, length_hint, self.t)
@@ -57,7 +104,7 @@ class PyIter(Generic[TR]):
 
     @staticmethod
     def try_from_object(vm: VirtualMachine, obj: PyObjectRef) -> PyIter:
-        getiter = obj.class_()._.mro_find_map(lambda x: x.slots.iter)
+        getiter = obj.class_()._.effective_slots.iter
         if getiter is not None:
             iter = getiter(obj, vm)
             if PyIter.check(iter):
@@ -87,6 +134,21 @@ class PyIterReturn(Generic[TR]):
                 return PyIterReturnStopIteration(err.exception._.get_arg(0))
             raise
 
+    @staticmethod
+    def from_fast(r: IterNext) -> PyIterReturn:
+        if r is ITER_EXHAUSTED:
+            return PyIterReturnStopIteration(None)
+        else:
+            return PyIterReturnReturn(r)
+
+    def into_fast(self) -> IterNext:
+        if isinstance(self, PyIterReturnReturn):
+            return self.value
+        elif isinstance(self, PyIterReturnStopIteration):
+            return ITER_EXHAUSTED
+        else:
+            assert False
+
     @staticmethod
     def from_option(opt: Optional[PyObjectRef]) -> PyIterReturn:
         if opt is None:
@@ -155,18 +217,13 @@ class PyIterIter(Generic[TR]):
 
     def __next__(self) -> TR:
         try:
-            iret = PyIter.new(self.obj, self.t).next(self.vm)
+            x = next_fast(self.obj, self.vm)
         except PyImplBase as e:
-            x = None
-        else:
-            if isinstance(iret, PyIterReturnReturn):
-                x = iret.value
-            else:
-                x = None
-        if x is None:
+            x = ITER_EXHAUSTED
+        if x is ITER_EXHAUSTED:
             raise StopIteration
         if self.t is None:
-            return x
+            return x  # type: ignore
         return self.t.try_from_object(self.vm, x)  # type: ignore
 
     # def size_hint(self) -> tuple[int, Optional[int]]:
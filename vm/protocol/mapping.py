@@ -1,6 +1,7 @@
 from __future__ import annotations
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, Callable, Optional
+from common.error import PyImplException
 
 if TYPE_CHECKING:
     from vm.function_ import FuncArgs
@@ -21,6 +22,10 @@ class PyMappingMethods:
     ass_subscript: Optional[
         Callable[[PyMapping, PyObject, Optional[PyObjectRef], VirtualMachine], None]
     ] = None
+    # returns `None` instead of raising a KeyError on a miss
+    subscript_opt: Optional[
+        Callable[[PyMapping, PyObject, VirtualMachine], Optional[PyObjectRef]]
+    ] = None
 
 
 @dataclass
@@ -53,9 +58,7 @@ class PyMapping:
     def methods_(self, vm: VirtualMachine) -> PyMappingMethods:
         if self.methods is not None:
             return self.methods
-        if (
-            f := self.obj.class_()._.mro_find_map(lambda cls: cls.slots.as_mapping)
-        ) is not None:
+        if (f := self.obj.class_()._.effective_slots.as_mapping) is not None:
             self.methods = f(self.obj, vm)
         else:
             self.methods = PyMappingMethods()
@@ -82,6 +85,18 @@ class PyMapping:
             vm.new_type_error(f"{self.obj.class_()} is not a mapping")
         return f(self, needle, vm)
 
+    def subscript_opt(
+        self, needle: PyObject, vm: VirtualMachine
+    ) -> Optional[PyObjectRef]:
+        if (f := self.methods_(vm).subscript_opt) is not None:
+            return f(self, needle, vm)
+        try:
+            return self.subscript_(needle, vm)
+        except PyImplException as e:
+            if e.exception.isinstance(vm.ctx.exceptions.key_error):
+                return None
+            raise
+
     def ass_subscript_(
         self, needle: PyObject, value: Optional[PyObjectRef], vm: VirtualMachine
     ) -> None:
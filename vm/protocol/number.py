@@ -0,0 +1,133 @@
+from __future__ import annotations
+import dataclasses
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Optional
+
+if TYPE_CHECKING:
+    from vm.pyobjectrc import PyObject, PyObjectRef
+    from vm.vm import VirtualMachine
+
+
+# `(a, b, vm)`; called for either operand, returns `NotImplemented` when unsupported
+PyNumberBinaryFunc = Callable[["PyObject", "PyObject", "VirtualMachine"], "PyObjectRef"]
+PyNumberUnaryFunc = Callable[["PyObject", "VirtualMachine"], "PyObjectRef"]
+PyNumberBoolFunc = Callable[["PyObject", "VirtualMachine"], bool]
+
+
+@dataclass
+class PyNumberMethods:
+    add: Optional[PyNumberBinaryFunc] = None
+    subtract: Optional[PyNumberBinaryFunc] = None
+    multiply: Optional[PyNumberBinaryFunc] = None
+    remainder: Optional[PyNumberBinaryFunc] = None
+    divmod: Optional[PyNumberBinaryFunc] = None
+    power: Optional[PyNumberBinaryFunc] = None
+    negative: Optional[PyNumberUnaryFunc] = None
+    positive: Optional[PyNumberUnaryFunc] = None
+    absolute: Optional[PyNumberUnaryFunc] = None
+    boolean: Optional[PyNumberBoolFunc] = None
+    invert: Optional[PyNumberUnaryFunc] = None
+    lshift: Optional[PyNumberBinaryFunc] = None
+    rshift: Optional[PyNumberBinaryFunc] = None
+    and_: Optional[PyNumberBinaryFunc] = None
+    xor: Optional[PyNumberBinaryFunc] = None
+    or_: Optional[PyNumberBinaryFunc] = None
+    int: Optional[PyNumberUnaryFunc] = None
+    float: Optional[PyNumberUnaryFunc] = None
+
+    inplace_add: Optional[PyNumberBinaryFunc] = None
+    inplace_subtract: Optional[PyNumberBinaryFunc] = None
+    inplace_multiply: Optional[PyNumberBinaryFunc] = None
+    inplace_remainder: Optional[PyNumberBinaryFunc] = None
+    inplace_power: Optional[PyNumberBinaryFunc] = None
+    inplace_lshift: Optional[PyNumberBinaryFunc] = None
+    inplace_rshift: Optional[PyNumberBinaryFunc] = None
+    inplace_and: Optional[PyNumberBinaryFunc] = None
+    inplace_xor: Optional[PyNumberBinaryFunc] = None
+    inplace_or: Optional[PyNumberBinaryFunc] = None
+
+    floor_divide: Optional[PyNumberBinaryFunc] = None
+    true_divide: Optional[PyNumberBinaryFunc] = None
+    inplace_floor_divide: Optional[PyNumberBinaryFunc] = None
+    inplace_true_divide: Optional[PyNumberBinaryFunc] = None
+
+    index: Optional[PyNumberUnaryFunc] = None
+
+    matrix_multiply: Optional[PyNumberBinaryFunc] = None
+    inplace_matrix_multiply: Optional[PyNumberBinaryFunc] = None
+
+    def inherit(self, bases: list[PyNumberMethods]) -> PyNumberMethods:
+        "fills the missing slots from `bases`, in mro order"
+        r = dataclasses.replace(self)
+        for f in NUMBER_SLOTS:
+            if getattr(r, f) is not None:
+                continue
+            for base in bases:
+                if (value := getattr(base, f)) is not None:
+                    setattr(r, f, value)
+                    break
+        return r
+
+
+NUMBER_SLOTS = tuple(f.name for f in dataclasses.fields(PyNumberMethods))
+
+# slot -> (method, reflected method)
+BINARY_SLOTS = {
+    "add": ("__add__", "__radd__"),
+    "subtract": ("__sub__", "__rsub__"),
+    "multiply": ("__mul__", "__rmul__"),
+    "remainder": ("__mod__", "__rmod__"),
+    "divmod": ("__divmod__", "__rdivmod__"),
+    "power": ("__pow__", "__rpow__"),
+    "lshift": ("__lshift__", "__rlshift__"),
+    "rshift": ("__rshift__", "__rrshift__"),
+    "and_": ("__and__", "__rand__"),
+    "xor": ("__xor__", "__rxor__"),
+    "or_": ("__or__", "__ror__"),
+    "floor_divide": ("__floordiv__", "__rfloordiv__"),
+    "true_divide": ("__truediv__", "__rtruediv__"),
+    "matrix_multiply": ("__matmul__", "__rmatmul__"),
+}
+
+# slot -> method
+INPLACE_SLOTS = {
+    "inplace_add": "__iadd__",
+    "inplace_subtract": "__isub__",
+    "inplace_multiply": "__imul__",
+    "inplace_remainder": "__imod__",
+    "inplace_power": "__ipow__",
+    "inplace_lshift": "__ilshift__",
+    "inplace_rshift": "__irshift__",
+    "inplace_and": "__iand__",
+    "inplace_xor": "__ixor__",
+    "inplace_or": "__ior__",
+    "inplace_floor_divide": "__ifloordiv__",
+    "inplace_true_divide": "__itruediv__",
+    "inplace_matrix_multiply": "__imatmul__",
+}
+
+# binary slot -> inplace slot
+INPLACE_OF = {
+    name: f"inplace_{name.removesuffix('_')}"
+    for name in BINARY_SLOTS
+    if name != "divmod"
+}
+
+# slot -> method
+UNARY_SLOTS = {
+    "negative": "__neg__",
+    "positive": "__pos__",
+    "absolute": "__abs__",
+    "invert": "__invert__",
+    "int": "__int__",
+    "float": "__float__",
+    "index": "__index__",
+}
+
+# method -> slot, for every method that fills a number slot
+METHOD_TO_SLOT = {
+    **{m: s for s, ms in BINARY_SLOTS.items() for m in ms},
+    **{m: s for s, m in INPLACE_SLOTS.items()},
+    **{m: s for s, m in UNARY_SLOTS.items()},
+    "__bool__": "boolean",
+}
@@ -60,7 +60,7 @@ class PySequence:
     def methods_(self, vm: VirtualMachine) -> PySequenceMethods:
         cls = self.obj.class_()
         if not cls.is_(vm.ctx.types.dict_type):
-            f = cls._.mro_find_map(lambda x: x.slots.as_sequence)
+            f = cls._.effective_slots.as_sequence
             if f is not None:
                 self.methods = f(self.obj, vm)
                 return self.methods
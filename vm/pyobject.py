@@ -18,7 +18,6 @@ from typing import (
     Type,
     TypeVar,
 )
-from common import to_opt
 
 
 if TYPE_CHECKING:
@@ -44,6 +43,7 @@ if TYPE_CHECKING:
     from vm.builtins.tuple import PyTuple, PyTupleRef
     from vm.exceptions import ExceptionZoo, PyBaseException
     from vm.function_ import FuncArgs, PyNativeFunc
+    from vm.protocol.number import PyNumberMethods
     from vm.pyobjectrc import PyObject, PyObjectRef, PyRef
     from vm.types.slot import PyTypeFlags, PyTypeSlots
     from vm.types.zoo import TypeZoo
@@ -60,6 +60,7 @@ from common.deco import (
     MethodData,
     PropertyData,
     PropertyDescriptorType,
+    TypeProxy,
     primitive_to_pyobject,
 )
 from common.hash import PyHash
@@ -112,7 +113,9 @@ class PyContext:
     types: TypeZoo
     exceptions: ExceptionZoo
     int_cache_pool: list[PyIntRef]
-    string_cache: Any  # FIXME
+    # interned strings: identifiers share one `PyStr`, so dict lookups with them
+    # succeed on identity
+    string_cache: dict[str, PyRef[PyStr]]
     slot_new_wrapper: PyObjectRef
 
     CONTEXT: ClassVar[Optional[PyContext]] = None
@@ -166,7 +169,7 @@ class PyContext:
             pyset.PyFrozenSet.default(), types.frozenset_type, None
         )
 
-        string_cache: dict = {}
+        string_cache: dict[str, prc.PyRef[pystr.PyStr]] = {}
 
         new_str: prc.PyRef[pystr.PyStr] = prc.PyRef.new_ref(
             pystr.PyStr("__new__"), types.str_type, None
@@ -260,6 +263,11 @@ class PyContext:
 
         return pystr.PyStr.from_str(s, self)
 
+    def intern_str(self, s: str) -> PyRef[PyStr]:
+        if (r := self.string_cache.get(s)) is None:
+            r = self.string_cache[s] = self.new_str(s)
+        return r
+
     # TODO: move
     def new_complex(self, c: complex) -> PyRef[PyComplex]:
         import vm.builtins.complex as pycomplex
@@ -495,9 +503,15 @@ def pyimpl(
                 elif data.name == "call":
                     assert impl.slots.call is None
                     impl.slots.call = method
+                elif data.name == "vectorcall":
+                    assert impl.slots.vectorcall is None
+                    impl.slots.vectorcall = method
                 elif data.name == "getattro":
                     assert impl.slots.getattro is None
                     impl.slots.getattro = method
+                elif data.name == "getattro_opt":
+                    assert impl.slots.getattro_opt is None
+                    impl.slots.getattro_opt = method
                 elif data.name == "setattro":
                     assert impl.slots.setattro is None
                     impl.slots.setattro = method
@@ -513,6 +527,9 @@ def pyimpl(
                 elif data.name == "iternext":
                     assert impl.slots.iternext is None
                     impl.slots.iternext = method
+                elif data.name == "iternext_fast":
+                    assert impl.slots.iternext_fast is None
+                    impl.slots.iternext_fast = method
                 elif data.name == "descr_get":
                     assert impl.slots.descr_get is None
                     impl.slots.descr_get = method
@@ -702,40 +719,103 @@ def make_method(method: MethodData) -> PyNativeFunc:
                 f"first arg is '{first_arg}' in method '{method.name}' [{method.method}]"
             )
 
-    def func(vm: VirtualMachine, fargs: FuncArgs) -> PyObjectRef:
-        # TODO: catch & handle exceptions
+    f = method.method
+    binder = method.binder
+    if binder is None:
 
-        first_arg = []
-        if get_self_arg is not None:
-            first_arg.append(get_self_arg(fargs.args[0]))
-
-        if method.casts is not None:
-            assert "vm" not in fargs.kwargs
-            # print([x.class_()._.name() for x in fargs.args], fargs.kwargs.keys(), sig)
-            bs = sig.bind(*fargs.args, **fargs.kwargs, vm=vm)
-            res = method.method(
-                *first_arg,
-                *[
-                    method.casts[n](vm, v) if method.casts is not None else v
-                    for n, v in list(zip(bs.arguments, fargs.args))[
-                        bool(get_self_arg) :
-                    ]
-                ],
-                **{
-                    k: method.casts[k](vm, v) if method.casts is not None else v
-                    for k, v in fargs.kwargs.items()
-                },
-                vm=vm,
-            )
-        else:
+        def func(vm: VirtualMachine, fargs: FuncArgs) -> PyObjectRef:
+            first_arg = []
+            if get_self_arg is not None:
+                first_arg.append(get_self_arg(fargs.args[0]))
             fargs.args.pop(0)
+            return primitive_to_pyobject(f(*first_arg, fargs, vm=vm), vm)
+
+    elif get_self_arg is None:
 
-            res = method.method(*first_arg, fargs, vm=vm)
-        return primitive_to_pyobject(res, vm)
+        def func(vm: VirtualMachine, fargs: FuncArgs) -> PyObjectRef:
+            args, kwargs = binder.bind(vm, fargs.args, fargs.kwargs)
+            return primitive_to_pyobject(f(*args, **kwargs), vm)
+
+    else:
+
+        def func(vm: VirtualMachine, fargs: FuncArgs) -> PyObjectRef:
+            args, kwargs = binder.bind(vm, fargs.args, fargs.kwargs)
+            args[0] = get_self_arg(args[0])
+            return primitive_to_pyobject(f(*args, **kwargs), vm)
 
     return func
 
 
+# the cast `make_cast` uses for `PyObjectRef` arguments
+PASSTHROUGH_CAST = TypeProxy("PyRef", module="", typ=None, is_optional=False)
+
+
+def make_slot_method(method: MethodData) -> Callable[..., PyObjectRef]:
+    # like `make_method`, but takes `(vm, zelf, *args)` without building `FuncArgs`
+    import vm.function_ as fn
+
+    sig = inspect.signature(method.method)
+    params = [n for n in sig.parameters if n != "vm"]
+    if method.casts is None:
+        native = make_method(method)
+        return lambda vm, zelf, *args: native(vm, fn.FuncArgs([zelf, *args]))
+
+    get_self_arg = (lambda x: x._) if params[0] == "self" else (lambda x: x)
+    casts = [method.casts[n] for n in params[1:]]
+    f = method.method
+    if all(getattr(c, "__self__", None) == PASSTHROUGH_CAST for c in casts):
+
+        def func(vm: VirtualMachine, zelf: PyObject, *args: PyObject) -> PyObjectRef:
+            return primitive_to_pyobject(f(get_self_arg(zelf), *args, vm=vm), vm)
+
+    else:
+
+        def func(vm: VirtualMachine, zelf: PyObject, *args: PyObject) -> PyObjectRef:
+            args_ = [c(vm, a) for c, a in zip(casts, args)]
+            return primitive_to_pyobject(f(get_self_arg(zelf), *args_, vm=vm), vm)
+
+    return func
+
+
+def make_number_methods(methods: dict[str, MethodData]) -> PyNumberMethods:
+    import vm.protocol.number as number
+
+    r = number.PyNumberMethods()
+    for name, (method, rmethod) in number.BINARY_SLOTS.items():
+        if method in methods or rmethod in methods:
+            setattr(r, name, make_number_binary(name, methods, method, rmethod))
+    for name, method in number.INPLACE_SLOTS.items():
+        if method in methods:
+            f = make_slot_method(methods[method])
+            setattr(r, name, lambda a, b, vm, f=f: f(vm, a, b))
+    for name, method in number.UNARY_SLOTS.items():
+        if method in methods:
+            f = make_slot_method(methods[method])
+            setattr(r, name, lambda a, vm, f=f: f(vm, a))
+    if "__bool__" in methods:
+        f = make_slot_method(methods["__bool__"])
+        r.boolean = lambda a, vm: prc.bool_get_value(f(vm, a))
+    return r
+
+
+def make_number_binary(
+    name: str, methods: dict[str, MethodData], method: str, rmethod: str
+) -> Callable[[PyObject, PyObject, VirtualMachine], PyObjectRef]:
+    left = make_slot_method(methods[method]) if method in methods else None
+    right = make_slot_method(methods[rmethod]) if rmethod in methods else None
+
+    def slot(a: PyObject, b: PyObject, vm: VirtualMachine) -> PyObjectRef:
+        # called for either operand, `a` is `self` iff the slot comes from its type
+        if getattr(a.class_()._.effective_slots.as_number, name) is slot:
+            if left is not None:
+                return left(vm, a, b)
+        elif right is not None:
+            return right(vm, b, a)
+        return vm.ctx.get_not_implemented()
+
+    return slot
+
+
 class PyModuleImpl:
     @classmethod
     def extend_module(cls, vm: VirtualMachine, module: PyObject) -> None:
@@ -751,7 +831,7 @@ class PyModuleImpl:
                 .with_module(module)
                 .into_ref(vm.ctx)
             )
-            vm.module_set_attr(module, vm.mk_str(name), new_func)
+            vm.module_set_attr(module, vm.ctx.intern_str(name), new_func)
         # TODO: impl other kinds of module attributes
 
         pyattrs = getattr(cls, "pyattrs", None)
@@ -839,6 +919,8 @@ class PyClassImpl(PyClassDef, StaticTypeMixin, PyValueMixin, TryFromObjectMixin)
 
         class_._.slots = cls.pyimpl_at.slots
         class_._.slots.flags = cls.TP_FLAGS
+        class_._.slots.as_number = make_number_methods(cls.pyimpl_at.methods)
+        class_._.slots_changed()
 
     @classmethod
     def extend_class(cls, ctx: PyContext, class_: PyTypeRef) -> None:
@@ -937,7 +1019,7 @@ class PyMethod(ABC):
     @staticmethod
     def get(obj: PyObjectRef, name: PyStrRef, vm: VirtualMachine) -> PyMethod:
         cls = obj.class_()
-        getattro = cls._.mro_find_map(lambda cls: cls.slots.getattro)
+        getattro = cls._.effective_slots.getattro
         assert getattro is not None, cls._.name()
         # TODO:
         # if getattro as usize != object::PyBaseObject::getattro as usize {
@@ -956,12 +1038,9 @@ class PyMethod(ABC):
                 is_method = True
                 descr_get = None
             else:
-                descr_get = descr_cls._.mro_find_map(lambda cls: cls.slots.descr_get)
+                descr_get = descr_cls._.effective_slots.descr_get
                 if descr_get is not None:
-                    if (
-                        descr_cls._.mro_find_map(lambda cls: cls.slots.descr_set)
-                        is not None
-                    ):
+                    if descr_cls._.effective_slots.descr_set is not None:
                         return PyMethodAttribute(
                             descr_get(descr, obj, cls.into_pyobj(vm), vm)
                         )
@@ -983,9 +1062,7 @@ class PyMethod(ABC):
                 return PyMethodAttribute(descr_get(attr, obj, cls.into_pyobj(vm), vm))
             else:
                 return PyMethodAttribute(attr)
-        elif (
-            getter := to_opt(lambda: cls.get_attr(vm.mk_str("__getattr__"), vm))
-        ) is not None:
+        elif (getter := cls._.get_attr("__getattr__")) is not None:
             return PyMethodAttribute(vm.invoke(getter, FuncArgs([obj, name])))
         else:
             vm.new_attribute_error(
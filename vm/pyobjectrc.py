@@ -106,7 +106,7 @@ class PyRef(Generic[PyRefT]):
         return vm.is_none(self.get_attr(attr_name, vm))
 
     def get_attr(self, attr_name: PyStrRef, vm: VirtualMachine) -> PyObjectRef:
-        getattro = self.class_()._.mro_find_map(lambda cls: cls.slots.getattro)
+        getattro = self.class_()._.effective_slots.getattro
         # print("getattro", getattro)
         assert getattro is not None, (
             self.class_()._.name(),
@@ -115,6 +115,13 @@ class PyRef(Generic[PyRefT]):
         )
         return getattro(self, attr_name, vm)
 
+    def get_attr_opt(
+        self, attr_name: PyStrRef, vm: VirtualMachine
+    ) -> Optional[PyObjectRef]:
+        getattro_opt = self.class_()._.effective_slots.getattro_opt
+        assert getattro_opt is not None, self.class_()._.name()
+        return getattro_opt(self, attr_name, vm)
+
     def set_dict(self, dict: PyDictRef) -> None:
         if self.dict is None:
             raise PyImplError(dict)
@@ -154,10 +161,10 @@ class PyRef(Generic[PyRefT]):
         self, vm: VirtualMachine, attr_name: PyStrRef, attr_value: Optional[PyObjectRef]
     ) -> None:
         cls = self.class_()
-        setattro = cls._.mro_find_map(lambda cls: cls.slots.setattro)
+        setattro = cls._.effective_slots.setattro
         if setattro is None:
             assign = attr_value is not None
-            has_getattr = cls._.mro_find_map(lambda cls: cls.slots.getattro) is not None
+            has_getattr = cls._.effective_slots.getattro is not None
             vm.new_type_error(
                 "'{}' object has {} attributes ({} {})".format(
                     cls._.name(),
@@ -186,7 +193,7 @@ class PyRef(Generic[PyRefT]):
         ) -> PyArithmeticValue[bool] | PyArithmeticValue[PyObjectRef]:
             import vm.pyobject as po
 
-            cmp = obj.class_()._.mro_find_map(lambda cls: cls.slots.richcompare)
+            cmp = obj.class_()._.effective_slots.richcompare
             assert cmp is not None
             r = cmp(obj, other, op, vm)
             if isinstance(r, PyRef):
@@ -271,7 +278,7 @@ class PyRef(Generic[PyRefT]):
         self, cls: PyObject, vm: VirtualMachine, msg: Callable[[], str]
     ) -> PyObjectRef:
         try:
-            return cls.get_attr(vm.mk_str("__bases__"), vm)
+            return cls.get_attr(vm.ctx.intern_str("__bases__"), vm)
         except PyImplException as e:
             if e.exception.class_().is_(vm.ctx.exceptions.attribute_error):
                 vm.new_type_error(msg())
@@ -284,7 +291,7 @@ class PyRef(Generic[PyRefT]):
             if derived.is_(cls):
                 return True
 
-            bases = derived.get_attr(vm.mk_str("__bases__"), vm)
+            bases = derived.get_attr(vm.ctx.intern_str("__bases__"), vm)
             tuple = PyTuple.try_from_object(vm, bases)
             n = tuple._.len()
             if n == 0:
@@ -422,7 +429,7 @@ class PyRef(Generic[PyRefT]):
             if self.class_()._.issubclass(type):
                 return True
             elif icls := pytype.PyType.try_from_object(
-                vm, self.get_attr(vm.mk_str("__class__"), vm)
+                vm, self.get_attr(vm.ctx.intern_str("__class__"), vm)
             ):
                 if icls.is_(self.class_()):
                     return False
@@ -436,7 +443,7 @@ class PyRef(Generic[PyRefT]):
                 vm,
                 lambda: f"isinstance() arg 2 must be a type or tuple of types, not {cls.class_()}",
             )
-            icls = self.get_attr(vm.mk_str("__class__"), vm)
+            icls = self.get_attr(vm.ctx.intern_str("__class__"), vm)
             if vm.is_none(icls):
                 return False
             else:
@@ -460,8 +467,8 @@ class PyRef(Generic[PyRefT]):
 
         if (f := self.payload_if_exact(pyfloat.PyFloat, vm)) is not None:
             return f.value
-        if (method := vm.get_method(self, "__float__")) is not None:
-            result = vm.invoke(method, FuncArgs())
+        if (float_ := self.class_()._.effective_slots.as_number.float) is not None:
+            result = float_(self, vm)
             if (float_obj := result.payload_(pyfloat.PyFloat)) is not None:
                 return float_obj.value
             else:
@@ -479,13 +486,8 @@ class PyRef(Generic[PyRefT]):
             return True
         if self.is_(vm.ctx.false_value):
             return False
-        if (method := vm.get_method(self, "__bool__")) is not None:
-            bool_obj = vm.invoke(method, fn.FuncArgs([], OrderedDict()))
-            if not bool_obj.isinstance(vm.ctx.types.bool_type):
-                vm.new_type_error(
-                    f"__bool__ should return bool, returned type {bool_obj.class_()._.name()}"
-                )
-            return bool_get_value(bool_obj)
+        if (boolean := self.class_()._.effective_slots.as_number.boolean) is not None:
+            return boolean(self, vm)
         else:
             if (method := vm.get_method(self, "__len__")) is not None:
                 bool_obj = vm.invoke(method, fn.FuncArgs([], OrderedDict()))
@@ -544,7 +546,7 @@ class PyRef(Generic[PyRefT]):
 
             if (
                 class_getitem := vm.get_attribute_opt(
-                    self, vm.mk_str("__class_getitem__")
+                    self, vm.ctx.intern_str("__class_getitem__")
                 )
             ) is not None:
                 return vm.invoke(class_getitem, FuncArgs([needle]))
@@ -649,7 +651,7 @@ class PyRef(Generic[PyRefT]):
         return viter.PyIter.try_from_object(vm, self)
 
     def hash(self, vm: VirtualMachine) -> PyHash:
-        hash = self.class_()._.mro_find_map(lambda cls: cls.slots.hash)
+        hash = self.class_()._.effective_slots.hash
         assert hash is not None, (
             self.class_()._.name(),
             self.class_()._.slots.hash,
@@ -723,6 +725,7 @@ def init_type_hierarchy() -> tuple[PyTypeRef, PyTypeRef, PyTypeRef]:
     type_payload.mro_ = [object_type]
     type_payload.bases = [object_type]
     type_payload.base = object_type
+    type_payload.resolve_slots()
 
     weakref_type = PyRef.new_ref(
         pytype.PyType(
@@ -3,14 +3,17 @@ from collections import OrderedDict
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any, Callable, TypeAlias
 
+from vm.function_ import FuncArgs
+
 if TYPE_CHECKING:
-    from vm.builtins.int import PyInt
-    from vm.function_ import FuncArgs
     from vm.vm import VirtualMachine
 
 NSIG = 64
 ANY_TRIGGERED = False
 TRIGGERS = [False] * NSIG
+# set by anything that needs the interpreter to stop and run asynchronous work;
+# only checked on backward jumps and on function entry
+EVAL_BREAKER = False
 
 
 def check_signals(vm: VirtualMachine) -> None:
@@ -19,20 +22,27 @@ def check_signals(vm: VirtualMachine) -> None:
         return
     if not ANY_TRIGGERED:
         return
-    ANY_TRIGGERED = True
+    ANY_TRIGGERED = False
     return trigger_signals(vm)
 
 
+def handle_eval_breaker(vm: VirtualMachine) -> None:
+    global EVAL_BREAKER
+    EVAL_BREAKER = False
+    check_signals(vm)
+
+
 def trigger_signals(vm: VirtualMachine) -> None:
     assert vm.signal_handlers is not None
     for signum, trigger in enumerate(TRIGGERS[1:], 1):
         if trigger:
+            TRIGGERS[signum] = False
             if (handler := vm.signal_handlers[signum]) is not None:
                 if vm.is_callable(handler):
                     vm.invoke(
                         handler,
                         FuncArgs(
-                            [PyInt(signum).into_ref(vm), vm.ctx.get_none()],
+                            [vm.ctx.new_int(signum), vm.ctx.get_none()],
                             OrderedDict(),
                         ),
                     )
@@ -43,8 +53,9 @@ def trigger_signals(vm: VirtualMachine) -> None:
 
 
 def set_triggered():
-    global ANY_TRIGGERED
+    global ANY_TRIGGERED, EVAL_BREAKER
     ANY_TRIGGERED = True
+    EVAL_BREAKER = True
 
 
 UserSignal: TypeAlias = Callable[["VirtualMachine"], None]
@@ -0,0 +1,97 @@
+from __future__ import annotations
+from collections import Counter
+from dataclasses import dataclass, field
+import json
+from typing import TYPE_CHECKING, Any, Optional, TextIO
+
+if TYPE_CHECKING:
+    from bytecode.instruction import Instruction
+
+
+# number of rows of the pair table in the readable dump
+TABLE_PAIRS = 40
+
+
+@dataclass
+class ExecutionStats:
+    # `Instruction.opname()` -> dispatches. the second half of a superinstruction
+    # is not dispatched, so it only shows up in the name of the pair
+    instructions: Counter[str] = field(default_factory=Counter)
+    # (previous, next) opnames -> dispatches, in execution order
+    pairs: Counter[tuple[str, str]] = field(default_factory=Counter)
+    # the counters below are keyed by the name of the specialized instruction class
+    success: Counter[str] = field(default_factory=Counter)
+    failure: Counter[str] = field(default_factory=Counter)
+    hit: Counter[str] = field(default_factory=Counter)
+    miss: Counter[str] = field(default_factory=Counter)
+    deopt: Counter[str] = field(default_factory=Counter)
+    prev: Optional[str] = None
+
+    def count(self, instr: Instruction) -> None:
+        name = instr.opname()
+        self.instructions[name] += 1
+        if self.prev is not None:
+            self.pairs[(self.prev, name)] += 1
+        self.prev = name
+
+    def specializations(self) -> dict[str, dict[str, int]]:
+        r = {}
+        names = self.success.keys() | self.failure.keys() | self.hit.keys()
+        for name in sorted(names):
+            r[name] = {
+                "success": self.success[name],
+                "failure": self.failure[name],
+                "hit": self.hit[name],
+                "miss": self.miss[name],
+                "deopt": self.deopt[name],
+            }
+        return r
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "instructions": dict(self.instructions.most_common()),
+            "pairs": [[a, b, n] for (a, b), n in self.pairs.most_common()],
+            "specializations": self.specializations(),
+        }
+
+    def dump(self, format: str, out: TextIO) -> None:
+        if format == "json":
+            json.dump(self.as_dict(), out, indent=2)
+            out.write("\n")
+        elif format == "table":
+            self.dump_table(out)
+        else:
+            raise ValueError(f"unknown stats format {format!r}")
+
+    def dump_table(self, out: TextIO) -> None:
+        total = sum(self.instructions.values()) or 1
+        out.write(f"{'instruction':<60} {'count':>12} {'%':>7}\n")
+        for name, n in self.instructions.most_common():
+            out.write(f"{name:<60} {n:>12} {100 * n / total:>6.2f}%\n")
+        out.write(f"\n{'pair':<80} {'count':>12} {'%':>7}\n")
+        for (a, b), n in self.pairs.most_common(TABLE_PAIRS):
+            out.write(f"{a + ' -> ' + b:<80} {n:>12} {100 * n / total:>6.2f}%\n")
+        out.write(f"\n{'specialization':<30}")
+        columns = ["success", "failure", "hit", "miss", "deopt"]
+        out.write("".join(f"{c:>12}" for c in columns) + "\n")
+        for name, row in self.specializations().items():
+            out.write(f"{name:<30}" + "".join(f"{row[c]:>12}" for c in columns))
+            out.write("\n")
+
+
+# set while a VM created with `PySettings.stats` is alive. the hot paths only check
+# it for `None`, so collection costs nothing when it is off
+STATS: Optional[ExecutionStats] = None
+
+
+def specialization(name: str, success: bool) -> None:
+    if STATS is not None:
+        (STATS.success if success else STATS.failure)[name] += 1
+
+
+def miss(instr: Instruction, deopt: bool) -> None:
+    if STATS is not None:
+        name = type(instr).__name__
+        STATS.miss[name] += 1
+        if deopt:
+            STATS.deopt[name] += 1
@@ -245,7 +245,14 @@ class builtins(po.PyModuleImpl):
         *,
         vm: VirtualMachine,
     ) -> PyObjectRef:
-        raise NotImplementedError
+        it: viter.PyIter[PyObjectRef] = viter.PyIter.new(iterator, None)
+        result = it.next(vm)
+        if (
+            isinstance(result, viter.PyIterReturnStopIteration)
+            and default_value is not None
+        ):
+            return default_value
+        return result.into_pyresult(vm)
 
     @pyfunction
     @staticmethod
@@ -359,7 +366,7 @@ class builtins(po.PyModuleImpl):
     ) -> PyObjectRef:
         if obj is not None:
             try:
-                return obj.get_attr(vm.ctx.new_str("__dict__"), vm)
+                return obj.get_attr(vm.ctx.intern_str("__dict__"), vm)
             except PyImplBase as _:
                 vm.new_type_error("vars() argument must have __dict__ attribute")
         else:
@@ -387,7 +394,7 @@ class builtins(po.PyModuleImpl):
                     new_bases.append(base)
                 continue
             mro_entries = vm.get_attribute_opt(
-                base.class_(), vm.ctx.new_str("__mro_entries__")
+                base.class_(), vm.ctx.intern_str("__mro_entries__")
             )
             if mro_entries is not None:
                 entries = vm.invoke(
@@ -433,7 +440,7 @@ class builtins(po.PyModuleImpl):
             meta_name = metaclass._.slot_name()
 
         if (
-            prepare := vm.get_attribute_opt(metaclass, vm.ctx.new_str("__prepare__"))
+            prepare := vm.get_attribute_opt(metaclass, vm.ctx.intern_str("__prepare__"))
         ) is not None:
             namespace = vm.invoke(
                 prepare, fn.FuncArgs([name_obj, bases], OrderedDict(kwargs))
@@ -459,7 +466,7 @@ class builtins(po.PyModuleImpl):
 
         if orig_bases is not None:
             namespace_mapping.into_object().set_item(
-                vm.ctx.new_str("__orig_bases__"), orig_bases, vm
+                vm.ctx.intern_str("__orig_bases__"), orig_bases, vm
             )
 
         class_ = vm.invoke(
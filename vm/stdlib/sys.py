@@ -9,6 +9,7 @@ if TYPE_CHECKING:
 
 import vm.pyobject as po
 import vm.builtins.list as pylist
+import vm.builtins.pystr as pystr
 import vm.builtins.tuple as pytuple
 import vm.builtins.dict as pydict
 import vm.builtins.namespace as pynamespace
@@ -281,6 +282,13 @@ class sys(po.PyModuleImpl):
     def getrefcount(obj: PyObjectRef, *, vm: VirtualMachine) -> int:
         raise NotImplementedError
 
+    @pyfunction
+    @staticmethod
+    def intern(s: pystr.PyStrRef, /, *, vm: VirtualMachine) -> pystr.PyStrRef:
+        if not s.class_().is_(vm.ctx.types.str_type):
+            vm.new_type_error(f"can't intern {s.class_()._.name()}")
+        return vm.ctx.string_cache.setdefault(s._.as_str(), s)
+
     @pyfunction
     @staticmethod
     def getrecursionlimit(*, vm: VirtualMachine) -> int:
@@ -297,7 +305,7 @@ class sys(po.PyModuleImpl):
 def __get_stdio(name: str, vm: VirtualMachine) -> PyObjectRef:
 
     try:
-        return vm.sys_module.get_attr(vm.mk_str(name), vm)
+        return vm.sys_module.get_attr(vm.ctx.intern_str(name), vm)
     except PyImplBase as _:
         vm.new_runtime_error(f"lost sys.{name}")
 
@@ -327,8 +335,8 @@ def init_module(vm: VirtualMachine, module: PyObject, builtins: PyObject) -> Non
     sys.extend_module(vm, module)
 
     modules = vm.ctx.new_dict()
-    modules.set_item(vm.ctx.new_str("sys"), module, vm)
-    modules.set_item(vm.ctx.new_str("builtins"), builtins, vm)
+    modules.set_item(vm.ctx.intern_str("sys"), module, vm)
+    modules.set_item(vm.ctx.intern_str("builtins"), builtins, vm)
     extend_module(
         vm,
         module,
@@ -10,8 +10,7 @@ if TYPE_CHECKING:
     from vm.protocol.sequence import PySequence
     from vm.builtins.pystr import PyStrRef
     from vm.builtins.pytype import PyTypeRef
-    from vm.function_ import FuncArgs
-    from vm.protocol.iter import PyIterReturn
+    from vm.protocol.iter import IterNext, PyIterReturn
     from vm.protocol.mapping import PyMappingMethods
     from vm.protocol.sequence import PySequenceMethods
     from vm.pyobject import PyComparisonValue
@@ -22,6 +21,8 @@ if TYPE_CHECKING:
     from vm.vm import VirtualMachine
 
 from common.deco import pymethod, pyslot
+from vm.function_ import FuncArgs
+import vm.protocol.number as number
 from common.error import PyImplBase, PyImplError, PyImplException, unreachable
 from common.hash import PyHash
 
@@ -35,12 +36,15 @@ SLOTS = {
     "as_mapping",
     "hash",
     "call",
+    "vectorcall",
     "getattro",
+    "getattro_opt",
     "setattro",
     "as_buffer",
     "richcompare",
     "iter",
     "iternext",
+    "iternext_fast",
     # "doc",
     "descr_get",
     "descr_set",
@@ -49,6 +53,28 @@ SLOTS = {
 }
 
 
+# the fields of `PyTypeSlots` that a type inherits from its mro
+INHERITED_SLOTS = (
+    "as_sequence",
+    "as_mapping",
+    "hash",
+    # not `vectorcall`: a subclass that defines `__call__` only replaces `call`
+    "call",
+    "getattro",
+    "getattro_opt",
+    "setattro",
+    "as_buffer",
+    "richcompare",
+    "iter",
+    "iternext",
+    "iternext_fast",
+    "descr_get",
+    "descr_set",
+    "new",
+    "del_",
+)
+
+
 @dataclass
 class PyTypeSlots:
     flags: PyTypeFlags
@@ -57,17 +83,23 @@ class PyTypeSlots:
     as_mapping: Optional[AsMappingFunc] = None
     hash: Optional[HashFunc] = None
     call: Optional[GenericMethod] = None
+    vectorcall: Optional[VectorCallFunc] = None
     getattro: Optional[GetattroFunc] = None
+    getattro_opt: Optional[GetattroOptFunc] = None
     setattro: Optional[SetattroFunc] = None
     as_buffer: Optional[AsBufferFunc] = None
     richcompare: Optional[RichCompareFunc] = None
     iter: Optional[IterFunc] = None
     iternext: Optional[IterNextFunc] = None
+    iternext_fast: Optional[IterNextFastFunc] = None
     doc: Optional[str] = None
     descr_get: Optional[DescrGetFunc] = None
     descr_set: Optional[DescrSetFunc] = None
     new: Optional[NewFunc] = None
     del_: Optional[DelFunc] = None
+    as_number: number.PyNumberMethods = dataclasses.field(
+        default_factory=number.PyNumberMethods
+    )
 
     @staticmethod
     def from_flags(flags: PyTypeFlags) -> PyTypeSlots:
@@ -175,9 +207,28 @@ SWAP_CMP_OP = {
 }
 
 GenericMethod = Callable[["PyObject", "FuncArgs", "VirtualMachine"], "PyObjectRef"]
+# `(zelf, args, start, nargs, kwnames, vm)`: the positional arguments are
+# `args[start:start + nargs]`, followed by one value per name in `kwnames`. the
+# callee may store an extra leading argument in `args[start - 1]` before passing
+# the vector on to a `PyFunction`, so callers always leave that slot free
+VectorCallFunc = Callable[
+    [
+        "PyObject",
+        list["PyObjectRef"],
+        int,
+        int,
+        Optional[tuple[str, ...]],
+        "VirtualMachine",
+    ],
+    "PyObjectRef",
+]
 AsMappingFunc = Callable[["PyObject", "VirtualMachine"], "PyMappingMethods"]
 HashFunc = Callable[["PyObject", "VirtualMachine"], PyHash]
 GetattroFunc = Callable[["PyObjectRef", "PyStrRef", "VirtualMachine"], "PyObjectRef"]
+# like `GetattroFunc`, but a missing attribute is `None` instead of an AttributeError
+GetattroOptFunc = Callable[
+    ["PyObjectRef", "PyStrRef", "VirtualMachine"], Optional["PyObjectRef"]
+]
 SetattroFunc = Callable[
     ["PyObjectRef", "PyStrRef", Optional["PyObjectRef"], "VirtualMachine"], None
 ]
@@ -188,6 +239,7 @@ RichCompareFunc = Callable[
 ]
 IterFunc = Callable[["PyObjectRef", "VirtualMachine"], "PyObjectRef"]
 IterNextFunc = Callable[["PyObject", "VirtualMachine"], "PyIterReturn"]
+IterNextFastFunc = Callable[["PyObject", "VirtualMachine"], "IterNext"]
 DescrGetFunc = Callable[
     ["PyObjectRef", Optional["PyObjectRef"], Optional["PyObjectRef"], "VirtualMachine"],
     "PyObjectRef",
@@ -232,6 +284,33 @@ class GetAttrMixin(ABC):
         else:
             return cls.getattro(zelf, name, vm)  # type: ignore
 
+    # types that can tell a miss without raising override this
+    @classmethod
+    def getattro_opt(
+        cls: Type[GetAttrT],
+        zelf: PyRef[GetAttrT],
+        name: PyStrRef,
+        vm: VirtualMachine,
+    ) -> Optional[PyObjectRef]:
+        try:
+            return cls.getattro(zelf, name, vm)
+        except PyImplException as e:
+            if e.exception.isinstance(vm.ctx.exceptions.attribute_error):
+                return None
+            raise
+
+    @pyslot
+    @classmethod
+    def slot_getattro_opt(
+        cls, obj: PyObjectRef, name: PyStrRef, vm: VirtualMachine
+    ) -> Optional[PyObjectRef]:
+        try:
+            zelf = obj.downcast(cls)  # type: ignore
+        except PyImplBase as _:
+            vm.new_type_error("unexpected payload for __getattribute__")
+        else:
+            return cls.getattro_opt(zelf, name, vm)  # type: ignore
+
     @pymethod(True)
     @classmethod
     def i__getattribute__(
@@ -380,7 +459,11 @@ class CallableMixin(ABC):
 
 @dataclass
 class IterNextIterableMixin:
-    pass
+    # an iterator is its own iterator
+    @pyslot
+    @classmethod
+    def slot_iter(cls, zelf: PyObjectRef, vm: VirtualMachine) -> PyObjectRef:
+        return zelf
 
 
 # TODO: when intersection types are available change bound to `AsMappingMixin & PyValueMixin`
@@ -403,12 +486,45 @@ class IterNextMixin(ABC):
         else:
             vm.new_type_error("unexpected payload for __next__")
 
+    @classmethod
+    def next_fast(
+        cls: Type[IterNextT], zelf: PyRef[IterNextT], vm: VirtualMachine
+    ) -> IterNext:
+        # adapter for the iterators that only implement `next`
+        return cls.next(zelf, vm).into_fast()
+
+    @pyslot
+    @classmethod
+    def slot_iternext_fast(cls, zelf: PyObject, vm: VirtualMachine) -> IterNext:
+        if (r := zelf.downcast_ref(cls)) is not None:  # type: ignore
+            return cls.next_fast(zelf, vm)
+        else:
+            vm.new_type_error("unexpected payload for __next__")
+
     @pymethod(True)
     @classmethod
     def i__next__(cls, zelf: PyObjectRef, *, vm: VirtualMachine) -> PyObjectRef:
         return cls.slot_iternext(zelf, vm).into_pyresult(vm)
 
 
+class IterNextFastMixin(IterNextMixin):
+    # for iterators implemented through `next_fast`, which `next` is derived from
+    @classmethod
+    @abstractmethod
+    def next_fast(
+        cls: Type[IterNextT], zelf: PyRef[IterNextT], vm: VirtualMachine
+    ) -> IterNext:
+        ...
+
+    @classmethod
+    def next(
+        cls: Type[IterNextT], zelf: PyRef[IterNextT], vm: VirtualMachine
+    ) -> PyIterReturn:
+        import vm.protocol.iter as viter
+
+        return viter.PyIterReturn.from_fast(cls.next_fast(zelf, vm))
+
+
 # TODO: when intersection types are available change bound to `AsMappingMixin & PyValueMixin`
 AsMappingT = TypeVar("AsMappingT", contravariant=True, bound="AsMappingMixin")
 
@@ -671,6 +787,17 @@ def getattro_wrapper(
     return vm.call_special_method(zelf, "__getattribute__", FuncArgs([name]))
 
 
+def getattro_opt_wrapper(
+    zelf: PyObjectRef, name: PyStrRef, vm: VirtualMachine
+) -> Optional[PyObjectRef]:
+    try:
+        return getattro_wrapper(zelf, name, vm)
+    except PyImplException as e:
+        if e.exception.isinstance(vm.ctx.exceptions.attribute_error):
+            return None
+        raise
+
+
 def setattro_wrapper(
     zelf: PyObject, name: PyStrRef, value: Optional[PyObjectRef], vm: VirtualMachine
 ) -> None:
@@ -691,7 +818,17 @@ def iter_wrapper(zelf: PyObjectRef, vm: VirtualMachine) -> PyObjectRef:
 
 
 def iternext_wrapper(zelf: PyObject, vm: VirtualMachine) -> PyIterReturn:
-    return PyIterReturn.from_pyresult(
+    import vm.protocol.iter as viter
+
+    return viter.PyIterReturn.from_pyresult(
+        lambda: vm.call_special_method(zelf, "__next__", FuncArgs()), vm
+    )
+
+
+def iternext_fast_wrapper(zelf: PyObject, vm: VirtualMachine) -> IterNext:
+    import vm.protocol.iter as viter
+
+    return viter.next_fast_from_pyresult(
         lambda: vm.call_special_method(zelf, "__next__", FuncArgs()), vm
     )
 
@@ -723,7 +860,7 @@ def descr_set_wrapper(
 
 
 def new_wrapper(cls: PyTypeRef, args: FuncArgs, vm: VirtualMachine) -> PyObjectRef:
-    new = vm.get_attribute_opt(cls.as_object(), vm.mk_str("__new__"))
+    new = vm.get_attribute_opt(cls.as_object(), vm.ctx.intern_str("__new__"))
     assert new is not None
     args.prepend_arg(cls)
     return vm.invoke(new, args)
@@ -731,3 +868,75 @@ def new_wrapper(cls: PyTypeRef, args: FuncArgs, vm: VirtualMachine) -> PyObjectR
 
 def del_wrapper(zelf: PyObject, vm: VirtualMachine) -> None:
     vm.call_special_method(zelf, "__del__", FuncArgs())
+
+
+def call_number_method(
+    obj: PyObject, name: str, args: list[PyObjectRef], vm: VirtualMachine
+) -> PyObjectRef:
+    if (method := vm.get_method(obj, name)) is None:
+        return vm.ctx.get_not_implemented()
+    return vm.invoke(method, FuncArgs(args))
+
+
+def number_binary_wrapper(name: str) -> number.PyNumberBinaryFunc:
+    method, rmethod = number.BINARY_SLOTS[name]
+
+    def wrapper(a: PyObject, b: PyObject, vm: VirtualMachine) -> PyObjectRef:
+        cls_a = a.class_()
+        cls_b = b.class_()
+        do_other = (
+            not cls_a.is_(cls_b)
+            and getattr(cls_b._.effective_slots.as_number, name) is wrapper
+        )
+        if getattr(cls_a._.effective_slots.as_number, name) is wrapper:
+            if do_other and cls_b._.issubclass(cls_a):
+                r = call_number_method(b, rmethod, [a], vm)
+                if not r.is_(vm.ctx.not_implemented):
+                    return r
+                do_other = False
+            r = call_number_method(a, method, [b], vm)
+            if not do_other or not r.is_(vm.ctx.not_implemented):
+                return r
+        if do_other:
+            return call_number_method(b, rmethod, [a], vm)
+        return vm.ctx.get_not_implemented()
+
+    return wrapper
+
+
+def number_inplace_wrapper(name: str) -> number.PyNumberBinaryFunc:
+    method = number.INPLACE_SLOTS[name]
+
+    def wrapper(a: PyObject, b: PyObject, vm: VirtualMachine) -> PyObjectRef:
+        return call_number_method(a, method, [b], vm)
+
+    return wrapper
+
+
+def number_unary_wrapper(name: str) -> number.PyNumberUnaryFunc:
+    method = number.UNARY_SLOTS[name]
+
+    def wrapper(a: PyObject, vm: VirtualMachine) -> PyObjectRef:
+        return vm.call_special_method(a, method, FuncArgs())
+
+    return wrapper
+
+
+def number_bool_wrapper(zelf: PyObject, vm: VirtualMachine) -> bool:
+    import vm.builtins.pybool as pybool
+
+    bool_obj = vm.call_special_method(zelf, "__bool__", FuncArgs())
+    if not bool_obj.isinstance(vm.ctx.types.bool_type):
+        vm.new_type_error(
+            f"__bool__ should return bool, returned type {bool_obj.class_()._.name()}"
+        )
+    return pybool.get_value(bool_obj)
+
+
+# one wrapper per slot, the wrappers are compared by identity
+NUMBER_WRAPPERS: dict[str, Callable[..., Any]] = {
+    **{name: number_binary_wrapper(name) for name in number.BINARY_SLOTS},
+    **{name: number_inplace_wrapper(name) for name in number.INPLACE_SLOTS},
+    **{name: number_unary_wrapper(name) for name in number.UNARY_SLOTS},
+    "boolean": number_bool_wrapper,
+}
@@ -18,7 +18,6 @@ from typing import (
     TYPE_CHECKING,
 )
 
-from common import to_opt
 from vm.builtins.traceback import PyTraceback
 
 
@@ -38,7 +37,6 @@ if TYPE_CHECKING:
     from vm.frame import ExecutionResult, FrameRef
     from vm.function.arguments import ArgMapping
     from vm.function_ import FuncArgs
-    from vm.protocol.iter import PyIterIter
 
 import vm.import_ as import_
 import vm.pyobject as po
@@ -58,12 +56,15 @@ import vm.builtins.list as pylist
 import vm.builtins.code as pycode
 import vm.frame as vm_frame
 import vm.protocol.iter as viter
+import vm.protocol.mapping as vmapping
+import vm.protocol.number as vnumber
 import vm.exceptions as vm_exceptions
 import vm.function_ as vm_function_
 import vm.builtins.object as pyobject
 import vm.builtins.module as pymodule
 import vm.builtins.int as pyint
 import vm.signal as vm_signal
+import vm.stats as vm_stats
 
 from bytecode.bytecode import CodeObject, ConstantData, FrozenModule
 from common.error import PE, PyImplBase, PyImplError, PyImplException, safe
@@ -154,11 +155,14 @@ class VirtualMachine:
 
         vm.state.frozen = dict(frozen.map_frozen(vm, frozen.get_module_inits()))
 
+        if settings.stats is not None:
+            vm_stats.STATS = vm_stats.ExecutionStats()
+
         vm.builtins._.init_module_dict(
-            vm.builtins, vm.ctx.new_str("builtins"), vm.ctx.get_none(), vm
+            vm.builtins, vm.ctx.intern_str("builtins"), vm.ctx.get_none(), vm
         )
         vm.sys_module._.init_module_dict(
-            vm.sys_module, vm.ctx.new_str("sys"), vm.ctx.get_none(), vm
+            vm.sys_module, vm.ctx.intern_str("sys"), vm.ctx.get_none(), vm
         )
 
         return vm
@@ -181,7 +185,7 @@ class VirtualMachine:
         try:
             inner_init()
         except PyImplException as e:
-            traceback = e.exception._.traceback
+            traceback = e.exception._.get_traceback(self)
             while traceback is not None:
                 print(traceback._.lineno)
                 traceback = traceback._.next
@@ -192,6 +196,18 @@ class VirtualMachine:
 
         self.initialized = True
 
+    def finalize(self) -> None:
+        stats = vm_stats.STATS
+        if stats is not None:
+            vm_stats.STATS = None
+            settings = self.state.settings
+            assert settings.stats is not None
+            if settings.stats_file is None:
+                stats.dump(settings.stats, sys.stderr)
+            else:
+                with open(settings.stats_file, "w") as f:
+                    stats.dump(settings.stats, f)
+
     def check(self, t: Type[PT], obj: PyObject) -> None:
         class_ = t.class_(self)
         if obj.isinstance(class_):
@@ -245,7 +261,18 @@ class VirtualMachine:
 
         return self.with_recursion("", do)
 
+    def enter_frame(self, frame: FrameRef) -> None:
+        self.check_recursive_call("")
+        self.recursion_depth += 1
+        self.frames.append(frame)
+
+    def leave_frame(self) -> None:
+        self.frames.pop()
+        self.recursion_depth -= 1
+
     def run_frame(self, frame: FrameRef) -> ExecutionResult:
+        if vm_signal.EVAL_BREAKER:
+            vm_signal.handle_eval_breaker(self)
         return self.with_frame(frame, lambda f: f._.run(self))
 
     def check_recursive_call(self, where: str) -> None:
@@ -271,7 +298,7 @@ class VirtualMachine:
     def try_class(self, module: str, class_: str) -> PyTypeRef:
         res = (
             self.import_(self.mk_str(module), None, 0)
-            .get_attr(self.mk_str(class_), self)
+            .get_attr(self.ctx.intern_str(class_), self)
             .downcast(PyType)
         )
         assert res is not None, "not a class"
@@ -279,7 +306,7 @@ class VirtualMachine:
 
     def class_(self, module: str, class_: str) -> PyTypeRef:
         module_ = self.import_(self.mk_str(module), None, 0)
-        result = module_.get_attr(self.mk_str(class_), self)
+        result = module_.get_attr(self.ctx.intern_str(class_), self)
         result = result.downcast(PyType)
         assert result is not None, "not a class"
         return result
@@ -310,16 +337,11 @@ class VirtualMachine:
         name = name_str._.as_str()
         obj_cls = obj.class_()
 
-        if (
-            descr := to_opt(lambda: obj_cls.get_attr(self.mk_str(name), self))
-        ) is not None:
+        if (descr := obj_cls._.get_attr(name)) is not None:
             descr_cls = descr.class_()
-            descr_get = descr_cls._.mro_find_map(lambda cls: cls.slots.descr_get)
+            descr_get = descr_cls._.effective_slots.descr_get
             if descr_get is not None:
-                if (
-                    descr_cls._.mro_find_map(lambda cls: cls.slots.descr_set)
-                    is not None
-                ):
+                if descr_cls._.effective_slots.descr_set is not None:
                     return descr_get(descr, obj, obj_cls, self)
             cls_attr = (descr, descr_get)
         else:
@@ -329,7 +351,7 @@ class VirtualMachine:
             dict_ = obj.dict.d
 
         if dict_ is not None:
-            attr = dict_._.get_item_opt(self.mk_str(name), self)
+            attr = dict_._.get_item_opt(name_str, self)
             if attr is not None:
                 return attr
 
@@ -339,9 +361,7 @@ class VirtualMachine:
                 return descr_get(attr, obj, obj_cls, self)
             else:
                 return attr
-        elif (
-            getter := to_opt(lambda: obj_cls.get_attr(self.mk_str("__getattr__"), self))
-        ) is not None:
+        elif (getter := obj_cls._.get_attr("__getattr__")) is not None:
             return self.invoke(getter, vm_function_.FuncArgs([obj, name_str]))
         else:
             return None
@@ -358,7 +378,7 @@ class VirtualMachine:
         return self._invoke(func, args.into_args(self))
 
     def _invoke(self, callable: PyObject, args: FuncArgs) -> PyObjectRef:
-        slot_call = callable.class_()._.mro_find_map(lambda cls: cls.slots.call)
+        slot_call = callable.class_()._.effective_slots.call
         if slot_call is not None:
             return slot_call(callable, args, self)
         else:
@@ -366,19 +386,40 @@ class VirtualMachine:
                 f"'{callable.class_()._.name()}' object is not callable"
             )
 
+    # calls `callable` with a slice of `args` as described by `slot.VectorCallFunc`;
+    # `FuncArgs` are only built for callables without a vectorcall slot
+    def vectorcall(
+        self,
+        callable: PyObject,
+        args: list[PyObjectRef],
+        start: int,
+        nargs: int,
+        kwnames: Optional[tuple[str, ...]],
+    ) -> PyObjectRef:
+        vectorcall = callable.class_()._.effective_slots.vectorcall
+        if vectorcall is not None:
+            return vectorcall(callable, args, start, nargs, kwnames, self)
+        return self._invoke(
+            callable, vm_function_.FuncArgs.from_vector(args, start, nargs, kwnames)
+        )
+
     def invoke_exception(
         self, cls: PyTypeRef, args: list[PyObjectRef]
     ) -> PyBaseExceptionRef:
-        res = self.invoke(cls.as_object(), FuncArgs(args, OrderedDict()))
-        return PyBaseExceptionRef.try_from_object(PyBaseException, self, res)
+        res = self.invoke(cls.as_object(), vm_function_.FuncArgs(args, OrderedDict()))
+        return prc.PyRef.try_from_object(vm_exceptions.PyBaseException, self, res)
 
     def normalize_exception(
         self, exc_type: PyObjectRef, exc_val: PyObjectRef, exc_tb: PyObjectRef
     ) -> PyBaseExceptionRef:
-        raise NotImplementedError
+        ctor = vm_exceptions.ExceptionCtor.try_from_object(self, exc_type)
+        exc = ctor.instantiate_value(exc_val, self)
+        if not self.is_none(exc_tb):
+            exc._.set_traceback(prc.PyRef.try_from_object(PyTraceback, self, exc_tb))
+        return exc
 
     def is_callable(self, obj: PyObject) -> bool:
-        return obj.class_()._.mro_find_map(lambda cls: cls.slots.call) is not None
+        return obj.class_()._.effective_slots.call is not None
 
     def extract_elements_as_pyobjects(self, value: PyObject) -> list[PyObjectRef]:
         return self.extract_elements_func(value, lambda obj: obj)
@@ -415,8 +456,11 @@ class VirtualMachine:
         if cap is not None and cap >= MAX_LENGTH_HINT:
             return []
 
-        it: PyIterIter[PyObjectRef] = PyIterIter.new(self, iter_.as_ref(), cap, None)
-        return [f(x) for x in it]
+        iterator = iter_.as_ref()
+        r = []
+        while (x := viter.next_fast(iterator, self)) is not viter.ITER_EXHAUSTED:
+            r.append(f(x))
+        return r
 
     def check_signal(self) -> None:
         signal.check_signals(self)
@@ -440,7 +484,7 @@ class VirtualMachine:
         self, obj: PyObjectRef, attr_name: PyStrRef
     ) -> Optional[PyObjectRef]:
         try:
-            return obj.get_attr(attr_name, self)
+            return obj.get_attr_opt(attr_name, self)
         except PyImplException as e:
             if e.exception.isinstance(self.ctx.exceptions.attribute_error):
                 return None
@@ -470,12 +514,13 @@ class VirtualMachine:
     def call_method(
         self, obj: PyObject, method_name: str, args: FuncArgs
     ) -> PyObjectRef:
-        return po.PyMethod.get(obj, self.mk_str(method_name), self).invoke(args, self)
+        name = self.ctx.intern_str(method_name)
+        return po.PyMethod.get(obj, name, self).invoke(args, self)
 
     def call_get_descriptor_specific(
         self, descr: PyObjectRef, obj: Optional[PyObjectRef], cls: PyObjectRef
     ) -> PyObjectRef:
-        descr_get = descr.class_()._.mro_find_map(lambda cls: cls.slots.descr_get)
+        descr_get = descr.class_()._.effective_slots.descr_get
         if descr_get is not None:
             return descr_get(descr, obj, cls, self)
         else:
@@ -502,12 +547,12 @@ class VirtualMachine:
         try:
             return obj.downcast(pyint.PyInt)
         except PyImplError as e:
-            index = self.get_method(e.obj, "__index__")
+            index = e.obj.class_()._.effective_slots.as_number.index
             if index is None:
                 return None
-            index = self.invoke(index, vm_function_.FuncArgs.empty())
+            res = index(e.obj, self)
             try:
-                return index.downcast(pyint.PyInt)
+                return res.downcast(pyint.PyInt)
             except PyImplError as e:
                 self.new_type_error(
                     f"__index__ returned non-int (type {e.obj.class_()._.name()})"
@@ -537,8 +582,10 @@ class VirtualMachine:
         )
 
         if not weird:
-            sys_modules = self.sys_module.get_attr(self.ctx.new_str("modules"), self)
-            cached_module = to_opt(lambda: sys_modules.get_item(module, self))
+            sys_modules = self.sys_module.get_attr(self.ctx.intern_str("modules"), self)
+            cached_module = vmapping.PyMapping.from_pyobj(sys_modules).subscript_opt(
+                module, self
+            )
         else:
             cached_module = None
         if cached_module is not None:
@@ -551,7 +598,7 @@ class VirtualMachine:
         else:
             try:
                 import_func = self.builtins.get_attr(
-                    self.ctx.new_str("__import__"), self
+                    self.ctx.intern_str("__import__"), self
                 )
             except PyImplBase as _:
                 self.new_import_error("__import__ not found", module)
@@ -578,39 +625,6 @@ class VirtualMachine:
             )
             # TODO: .map_err(|exc| import::remove_importlib_frames(self, &exc))
 
-    def call_or_unsupported(
-        self,
-        obj: PyObject,
-        arg: PyObject,
-        method: str,
-        unsupported: Callable[[VirtualMachine, PyObject, PyObject], PyObjectRef],
-    ) -> PyObjectRef:
-        if (method_ := self.get_method(obj, method)) is not None:
-            result = po.PyArithmeticValue.from_object(
-                self, self.invoke(method_, vm_function_.FuncArgs([arg]))
-            )
-            if result.value is not None:
-                return result.value
-        return unsupported(self, obj, arg)
-
-    def call_or_reflection(
-        self,
-        lhs: PyObject,
-        rhs: PyObject,
-        default: str,
-        reflection: str,
-        unsupported: Callable[[VirtualMachine, PyObject, PyObject], PyObjectRef],
-    ) -> PyObjectRef:
-        def do(vm: VirtualMachine, lhs: PyObject, rhs: PyObject) -> PyObjectRef:
-            if not lhs.class_().is_(rhs.class_()):
-                return vm.call_or_unsupported(
-                    rhs, lhs, reflection, lambda _, rhs, lhs: unsupported(vm, lhs, rhs)
-                )
-            else:
-                return unsupported(vm, lhs, rhs)
-
-        return self.call_or_unsupported(lhs, rhs, default, do)
-
     def new_exception(
         self,
         exc_type: PyTypeRef,
@@ -622,7 +636,7 @@ class VirtualMachine:
         )
         if attrs is not None:
             for k, v in attrs.items():
-                exc.as_object().set_attr(self.mk_str(k), v, self)
+                exc.as_object().set_attr(self.ctx.intern_str(k), v, self)
         raise PyImplException(exc)
 
     def new_exception_empty(
@@ -734,40 +748,59 @@ class VirtualMachine:
             args = []
         self.new_exception(self.ctx.exceptions.stop_iteration, args)
 
+    def binary_op1(self, a: PyObject, b: PyObject, name: str) -> PyObjectRef:
+        cls_a = a.class_()
+        cls_b = b.class_()
+        slot_a = getattr(cls_a._.effective_slots.as_number, name)
+        slot_b = None
+        if not cls_a.is_(cls_b):
+            slot_b = getattr(cls_b._.effective_slots.as_number, name)
+            if slot_b is slot_a:
+                slot_b = None
+        if slot_a is not None:
+            if slot_b is not None and cls_b._.issubclass(cls_a):
+                r = slot_b(a, b, self)
+                if not r.is_(self.ctx.not_implemented):
+                    return r
+                slot_b = None
+            r = slot_a(a, b, self)
+            if not r.is_(self.ctx.not_implemented):
+                return r
+        if slot_b is not None:
+            return slot_b(a, b, self)
+        return self.ctx.get_not_implemented()
+
     def _binop_generic(
         self, a: PyObject, b: PyObject, op: str, name: str
     ) -> PyObjectRef:
-        return self.call_or_reflection(
-            a,
-            b,
-            f"__{name}__",
-            f"__r{name}__",
-            lambda vm, a, b: vm.new_unsupported_binop_error(a, b, op),
-        )
+        r = self.binary_op1(a, b, name)
+        if r.is_(self.ctx.not_implemented):
+            self.new_unsupported_binop_error(a, b, op)
+        return r
 
     def _sub(self, a: PyObject, b: PyObject) -> PyObjectRef:
-        return self._binop_generic(a, b, "-", "sub")
+        return self._binop_generic(a, b, "-", "subtract")
 
     def _add(self, a: PyObject, b: PyObject) -> PyObjectRef:
         return self._binop_generic(a, b, "+", "add")
 
     def _mul(self, a: PyObject, b: PyObject) -> PyObjectRef:
-        return self._binop_generic(a, b, "*", "mul")
+        return self._binop_generic(a, b, "*", "multiply")
 
     def _matmul(self, a: PyObject, b: PyObject) -> PyObjectRef:
-        return self._binop_generic(a, b, "@", "matmul")
+        return self._binop_generic(a, b, "@", "matrix_multiply")
 
     def _truediv(self, a: PyObject, b: PyObject) -> PyObjectRef:
-        return self._binop_generic(a, b, "/", "truediv")
+        return self._binop_generic(a, b, "/", "true_divide")
 
     def _floordiv(self, a: PyObject, b: PyObject) -> PyObjectRef:
-        return self._binop_generic(a, b, "//", "floordiv")
+        return self._binop_generic(a, b, "//", "floor_divide")
 
     def _pow(self, a: PyObject, b: PyObject) -> PyObjectRef:
-        return self._binop_generic(a, b, "**", "pow")
+        return self._binop_generic(a, b, "**", "power")
 
     def _mod(self, a: PyObject, b: PyObject) -> PyObjectRef:
-        return self._binop_generic(a, b, "%", "mod")
+        return self._binop_generic(a, b, "%", "remainder")
 
     def _divmod(self, a: PyObject, b: PyObject) -> PyObjectRef:
         return self._binop_generic(a, b, "divmod", "divmod")
@@ -782,50 +815,44 @@ class VirtualMachine:
         return self._binop_generic(a, b, "^", "xor")
 
     def _or(self, a: PyObject, b: PyObject) -> PyObjectRef:
-        return self._binop_generic(a, b, "|", "or")
+        return self._binop_generic(a, b, "|", "or_")
 
     def _and(self, a: PyObject, b: PyObject) -> PyObjectRef:
-        return self._binop_generic(a, b, "&", "and")
+        return self._binop_generic(a, b, "&", "and_")
 
     def _binop_inplace_generic(
         self, a: PyObject, b: PyObject, op: str, name: str
     ) -> PyObjectRef:
-        return self.call_or_unsupported(
-            a,
-            b,
-            f"__i{name}__",
-            lambda vm, a, b: vm.call_or_reflection(
-                a,
-                b,
-                f"__{name}__",
-                f"__r{name}__",
-                lambda vm, a, b: vm.new_unsupported_binop_error(a, b, f"{op}="),
-            ),
-        )
+        number = a.class_()._.effective_slots.as_number
+        if (slot := getattr(number, vnumber.INPLACE_OF[name])) is not None:
+            r = slot(a, b, self)
+            if not r.is_(self.ctx.not_implemented):
+                return r
+        return self._binop_generic(a, b, f"{op}=", name)
 
     def _isub(self, a: PyObject, b: PyObject) -> PyObjectRef:
-        return self._binop_inplace_generic(a, b, "-", "sub")
+        return self._binop_inplace_generic(a, b, "-", "subtract")
 
     def _iadd(self, a: PyObject, b: PyObject) -> PyObjectRef:
         return self._binop_inplace_generic(a, b, "+", "add")
 
     def _imul(self, a: PyObject, b: PyObject) -> PyObjectRef:
-        return self._binop_inplace_generic(a, b, "*", "mul")
+        return self._binop_inplace_generic(a, b, "*", "multiply")
 
     def _imatmul(self, a: PyObject, b: PyObject) -> PyObjectRef:
-        return self._binop_inplace_generic(a, b, "@", "matmul")
+        return self._binop_inplace_generic(a, b, "@", "matrix_multiply")
 
     def _itruediv(self, a: PyObject, b: PyObject) -> PyObjectRef:
-        return self._binop_inplace_generic(a, b, "/", "truediv")
+        return self._binop_inplace_generic(a, b, "/", "true_divide")
 
     def _ifloordiv(self, a: PyObject, b: PyObject) -> PyObjectRef:
-        return self._binop_inplace_generic(a, b, "//", "floordiv")
+        return self._binop_inplace_generic(a, b, "//", "floor_divide")
 
     def _ipow(self, a: PyObject, b: PyObject) -> PyObjectRef:
-        return self._binop_inplace_generic(a, b, "**", "pow")
+        return self._binop_inplace_generic(a, b, "**", "power")
 
     def _imod(self, a: PyObject, b: PyObject) -> PyObjectRef:
-        return self._binop_inplace_generic(a, b, "%", "mod")
+        return self._binop_inplace_generic(a, b, "%", "remainder")
 
     def _ilshift(self, a: PyObject, b: PyObject) -> PyObjectRef:
         return self._binop_inplace_generic(a, b, "<<", "lshift")
@@ -837,38 +864,34 @@ class VirtualMachine:
         return self._binop_inplace_generic(a, b, "^", "xor")
 
     def _ior(self, a: PyObject, b: PyObject) -> PyObjectRef:
-        return self._binop_inplace_generic(a, b, "|", "or")
+        return self._binop_inplace_generic(a, b, "|", "or_")
 
     def _iand(self, a: PyObject, b: PyObject) -> PyObjectRef:
-        return self._binop_inplace_generic(a, b, "&", "and")
+        return self._binop_inplace_generic(a, b, "&", "and_")
+
+    def _unary_op(self, a: PyObject, op: str, name: str) -> PyObjectRef:
+        if (slot := getattr(a.class_()._.effective_slots.as_number, name)) is None:
+            self.new_unsupported_unary_error(a, op)
+        return slot(a, self)
 
     def _abs(self, a: PyObject) -> PyObjectRef:
-        # TODO: .map_err(|_| self.new_unsupported_unary_error(a, "abs()"))?
-        return self.get_special_method(a, "__abs__").invoke(
-            vm_function_.FuncArgs.empty(), self
-        )
+        return self._unary_op(a, "abs()", "absolute")
 
     def _pos(self, a: PyObject) -> PyObjectRef:
-        return self.get_special_method(a, "__pos__").invoke(
-            vm_function_.FuncArgs.empty(), self
-        )
+        return self._unary_op(a, "unary +", "positive")
 
     def _neg(self, a: PyObject) -> PyObjectRef:
-        return self.get_special_method(a, "__neg__").invoke(
-            vm_function_.FuncArgs.empty(), self
-        )
+        return self._unary_op(a, "unary -", "negative")
 
     def _invert(self, a: PyObject) -> PyObjectRef:
-        return self.get_special_method(a, "__invert__").invoke(
-            vm_function_.FuncArgs.empty(), self
-        )
+        return self._unary_op(a, "unary ~", "invert")
 
     def _membership_iter_search(
         self, haystack: PyObjectRef, needle: PyObjectRef
     ) -> PyIntRef:
         iter = haystack.get_iter(self)
-        while isinstance((v := iter.next(self)), viter.PyIterReturnReturn):
-            if self.bool_eq(needle, v.value):
+        while (v := iter.next_fast(self)) is not viter.ITER_EXHAUSTED:
+            if self.bool_eq(needle, v):
                 return self.ctx.new_bool(True)
             else:
                 continue
@@ -883,8 +906,7 @@ class VirtualMachine:
             return method.invoke(vm_function_.FuncArgs([needle], OrderedDict()), self)
 
     def push_exception(self, exc: Optional[PyBaseExceptionRef]) -> None:
-        self.exceptions.prev = self.exceptions
-        self.exceptions.exc = exc
+        self.exceptions = ExceptionStack(exc, self.exceptions)
 
     def pop_exception(self) -> Optional[PyBaseExceptionRef]:
         res = self.exceptions.exc
@@ -1036,7 +1058,7 @@ class VirtualMachine:
             return [get_repr(a) for a in args]
 
     def split_exception(self, exc: PyBaseExceptionRef) -> List[PyObjectRef]:
-        tb = exc._.traceback
+        tb = exc._.get_traceback(self)
         return [exc.class_(), exc, tb if tb is not None else self.ctx.get_none()]
 
     def print_exception(self, exc: PyBaseExceptionRef) -> None:
@@ -1066,7 +1088,7 @@ class VirtualMachine:
         self._write_exception_inner(output, exc)
 
     def _write_exception_inner(self, output, exc: PyBaseExceptionRef) -> None:
-        if (tb := exc._.traceback) is not None:
+        if (tb := exc._.get_traceback(self)) is not None:
             output.write("Traceback (most recent call last):\n")
             for tb_ in tb._:
                 self._write_traceback_entry(output, tb_)
@@ -1150,6 +1172,16 @@ class PySettings:
     argv: list[str] = field(default_factory=list)
     hash_seed: Optional[int] = None
     stdio_unbuffered: bool = False
+    # run code with the closures built by `Instruction.threaded` instead of
+    # dispatching on the instructions
+    threaded_code: bool = False
+    # translate hot guest functions into host functions, see `vm.jit`. ignored
+    # while `stats` is set, as translated code is not counted
+    jit: bool = False
+    # "table" or "json": count executed instructions and dump them in `finalize`
+    stats: Optional[str] = None
+    # defaults to stderr
+    stats_file: Optional[str] = None
 
 
 class TraceEvent(enum.Enum):
@@ -1176,6 +1208,12 @@ class Interpreter:
     def enter(self, f: Callable[[VirtualMachine], R]) -> R:
         return enter_vm(self.vm, lambda: f(self.vm))
 
+    def run(self, f: Callable[[VirtualMachine], R]) -> R:
+        try:
+            return self.enter(f)
+        finally:
+            self.vm.finalize()
+
     @staticmethod
     def default() -> Interpreter:
         return Interpreter.new(PySettings(), InitParameter.External)